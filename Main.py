@@ -1,349 +1,266 @@
+import argparse
 import random
+import sys
 import tkinter as tk
-from dataclasses import dataclass, field
 from pathlib import Path
-from tkinter import ttk, messagebox
+from tkinter import filedialog, ttk, messagebox
+from tkinter import font as tkfont
+
+from questcore import (
+    BulkEdit,
+    BulkError,
+    DEFAULT_PLACEHOLDER_CFG,
+    DEFAULT_JOURNAL_PATH,
+    FIELD_KINDS,
+    DEFAULT_SESSION_PATH,
+    TASK_DEFS,
+    TASK_TYPES,
+    TemplateError,
+    ExportCache,
+    FieldError,
+    FieldSpec,
+    Journal,
+    PlaceholderConfig,
+    Quest,
+    QuestGraph,
+    QuestIndex,
+    RequiresScan,
+    SessionError,
+    Task,
+    checkpoint,
+    CURVE_KINDS,
+    CatalogError,
+    Curve,
+    CurveError,
+    apply_bulk,
+    apply_progression,
+    cached_document,
+    compiled_schema,
+    create_quests,
+    default_display_name,
+    default_params,
+    existing_requires,
+    export_documents,
+    generate_placeholders,
+    generate_placeholders_base,
+    load_catalog,
+    load_quests_dir,
+    needs_compaction,
+    placeholders_preview,
+    profiled,
+    quest_path,
+    recover,
+    refresh_derived,
+    select_quests,
+    tier_values,
+    validate_all,
+    validate_ids,
+    validation_summary,
+)
+from questcore import profiling
 
 
 # =========================
-# Helpers
-# =========================
-def int_to_roman(n: int) -> str:
-    """Converte un intero positivo in numeri romani (formato latino)."""
-    if n <= 0:
-        return str(n)
-    pairs = [
-        (1000, "M"),
-        (900, "CM"),
-        (500, "D"),
-        (400, "CD"),
-        (100, "C"),
-        (90, "XC"),
-        (50, "L"),
-        (40, "XL"),
-        (10, "X"),
-        (9, "IX"),
-        (5, "V"),
-        (4, "IV"),
-        (1, "I"),
-    ]
-    out = []
-    for value, sym in pairs:
-        while n >= value:
-            out.append(sym)
-            n -= value
-    return "".join(out)
-
-
-# =========================
-# YAML minimal dumper (senza PyYAML)
+# UI helpers
 # =========================
-def _yaml_needs_quotes(s: str) -> bool:
-    if s == "":
-        return True
-    specials = [":", "{", "}", "[", "]", "#", "&", "*", "!", "|", ">", "%", "@", "`"]
-    if any(ch in s for ch in specials):
-        return True
-    if s[0].isspace() or s[-1].isspace():
-        return True
-    if s.lower() in {"true", "false", "null", "~"}:
-        return True
-    return False
-
-
-def _yaml_quote(s: str) -> str:
-    return '"' + s.replace('"', '\\"') + '"'
-
-
-def yaml_dump(data, indent: int = 0) -> str:
-    sp = "  " * indent
-
-    if isinstance(data, dict):
-        lines = []
-        for k, v in data.items():
-            if isinstance(v, (dict, list)):
-                lines.append(f"{sp}{k}:")
-                lines.append(yaml_dump(v, indent + 1))
-            else:
-                lines.append(f"{sp}{k}: {yaml_dump(v, 0).lstrip()}")
-        return "\n".join(lines)
-
-    if isinstance(data, list):
-        if not data:
-            return f"{sp}[]"
-        lines = []
-        for item in data:
-            if isinstance(item, (dict, list)):
-                lines.append(f"{sp}-")
-                lines.append(yaml_dump(item, indent + 1))
+class KeyedRows:
+    """Tiene allineate le righe di un widget elenco a una lista di (chiave, valori).
+
+    Conserva in Python le chiavi e i valori mostrati e a ogni ``sync`` esegue solo
+    le operazioni necessarie: cancella le chiavi sparite, inserisce le nuove, sposta
+    quelle fuori posto e aggiorna quelle con valori diversi. Le righe intatte (e la
+    loro selezione) non vengono toccate. Il widget è raggiunto tramite un adapter con
+    ``insert(index, key, values)``, ``delete(index, key)``, ``move(old, new, key)`` e
+    ``update(index, key, values)``.
+    """
+
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self.keys: list = []
+        self.values: dict = {}
+
+    def sync(self, rows):
+        rows = list(rows)
+        target = {key: values for key, values in rows}
+        adapter = self.adapter
+
+        # dal fondo, così gli indici ancora da cancellare restano validi
+        for index in range(len(self.keys) - 1, -1, -1):
+            key = self.keys[index]
+            if key not in target:
+                adapter.delete(index, key)
+                del self.keys[index]
+                del self.values[key]
+
+        for index, (key, values) in enumerate(rows):
+            if index < len(self.keys) and self.keys[index] == key:
+                pass
+            elif key in self.values:
+                old = self.keys.index(key, index)
+                adapter.move(old, index, key)
+                self.keys.insert(index, self.keys.pop(old))
             else:
-                lines.append(f"{sp}- {yaml_dump(item, 0).lstrip()}")
-        return "\n".join(lines)
-
-    if isinstance(data, bool):
-        return f"{sp}{'true' if data else 'false'}"
-    if isinstance(data, int):
-        return f"{sp}{data}"
-    if data is None:
-        return f"{sp}null"
-    if isinstance(data, str):
-        return f"{sp}{_yaml_quote(data) if _yaml_needs_quotes(data) else data}"
-
-    return f"{sp}{_yaml_quote(str(data))}"
+                adapter.insert(index, key, values)
+                self.keys.insert(index, key)
+                self.values[key] = values
+                continue
+            if self.values[key] != values:
+                adapter.update(index, key, values)
+                self.values[key] = values
 
 
-# =========================
-# Task definitions (schema)
-# Schema field format:
-#   "key": (ftype, default)
-#
-# ftype supported:
-#   - "int", "opt_int", "bool", "str", "list[str]", "enum"
-# for enum, default = (choices_list, default_value)
-# =========================
-TASK_DEFS = {
-    "blockbreak": {
-        "required": {"amount": ("int", None)},
-        "optional": {
-            "block": ("str", ""),
-            "blocks": ("list[str]", []),
-            "reverse-if-placed": ("bool", False),
-            "allow-silk-touch": ("bool", True),
-            "allow-negative-progress": ("bool", True),
-            "worlds": ("list[str]", []),
-        },
-        "mutex_groups": [("block", "blocks")],
-    },
-    "blockplace": {
-        "required": {"amount": ("int", None)},
-        "optional": {
-            "block": ("str", ""),
-            "blocks": ("list[str]", []),
-            "reverse-if-broken": ("bool", False),
-            "allow-negative-progress": ("bool", True),
-            "worlds": ("list[str]", []),
-        },
-        "mutex_groups": [("block", "blocks")],
-    },
-    "neobrewing": {
-        "required": {"amount": ("int", None)},
-        "optional": {
-            "ingredient": ("str", ""),
-            "exact-match": ("bool", True),
-            "required-effects": ("list[str]", []),
-            "worlds": ("list[str]", []),
-        },
-        "mutex_groups": [],
-    },
-    "consume": {
-        "required": {"amount": ("int", None)},
-        "optional": {
-            "item": ("str", ""),
-            "exact-match": ("bool", True),
-            "worlds": ("list[str]", []),
-        },
-        "mutex_groups": [],
-    },
-    "crafting": {
-        "required": {"amount": ("int", None)},
-        "optional": {
-            "item": ("str", ""),
-            "exact-match": ("bool", True),
-            "worlds": ("list[str]", []),
-        },
-        "mutex_groups": [],
-    },
-    "farming": {
-        "required": {"amount": ("int", None)},
-        "optional": {
-            "block": ("str", ""),
-            "blocks": ("list[str]", []),
-            "worlds": ("list[str]", []),
-        },
-        "mutex_groups": [("block", "blocks")],
-    },
-    "inventory": {
-        "required": {"amount": ("int", None)},
-        "optional": {
-            "item": ("str", ""),
-            "items": ("list[str]", []),
-            "exact-match": ("bool", True),
-            "remove-items-when-complete": ("bool", False),
-            "allow-partial-completion": ("bool", True),
-            "worlds": ("list[str]", []),
-        },
-        "mutex_groups": [("item", "items")],
-    },
-    "mobkilling": {
-        "required": {"amount": ("int", None)},
-        "optional": {
-            "mob": ("str", ""),
-            "mobs": ("list[str]", []),
-            "name": ("str", ""),
-            "names": ("list[str]", []),
-            "hostile": ("str", ""),
-            "item": ("str", ""),
-            "exact-match": ("bool", True),
-            "worlds": ("list[str]", []),
-        },
-        "mutex_groups": [("mob", "mobs"), ("name", "names")],
-    },
-    "smelting": {
-        "required": {"amount": ("int", None)},
-        "optional": {
-            "item": ("str", ""),
-            "exact-match": ("bool", True),
-            "worlds": ("list[str]", []),
-        },
-        "mutex_groups": [],
-    },
-    "smithing": {
-        "required": {"amount": ("int", None)},
-        "optional": {
-            "mode": ("enum", (["any", "transform", "trim"], "any")),  # NEW: selettore
-            "item": ("str", ""),
-            "exact-match": ("bool", True),
-            "worlds": ("list[str]", []),
-        },
-        "mutex_groups": [],
-    },
-    "enchanting": {
-        "required": {"amount": ("int", None)},
-        "optional": {
-            "item": ("str", ""),
-            "enchantment": ("list[str]", []),
-            "min-level": ("opt_int", None),  # se vuoto non viene scritto nel yaml
-            "worlds": ("list[str]", []),
-        },
-        "mutex_groups": [],
-    },
-    "interact": {
-        "required": {"amount": ("int", None)},
-        "optional": {
-            "item": ("str", ""),
-            "exact-match": ("bool", True),
-
-            "block": ("str", ""),
-            "blocks": ("list[str]", []),
-
-            "action": ("str", ""),
-            "actions": ("list[str]", []),
-
-            "use-interacted-block-result": ("str", ""),
-            "use-interacted-block-results": ("list[str]", []),
-
-            "use-item-in-hand-result": ("str", ""),
-            "use-item-in-hand-results": ("list[str]", []),
-
-            "worlds": ("list[str]", []),
-        },
-        "mutex_groups": [
-            ("block", "blocks"),
-            ("action", "actions"),
-            ("use-interacted-block-result", "use-interacted-block-results"),
-            ("use-item-in-hand-result", "use-item-in-hand-results"),
-        ],
-    },
-    "gathering": {
-        "required": {
-            "amount": ("int", None),
-            "item": ("str", None),  # obbligatorio stringa, default vuoto
-            "mob": ("str", None),   # obbligatorio stringa, default vuoto
-        },
-        "optional": {},
-        "mutex_groups": [],
-    },
-}
-
-TASK_TYPES = list(TASK_DEFS.keys())
-
-# task-type -> task-title (titoli “belli” per i player)
-TASK_TYPE_TITLES = {
-    "blockbreak": "Scava",
-    "blockplace": "Piazza",
-    "neobrewing": "Crafta",
-    "consume": "Consuma",
-    "crafting": "Crafta",
-    "farming": "Coltiva",
-    "inventory": "Ottieni",
-    "mobkilling": "Uccidi",
-    "smelting": "Cuoci",
-    "smithing": "Forgia",
-    "enchanting": "Incanta",
-    "interact": "Interagisci",
-    "gathering": "Preleva da",
-}
-
-
-# =========================
-# Data model
-# =========================
-@dataclass
-class Task:
-    name: str
-    type: str
-    params: dict = field(default_factory=dict)
-    label: str = ""
+class _TreeviewRows:
+    """Adapter di ``KeyedRows`` per un Treeview: la chiave è l'iid della riga."""
 
+    def __init__(self, tree: ttk.Treeview):
+        self.tree = tree
 
-@dataclass
-class Quest:
-    quest_id: str
-    sort_order: int
-    category: str
-    category_display: str
+    def insert(self, index, key, values):
+        self.tree.insert("", index, iid=key, values=values)
 
-    tasks: dict = field(default_factory=dict)
+    def delete(self, index, key):
+        self.tree.delete(key)
 
-    display_name: str = ""
-    display_type: str = "STONE"
+    def move(self, old, new, key):
+        self.tree.move(key, "", new)
 
-    lore_normal: list = field(default_factory=list)
-    lore_started: list = field(default_factory=list)
+    def update(self, index, key, values):
+        self.tree.item(key, values=values)
 
-    rewards: list = field(default_factory=list)
 
-    repeatable: bool = False
-    cooldown_enabled: bool = True
-    cooldown_time: int = 1440
-    requires: list = field(default_factory=list)
+def _autocomplete(widget: ttk.Combobox, kind: str):
+    """Propone nel menu del Combobox gli identificatori del catalogo che iniziano con il testo scritto."""
 
-    placeholders_override: dict = field(default_factory=dict)
-    progress_placeholders_override: dict = field(default_factory=dict)
+    def update(_event=None):
+        try:
+            catalog = load_catalog()
+        except CatalogError:
+            return
+        widget.configure(values=catalog.complete(kind, widget.get()))
 
-    lore_reward_lines: list = field(default_factory=list)
+    widget.bind("<KeyRelease>", update, add="+")
+    widget.configure(postcommand=update)
 
-    lore_normal_manual: bool = False
-    lore_started_manual: bool = False
 
-    display_auto: bool = True
+class ListEditor(tk.Frame):
+    """Editor di una lista di stringhe (premi, requires, blocks...), anche di centinaia di righe.
 
+    La lista Python è la fonte di verità e non viene mai modificata in-place: ogni
+    operazione ne crea una nuova, così ``get_list`` la restituisce senza copiarla
+    e ``set_list`` adotta quella ricevuta. La Listbox contiene solo le righe
+    visibili (da ``_top``); scrollbar e rotella spostano la finestra. La selezione
+    (multipla) è tenuta come indici della lista.
+    """
 
-# =========================
-# UI helpers
-# =========================
-class ListEditor(tk.Frame):
-    def __init__(self, master, title: str, initial=None):
+    def __init__(self, master, title: str | None, initial=None, height: int = 6, kind: str | None = None):
         super().__init__(master)
         self.columnconfigure(0, weight=1)
+        self.kind = kind  # elenco del catalogo per l'autocompletamento delle righe
 
-        ttk.Label(self, text=title).grid(row=0, column=0, sticky="w", padx=6, pady=(6, 2))
+        self.title_var = tk.StringVar(self)
+        self._title = title
+        if title is not None:
+            ttk.Label(self, textvariable=self.title_var).grid(row=0, column=0, sticky="w", padx=6, pady=(6, 2))
 
-        self.listbox = tk.Listbox(self, height=6)
-        self.listbox.grid(row=1, column=0, sticky="nsew", padx=6, pady=4)
+        self.listbox = tk.Listbox(self, height=height, selectmode="extended", exportselection=False)
+        self.listbox.grid(row=1, column=0, sticky="nsew", padx=(6, 0), pady=4)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scroll)
+        self.scrollbar.grid(row=1, column=1, sticky="ns", pady=4)
         self.rowconfigure(1, weight=1)
 
         btns = ttk.Frame(self)
-        btns.grid(row=1, column=1, sticky="ns", padx=(0, 6), pady=4)
+        btns.grid(row=1, column=2, sticky="ns", padx=6, pady=4)
 
         ttk.Button(btns, text="Aggiungi", command=self._add).grid(row=0, column=0, sticky="ew", pady=2)
         ttk.Button(btns, text="Modifica", command=self._edit).grid(row=1, column=0, sticky="ew", pady=2)
         ttk.Button(btns, text="Rimuovi", command=self._remove).grid(row=2, column=0, sticky="ew", pady=2)
-
-        if initial:
-            for x in initial:
-                self.listbox.insert(tk.END, x)
-
+        ttk.Button(btns, text="Incolla righe", command=self._paste).grid(row=3, column=0, sticky="ew", pady=2)
+        ttk.Button(btns, text="Rimuovi duplicati", command=self._dedupe).grid(row=4, column=0, sticky="ew", pady=2)
+
+        self._items: list[str] = initial if type(initial) is list else list(initial or [])
+        self._selected: set[int] = set()
+        self._top = 0
+        self._rows = height
+        self._shown: list[str] = []
+        self._linespace = tkfont.nametofont("TkDefaultFont").metrics("linespace") + 1
+        self._padding = 2 * (int(self.listbox.cget("borderwidth")) + int(self.listbox.cget("highlightthickness")))
+
+        lb = self.listbox
+        lb.bind("<<ListboxSelect>>", self._on_select)
+        lb.bind("<Configure>", self._on_resize)
+        lb.bind("<MouseWheel>", lambda e: self._scroll_by(-1 if e.delta > 0 else 1))
+        lb.bind("<Button-4>", lambda e: self._scroll_by(-1))
+        lb.bind("<Button-5>", lambda e: self._scroll_by(1))
+        lb.bind("<Double-1>", lambda e: self._edit())
+        lb.bind("<Delete>", lambda e: self._remove())
+        lb.bind("<Control-v>", lambda e: self._paste() or "break")
+        lb.bind("<Control-a>", lambda e: self._select_all() or "break")
+        self._render()
+
+    # --- vista ---
+    def _render(self):
+        items = self._items
+        total = len(items)
+        self._top = top = max(0, min(self._top, total - self._rows))
+        window = items[top:top + self._rows]
+        lb = self.listbox
+        if window != self._shown:
+            lb.delete(0, "end")
+            if window:
+                lb.insert(0, *window)
+            self._shown = window
+        lb.selection_clear(0, "end")
+        for i in range(len(window)):
+            if top + i in self._selected:
+                lb.selection_set(i)
+        if total:
+            self.scrollbar.set(top / total, (top + len(window)) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        if self._title is not None:
+            self.title_var.set(f"{self._title} ({total})" if total else self._title)
+
+    def _on_resize(self, event):
+        rows = max(1, (event.height - self._padding) // self._linespace)
+        if rows != self._rows:
+            self._rows = rows
+            self._render()
+
+    def _on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self._top = int(float(amount) * len(self._items))
+            self._render()
+        else:
+            self._scroll_by(int(amount) * (self._rows if unit == "pages" else 1))
+
+    def _scroll_by(self, rows: int):
+        self._top += rows
+        self._render()
+
+    def _see(self, index: int):
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + self._rows:
+            self._top = index - self._rows + 1
+
+    def _on_select(self, _event=None):
+        top = self._top
+        self._selected.difference_update(range(top, top + len(self._shown)))
+        self._selected.update(top + i for i in self.listbox.curselection())
+
+    def _select_all(self):
+        self._selected = set(range(len(self._items)))
+        self._render()
+
+    def _replace(self, items: list[str], selected=()):
+        """Sostituisce la lista (mai modificata in-place) e la selezione, poi ridisegna."""
+        self._items = items
+        self._selected = set(selected)
+        if self._selected:
+            self._see(min(self._selected))
+        self._render()
+
+    # --- operazioni ---
     def _ask_text(self, title: str, initial: str = "") -> str | None:
         win = tk.Toplevel(self)
         win.title(title)
@@ -352,7 +269,11 @@ class ListEditor(tk.Frame):
 
         ttk.Label(win, text=title).grid(row=0, column=0, sticky="w", padx=10, pady=(10, 4))
         var = tk.StringVar(value=initial)
-        ent = ttk.Entry(win, textvariable=var, width=60)
+        if self.kind is None:
+            ent = ttk.Entry(win, textvariable=var, width=60)
+        else:
+            ent = ttk.Combobox(win, textvariable=var, width=58)
+            _autocomplete(ent, self.kind)
         ent.grid(row=1, column=0, sticky="ew", padx=10, pady=4)
         ent.focus_set()
 
@@ -374,32 +295,58 @@ class ListEditor(tk.Frame):
         win.wait_window()
         return result["value"]
 
+    def _insert_at(self) -> int:
+        """Le righe nuove vanno dopo l'ultima selezionata, altrimenti in fondo."""
+        return max(self._selected) + 1 if self._selected else len(self._items)
+
     def _add(self):
         s = self._ask_text("Nuova riga", "")
         if s is None:
             return
-        self.listbox.insert(tk.END, s)
+        at = self._insert_at()
+        self._replace(self._items[:at] + [s] + self._items[at:], (at,))
 
     def _edit(self):
-        sel = self.listbox.curselection()
-        if not sel:
+        if not self._selected:
             return
-        idx = sel[0]
-        old = self.listbox.get(idx)
-        s = self._ask_text("Modifica riga", old)
+        idx = min(self._selected)
+        s = self._ask_text("Modifica riga", self._items[idx])
         if s is None:
             return
-        self.listbox.delete(idx)
-        self.listbox.insert(idx, s)
+        items = list(self._items)
+        items[idx] = s
+        self._replace(items, (idx,))
 
     def _remove(self):
-        sel = self.listbox.curselection()
-        if not sel:
+        if not self._selected:
             return
-        self.listbox.delete(sel[0])
+        selected = self._selected
+        self._replace([item for i, item in enumerate(self._items) if i not in selected])
+
+    def _paste(self):
+        """Incolla dagli appunti una riga per voce (le righe vuote vengono ignorate)."""
+        try:
+            text = self.clipboard_get()
+        except tk.TclError:
+            return
+        lines = [line.strip() for line in text.splitlines()]
+        lines = [line for line in lines if line]
+        if not lines:
+            return
+        at = self._insert_at()
+        self._replace(self._items[:at] + lines + self._items[at:], range(at, at + len(lines)))
+
+    def _dedupe(self):
+        unique = list(dict.fromkeys(self._items))
+        if len(unique) != len(self._items):
+            self._replace(unique)
 
     def get_list(self) -> list[str]:
-        return list(self.listbox.get(0, tk.END))
+        """La lista corrente, senza copia: non va modificata in-place."""
+        return self._items
+
+    def set_list(self, items):
+        self._replace(items if type(items) is list else list(items))
 
 
 class MultiLineTextDialog:
@@ -546,24 +493,49 @@ class TaskNameTypeDialog:
 
 
 class TaskConfigDialog:
-    def __init__(self, master, task_type: str, initial_params: dict, initial_label: str):
+    """Form di configurazione di una task.
+
+    Il form di ogni tipo viene costruito una volta sola e poi nascosto: ``ask``
+    riusa quello in cache (per finestra principale e tipo) e ricarica solo i
+    valori da ``initial_params``.
+    """
+
+    _forms: dict[tuple[str, str], "TaskConfigDialog"] = {}
+
+    @classmethod
+    def ask(cls, master, task_type: str, initial_params: dict, initial_label: str) -> tuple[dict, str] | None:
+        """Mostra il form del tipo ``task_type``; restituisce (params, label) o ``None`` se annullato."""
+        owner = master.winfo_toplevel()
+        key = (str(owner), task_type)
+        form = cls._forms.get(key)
+        if form is None or not form._alive():
+            form = cls._forms[key] = cls(owner, task_type)
+        form.load(initial_params, initial_label)
+        return form.show()
+
+    @profiled("TaskConfigDialog.build")
+    def __init__(self, master, task_type: str):
         self.task_type = task_type
         self.result = None
 
         self.win = tk.Toplevel(master)
+        self.win.withdraw()
         self.win.title(f"Config Task: {task_type}")
         self.win.geometry("560x560")
-        self.win.grab_set()
+        self.win.transient(master)
+        self.win.protocol("WM_DELETE_WINDOW", self._cancel)
+        self._done = tk.IntVar(self.win, value=0)
 
         container = ttk.Frame(self.win)
         container.pack(fill="both", expand=True, padx=10, pady=10)
         container.columnconfigure(0, weight=1)
 
         ttk.Label(container, text="Label (Nome obiettivo per lore-started / placeholders):").grid(row=0, column=0, sticky="w", pady=(0, 4))
-        self.label_var = tk.StringVar(value=initial_label or "")
+        self.label_var = tk.StringVar(self.win)
         ttk.Entry(container, textvariable=self.label_var).grid(row=1, column=0, sticky="ew", pady=(0, 10))
 
         self.fields = {}  # key -> (ftype, holder, extra)
+        self.defaults = {}  # key -> default dello schema
 
         schema = TASK_DEFS[task_type]
         all_fields = [("required", schema["required"]), ("optional", schema["optional"])]
@@ -576,45 +548,39 @@ class TaskConfigDialog:
             for key, (ftype, default) in fields.items():
                 ttk.Label(container, text=key).grid(row=row, column=0, sticky="w")
                 row += 1
+                self.defaults[key] = default
 
-                init_value = initial_params.get(key, default)
-
-                if ftype == "int":
-                    var = tk.StringVar(value=str(init_value if init_value is not None else random.randint(1, 64)))
-                    ttk.Entry(container, textvariable=var).grid(row=row, column=0, sticky="ew", pady=(0, 8))
+                if ftype == "str" and key in FIELD_KINDS:
+                    var = tk.StringVar(self.win)
+                    cb = ttk.Combobox(container, textvariable=var)
+                    cb.grid(row=row, column=0, sticky="ew", pady=(0, 8))
+                    _autocomplete(cb, FIELD_KINDS[key])
                     self.fields[key] = (ftype, var, None)
 
-                elif ftype == "opt_int":
-                    var = tk.StringVar(value="" if init_value is None else str(init_value))
+                elif ftype in ("int", "opt_int", "str"):
+                    var = tk.StringVar(self.win)
                     ttk.Entry(container, textvariable=var).grid(row=row, column=0, sticky="ew", pady=(0, 8))
                     self.fields[key] = (ftype, var, None)
 
                 elif ftype == "bool":
-                    var = tk.BooleanVar(value=bool(init_value))
+                    var = tk.BooleanVar(self.win)
                     ttk.Checkbutton(container, variable=var, text="true/false").grid(row=row, column=0, sticky="w", pady=(0, 8))
                     self.fields[key] = (ftype, var, None)
 
-                elif ftype == "str":
-                    var = tk.StringVar(value="" if init_value is None else str(init_value))
-                    ttk.Entry(container, textvariable=var).grid(row=row, column=0, sticky="ew", pady=(0, 8))
-                    self.fields[key] = (ftype, var, None)
-
                 elif ftype == "list[str]":
-                    ttk.Button(container, text="Modifica lista...", command=lambda k=key: self._edit_list(k)).grid(
-                        row=row, column=0, sticky="w", pady=(0, 8)
-                    )
-                    self.fields[key] = (ftype, list(init_value or []), None)
+                    editor = ListEditor(container, None, height=5, kind=FIELD_KINDS.get(key))
+                    editor.grid(row=row, column=0, sticky="ew", pady=(0, 8))
+                    self.fields[key] = (ftype, editor, None)
 
                 elif ftype == "enum":
-                    choices, default_value = default
-                    value = init_value if init_value not in (None, "") else default_value
-                    var = tk.StringVar(value=value)
+                    choices, _default_value = default
+                    var = tk.StringVar(self.win)
                     cb = ttk.Combobox(container, textvariable=var, values=list(choices), state="readonly")
                     cb.grid(row=row, column=0, sticky="w", pady=(0, 8))
                     self.fields[key] = (ftype, var, list(choices))
 
                 else:
-                    var = tk.StringVar(value=str(init_value))
+                    var = tk.StringVar(self.win)
                     ttk.Entry(container, textvariable=var).grid(row=row, column=0, sticky="ew", pady=(0, 8))
                     self.fields[key] = (ftype, var, None)
 
@@ -630,99 +596,334 @@ class TaskConfigDialog:
         ttk.Button(btns, text="Conferma", command=self._ok).grid(row=0, column=0, padx=5)
         ttk.Button(btns, text="Annulla", command=self._cancel).grid(row=0, column=1, padx=5)
 
-    def _edit_list(self, key: str):
-        ftype, current, _ = self.fields[key]
-        edited = MultiLineTextDialog.ask_list(self.win, f"Modifica lista: {key}", current)
-        if edited is None:
-            return
-        self.fields[key] = (ftype, edited, None)
+        self.win.bind("<Escape>", lambda e: self._cancel())
 
-    def _read_field(self, key: str, ftype: str):
-        _t, holder, extra = self.fields[key]
+    def _alive(self) -> bool:
+        try:
+            return bool(self.win.winfo_exists())
+        except tk.TclError:  # interprete Tk già distrutto (es. una App precedente)
+            return False
 
-        if ftype == "int":
-            s = holder.get().strip()
-            try:
-                return int(s)
-            except ValueError:
-                messagebox.showerror("Errore", f"'{key}' deve essere un numero intero.", parent=self.win)
-                raise
-
-        if ftype == "opt_int":
-            s = holder.get().strip()
-            if s == "":
-                return None
-            try:
-                return int(s)
-            except ValueError:
-                messagebox.showerror("Errore", f"'{key}' deve essere un numero intero oppure vuoto.", parent=self.win)
-                raise
+    def load(self, initial_params: dict, initial_label: str):
+        """Ricarica i valori del form (label e campi) senza ricostruire i widget."""
+        self.result = None
+        self.label_var.set(initial_label or "")
+        for key, (ftype, holder, extra) in self.fields.items():
+            default = self.defaults[key]
+            init_value = initial_params.get(key, default)
+            if ftype == "int":
+                holder.set(str(init_value if init_value is not None else random.randint(1, 64)))
+            elif ftype in ("opt_int", "str"):
+                holder.set("" if init_value is None else str(init_value))
+            elif ftype == "bool":
+                holder.set(bool(init_value))
+            elif ftype == "list[str]":
+                holder.set_list(init_value or [])
+            elif ftype == "enum":
+                _choices, default_value = default
+                holder.set(init_value if init_value not in (None, "") else default_value)
+            else:
+                holder.set(str(init_value))
 
-        if ftype == "bool":
+    def _read_field(self, spec: FieldSpec):
+        _t, holder, extra = self.fields[spec.key]
+        if spec.ftype == "bool":
             return bool(holder.get())
+        if spec.ftype == "list[str]":
+            return holder.get_list()
+        return spec.parse_text(holder.get())
 
-        if ftype == "str":
-            return holder.get()
+    def _ok(self):
+        schema = compiled_schema(self.task_type)
 
-        if ftype == "list[str]":
-            return list(holder)
+        try:
+            values = {key: self._read_field(spec) for key, spec in schema.fields.items()}
+        except FieldError as e:
+            messagebox.showerror("Errore", str(e), parent=self.win)
+            return
+        params = schema.normalize(values)
 
-        if ftype == "enum":
-            # readonly combobox: sempre valido
-            return holder.get()
+        # tipi, enum e campi mutuamente esclusivi
+        errors = schema.errors(params)
+        if errors:
+            _key, _code, message = errors[0]
+            messagebox.showerror("Errore", message, parent=self.win)
+            return
 
-        return holder.get()
+        label = self.label_var.get().strip()
+        self.result = (params, label)
+        self._done.set(1)
+
+    def _cancel(self):
+        self.result = None
+        self._done.set(1)
+
+    def show(self):
+        self._done.set(0)
+        self.win.deiconify()
+        self.win.lift()
+        self.win.grab_set()
+        self.win.focus_set()
+        self.win.wait_variable(self._done)
+        if self.win.winfo_exists():
+            self.win.grab_release()
+            self.win.withdraw()
+        return self.result
+
+
+class ProgressionDialog:
+    """Curve per generare amount, premi e cooldown di tutte le quest (vedi ``questcore.progression``)."""
+
+    # nome della curva -> etichetta; una curva senza "start" (o senza punti) è disattivata
+    CURVES = (
+        ("amount", "Amount della task"),
+        ("reward", "Premio ({reward})"),
+        ("cooldown_time", "Cooldown (minuti)"),
+    )
+
+    def __init__(self, master):
+        self.result = None
+
+        self.win = tk.Toplevel(master)
+        self.win.title("Genera progressione")
+        self.win.resizable(False, False)
+        self.win.grab_set()
+
+        box = ttk.LabelFrame(self.win, text="Task da aggiungere a ogni quest (vuoto = nessuna)")
+        box.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 4))
+        ttk.Label(box, text="Nome:").grid(row=0, column=0, sticky="w", padx=6, pady=4)
+        self.task_name_var = tk.StringVar()
+        ttk.Entry(box, textvariable=self.task_name_var, width=24).grid(row=0, column=1, sticky="w", padx=6, pady=4)
+        ttk.Label(box, text="Tipo:").grid(row=0, column=2, sticky="w", padx=6, pady=4)
+        self.task_type_var = tk.StringVar(value=TASK_TYPES[0])
+        ttk.Combobox(box, textvariable=self.task_type_var, values=TASK_TYPES, state="readonly", width=18).grid(
+            row=0, column=3, sticky="w", padx=6, pady=4
+        )
+
+        curves = ttk.LabelFrame(self.win, text="Curve (punti: livello:valore separati da spazi)")
+        curves.grid(row=1, column=0, sticky="ew", padx=10, pady=4)
+        for col, title in enumerate(("", "tipo", "start", "end", "punti", "arrotonda a")):
+            ttk.Label(curves, text=title).grid(row=0, column=col, sticky="w", padx=4)
+        self.curve_vars = {}
+        for row, (name, title) in enumerate(self.CURVES, start=1):
+            kind = tk.StringVar(value="linear")
+            start, end, points = tk.StringVar(), tk.StringVar(), tk.StringVar()
+            round_to = tk.StringVar(value="64" if name == "amount" else "1")
+            ttk.Label(curves, text=title).grid(row=row, column=0, sticky="w", padx=4, pady=2)
+            ttk.Combobox(curves, textvariable=kind, values=CURVE_KINDS, state="readonly", width=11).grid(row=row, column=1, padx=4)
+            ttk.Entry(curves, textvariable=start, width=8).grid(row=row, column=2, padx=4)
+            ttk.Entry(curves, textvariable=end, width=8).grid(row=row, column=3, padx=4)
+            ttk.Entry(curves, textvariable=points, width=20).grid(row=row, column=4, padx=4)
+            ttk.Entry(curves, textvariable=round_to, width=6).grid(row=row, column=5, padx=4)
+            self.curve_vars[name] = (kind, start, end, points, round_to)
+
+        extra = ttk.LabelFrame(self.win, text="Premi (vuoto = lascia invariati) e seed")
+        extra.grid(row=2, column=0, sticky="ew", padx=10, pady=4)
+        extra.columnconfigure(1, weight=1)
+        ttk.Label(extra, text="Premio:").grid(row=0, column=0, sticky="w", padx=6, pady=4)
+        self.reward_var = tk.StringVar(value="eco give {player} {reward}")
+        ttk.Entry(extra, textvariable=self.reward_var).grid(row=0, column=1, sticky="ew", padx=6, pady=4)
+        ttk.Label(extra, text="Lore premio:").grid(row=1, column=0, sticky="w", padx=6, pady=4)
+        self.lore_reward_var = tk.StringVar(value="{reward} monete")
+        ttk.Entry(extra, textvariable=self.lore_reward_var).grid(row=1, column=1, sticky="ew", padx=6, pady=4)
+        ttk.Label(extra, text="Variazione ± (0-1):").grid(row=2, column=0, sticky="w", padx=6, pady=4)
+        self.jitter_var = tk.StringVar(value="0")
+        ttk.Entry(extra, textvariable=self.jitter_var, width=8).grid(row=2, column=1, sticky="w", padx=6, pady=4)
+        ttk.Label(extra, text="Seed (vuoto = casuale):").grid(row=3, column=0, sticky="w", padx=6, pady=4)
+        self.seed_var = tk.StringVar()
+        ttk.Entry(extra, textvariable=self.seed_var, width=12).grid(row=3, column=1, sticky="w", padx=6, pady=4)
+
+        btns = ttk.Frame(self.win)
+        btns.grid(row=3, column=0, sticky="e", padx=10, pady=10)
+        ttk.Button(btns, text="Conferma", command=self._ok).grid(row=0, column=0, padx=5)
+        ttk.Button(btns, text="Annulla", command=self._cancel).grid(row=0, column=1, padx=5)
+
+        self.win.bind("<Escape>", lambda e: self._cancel())
+
+    def _read_curves(self, jitter: float) -> dict:
+        curves = {}
+        for name, (kind, start, end, points, round_to) in self.curve_vars.items():
+            kind = kind.get()
+            start, end, points = start.get().strip(), end.get().strip(), points.get().split()
+            if not (points if kind == "breakpoints" else start):
+                continue
+            try:
+                parsed = [tuple(float(x) for x in p.split(":")) for p in points]
+                curves[name] = Curve(
+                    kind,
+                    float(start or 1),
+                    float(end) if end else None,
+                    points=parsed,
+                    round_to=int(round_to.get() or 1),
+                    minimum=0 if name == "cooldown_time" else 1,
+                    jitter=jitter,
+                )
+            except (TypeError, ValueError) as e:
+                raise CurveError(f"{dict(self.CURVES)[name]}: {e}") from None
+        return curves
 
     def _ok(self):
-        schema = TASK_DEFS[self.task_type]
+        try:
+            jitter = float(self.jitter_var.get() or 0)
+            seed = self.seed_var.get().strip()
+            seed = int(seed) if seed else None
+        except ValueError:
+            messagebox.showerror("Errore", "Variazione e seed devono essere numeri.", parent=self.win)
+            return
+        try:
+            curves = self._read_curves(jitter)
+        except CurveError as e:
+            messagebox.showerror("Errore", f"Curva non valida: {e}", parent=self.win)
+            return
 
-        params = {}
+        name = self.task_name_var.get().strip()
+        if "amount" in curves and not name:
+            messagebox.showerror("Errore", "La curva dell'amount richiede il nome della task.", parent=self.win)
+            return
+        if "amount" in curves and "amount" not in compiled_schema(self.task_type_var.get()).fields:
+            messagebox.showerror("Errore", f"Le task '{self.task_type_var.get()}' non hanno il campo amount.", parent=self.win)
+            return
+        reward = self.reward_var.get().strip()
+        lore_reward = self.lore_reward_var.get().strip()
+        if not curves and not name:
+            messagebox.showerror("Errore", "Niente da generare: indica una task o almeno una curva.", parent=self.win)
+            return
 
-        # required: sempre presenti
-        for key, (ftype, _default) in schema["required"].items():
-            val = self._read_field(key, ftype)
-            params[key] = val if val is not None else ""
+        self.result = {
+            "task": (name, self.task_type_var.get()) if name else None,
+            "curves": curves,
+            "seed": seed,
+            "rewards": [reward] if reward and "reward" in curves else None,
+            "lore_rewards": [lore_reward] if lore_reward and "reward" in curves else None,
+        }
+        self.win.destroy()
 
-        # optional: includo se significativo
-        for key, (ftype, default) in schema["optional"].items():
-            val = self._read_field(key, ftype)
+    def _cancel(self):
+        self.win.destroy()
 
-            if ftype == "str":
-                if val != "":
-                    params[key] = val
-            elif ftype == "list[str]":
-                if val:
-                    params[key] = val
-            elif ftype == "opt_int":
-                if val is not None:
-                    params[key] = val
-            elif ftype == "enum":
-                # includiamo sempre, così "any" viene scritto coerentemente
-                params[key] = val
-            elif ftype == "bool":
-                params[key] = val
-            elif ftype == "int":
-                params[key] = val
-            else:
-                if val is not None:
-                    params[key] = val
-
-        # mutex validation
-        for a, b in schema.get("mutex_groups", []):
-            a_present = a in params and (
-                (isinstance(params[a], str) and params[a] != "")
-                or (isinstance(params[a], list) and len(params[a]) > 0)
-            )
-            b_present = b in params and (
-                (isinstance(params[b], str) and params[b] != "")
-                or (isinstance(params[b], list) and len(params[b]) > 0)
+    def show(self):
+        self.win.wait_window()
+        return self.result
+
+
+class BulkEditDialog:
+    """Modifica in blocco delle quest selezionate (vedi ``questcore.bulk``)."""
+
+    def __init__(self, master, sort_range: tuple[int, int], searched: int):
+        self.result = None
+
+        self.win = tk.Toplevel(master)
+        self.win.title("Modifica in blocco")
+        self.win.resizable(False, False)
+        self.win.grab_set()
+
+        sel = ttk.LabelFrame(self.win, text="Quest da modificare")
+        sel.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 4))
+        self.scope_var = tk.StringVar(value="all")
+        ttk.Radiobutton(sel, text="Tutte", variable=self.scope_var, value="all").grid(row=0, column=0, sticky="w", padx=6, pady=2)
+        ttk.Radiobutton(sel, text="sort-order da", variable=self.scope_var, value="range").grid(row=1, column=0, sticky="w", padx=6, pady=2)
+        self.low_var = tk.StringVar(value=str(sort_range[0]))
+        self.high_var = tk.StringVar(value=str(sort_range[1]))
+        ttk.Entry(sel, textvariable=self.low_var, width=8).grid(row=1, column=1, padx=4)
+        ttk.Label(sel, text="a").grid(row=1, column=2)
+        ttk.Entry(sel, textvariable=self.high_var, width=8).grid(row=1, column=3, padx=4)
+        ttk.Radiobutton(
+            sel,
+            text=f"Risultati della ricerca ({searched} quest)",
+            variable=self.scope_var,
+            value="search",
+            state="normal" if searched else "disabled",
+        ).grid(row=2, column=0, columnspan=4, sticky="w", padx=6, pady=2)
+
+        # campo -> (attivo, valore): si applicano solo i campi spuntati
+        fields = ttk.LabelFrame(self.win, text="Campi da impostare")
+        fields.grid(row=1, column=0, sticky="ew", padx=10, pady=4)
+        self.field_vars = {}
+        for row, (name, var, make) in enumerate((
+            ("cooldown_enabled", tk.BooleanVar(value=True), lambda v: ttk.Checkbutton(fields, variable=v)),
+            ("cooldown_time", tk.StringVar(value="1440"), lambda v: ttk.Entry(fields, textvariable=v, width=10)),
+            ("repeatable", tk.BooleanVar(value=False), lambda v: ttk.Checkbutton(fields, variable=v)),
+            ("display_type", tk.StringVar(value="STONE"), lambda v: ttk.Combobox(fields, textvariable=v, width=28)),
+        )):
+            enabled = tk.BooleanVar(value=False)
+            ttk.Checkbutton(fields, text=name, variable=enabled).grid(row=row, column=0, sticky="w", padx=6, pady=2)
+            widget = make(var)
+            widget.grid(row=row, column=1, sticky="w", padx=6, pady=2)
+            if name == "display_type":
+                _autocomplete(widget, "materials")
+            self.field_vars[name] = (enabled, var)
+
+        lines = ttk.LabelFrame(self.win, text="Righe da aggiungere (vuoto = nessuna)")
+        lines.grid(row=2, column=0, sticky="ew", padx=10, pady=4)
+        lines.columnconfigure(1, weight=1)
+        ttk.Label(lines, text="Premio:").grid(row=0, column=0, sticky="w", padx=6, pady=4)
+        self.reward_var = tk.StringVar()
+        ttk.Entry(lines, textvariable=self.reward_var, width=40).grid(row=0, column=1, sticky="ew", padx=6, pady=4)
+        ttk.Label(lines, text="Lore premio:").grid(row=1, column=0, sticky="w", padx=6, pady=4)
+        self.lore_reward_var = tk.StringVar()
+        ttk.Entry(lines, textvariable=self.lore_reward_var, width=40).grid(row=1, column=1, sticky="ew", padx=6, pady=4)
+
+        tasks = ttk.LabelFrame(self.win, text="Task (vuoto = nessuna trasformazione)")
+        tasks.grid(row=3, column=0, sticky="ew", padx=10, pady=4)
+        ttk.Label(tasks, text="Moltiplica il campo").grid(row=0, column=0, sticky="w", padx=6, pady=4)
+        self.scale_field_var = tk.StringVar(value="amount")
+        ttk.Entry(tasks, textvariable=self.scale_field_var, width=12).grid(row=0, column=1, padx=4)
+        ttk.Label(tasks, text="per").grid(row=0, column=2)
+        self.scale_var = tk.StringVar()
+        ttk.Entry(tasks, textvariable=self.scale_var, width=8).grid(row=0, column=3, padx=4)
+        ttk.Label(tasks, text="Solo il tipo:").grid(row=1, column=0, sticky="w", padx=6, pady=4)
+        self.task_type_var = tk.StringVar()
+        ttk.Combobox(tasks, textvariable=self.task_type_var, values=("",) + tuple(TASK_TYPES), state="readonly", width=18).grid(
+            row=1, column=1, columnspan=3, sticky="w", padx=4, pady=4
+        )
+
+        btns = ttk.Frame(self.win)
+        btns.grid(row=4, column=0, sticky="e", padx=10, pady=10)
+        ttk.Button(btns, text="Conferma", command=self._ok).grid(row=0, column=0, padx=5)
+        ttk.Button(btns, text="Annulla", command=self._cancel).grid(row=0, column=1, padx=5)
+
+        self.win.bind("<Escape>", lambda e: self._cancel())
+
+    def _ok(self):
+        scope = self.scope_var.get()
+        sort_range = None
+        try:
+            if scope == "range":
+                sort_range = (int(self.low_var.get()), int(self.high_var.get()))
+            fields = {}
+            for name, (enabled, var) in self.field_vars.items():
+                if not enabled.get():
+                    continue
+                value = var.get()
+                if name == "cooldown_time":
+                    value = int(value)
+                elif name == "display_type":
+                    value = value.strip()
+                fields[name] = value
+            factor = self.scale_var.get().strip()
+            scale = {self.scale_field_var.get().strip(): float(factor)} if factor else {}
+        except ValueError:
+            messagebox.showerror("Errore", "sort-order, cooldown_time e fattore devono essere numeri.", parent=self.win)
+            return
+
+        reward = self.reward_var.get().strip()
+        lore_reward = self.lore_reward_var.get().strip()
+        try:
+            edit = BulkEdit(
+                fields=fields,
+                add_rewards=[reward] if reward else (),
+                add_lore_rewards=[lore_reward] if lore_reward else (),
+                scale=scale,
+                task_type=self.task_type_var.get(),
             )
-            if a_present and b_present:
-                messagebox.showerror("Errore", f"I campi '{a}' e '{b}' non possono essere entrambi valorizzati.", parent=self.win)
-                return
+        except BulkError as e:
+            messagebox.showerror("Errore", f"Modifica non valida: {e}", parent=self.win)
+            return
+        if not edit:
+            messagebox.showerror("Errore", "Niente da modificare: spunta un campo, aggiungi una riga o indica un fattore.", parent=self.win)
+            return
 
-        label = self.label_var.get().strip()
-        self.result = (params, label)
+        self.result = {"scope": scope, "sort_range": sort_range, "edit": edit}
         self.win.destroy()
 
     def _cancel(self):
@@ -737,14 +938,35 @@ class TaskConfigDialog:
 # Quest tab
 # =========================
 class QuestTab(ttk.Frame):
-    def __init__(self, master, quest: Quest, placeholder_cfg_getter):
+    """Tab di una quest nel notebook.
+
+    Nasce come segnaposto leggero: i widget vengono creati solo alla prima
+    selezione (``ensure_built``) e possono essere distrutti con ``teardown``.
+    Il modello ``Quest`` resta sempre la fonte di verità; ogni modifica viene
+    anche aggiunta al ``journal``, se presente.
+    """
+
+    def __init__(self, master, quest: Quest, placeholder_cfg_getter, journal: Journal | None = None):
         super().__init__(master)
         self.quest = quest
         self.placeholder_cfg_getter = placeholder_cfg_getter
+        self.journal = journal
+        self.built = False
+
+        # ridisegno accorpato: le richieste si sommano e partono una volta sola al prossimo idle;
+        # i contatori dicono quante ne sono arrivate e quanti ridisegni sono stati eseguiti
+        self._redraw_after = None
+        self._text_lines: dict[str, list[str]] = {}
+        self.repaints_requested = 0
+        self.repaints_run = 0
 
         self.columnconfigure(0, weight=1)
         self.rowconfigure(0, weight=1)
 
+    def ensure_built(self):
+        if self.built:
+            return
+
         canvas = tk.Canvas(self, highlightthickness=0)
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
         self.body = ttk.Frame(canvas)
@@ -757,54 +979,96 @@ class QuestTab(ttk.Frame):
         scrollbar.grid(row=0, column=1, sticky="ns")
 
         self._build()
+        self.built = True
 
-    def _task_category_title(self, task_type: str) -> str:
-        return TASK_TYPE_TITLES.get(task_type, task_type)
+    def teardown(self):
+        """Riporta lo stato della UI nel modello e distrugge i widget della tab."""
+        if not self.built:
+            return
+        try:
+            self.apply_ui_to_model()
+        except Exception:
+            # la tab va distrutta comunque (è già uscita dalle tab costruite): l'errore si mostra come
+            # quelli dei callback Tk
+            self._root().report_callback_exception(*sys.exc_info())
+        if self._redraw_after is not None:
+            self.after_cancel(self._redraw_after)
+            self._redraw_after = None
+        for child in self.winfo_children():
+            child.destroy()
+        self._text_lines.clear()
+        self.built = False
 
     def _set_text_view(self, widget: tk.Text, content: str):
+        """Aggiorna un Text in sola lettura toccando solo le righe diverse dall'ultimo contenuto mostrato."""
+        new = content.split("\n")
+        old = self._text_lines.get(str(widget))
+        if old == new:
+            return
+        self._text_lines[str(widget)] = new
+
         widget.configure(state="normal")
-        widget.delete("1.0", "end")
-        widget.insert("1.0", content)
+        if old is None:
+            widget.delete("1.0", "end")
+            widget.insert("1.0", content)
+        else:
+            # righe uguali in testa e in coda restano dove sono
+            limit = min(len(old), len(new))
+            head = 0
+            while head < limit and old[head] == new[head]:
+                head += 1
+            tail = 0
+            while tail < limit - head and old[-1 - tail] == new[-1 - tail]:
+                tail += 1
+
+            if tail:
+                widget.delete(f"{head + 1}.0", f"{len(old) - tail + 1}.0")
+                widget.insert(f"{head + 1}.0", "".join(line + "\n" for line in new[head:len(new) - tail]))
+            elif head:
+                widget.delete(f"{head}.end", "end-1c")
+                widget.insert(f"{head}.end", "".join("\n" + line for line in new[head:]))
+            else:
+                widget.delete("1.0", "end")
+                widget.insert("1.0", content)
         widget.configure(state="disabled")
 
-    def _rebuild_lore(self):
-        grouped: dict[str, list[tuple[str, str]]] = {}
-        for tname, task in self.quest.tasks.items():
-            cat = self._task_category_title(task.type)
-            grouped.setdefault(cat, [])
-            title = (task.label or tname).strip() or tname
-            grouped[cat].append((tname, title))
-
-        if not self.quest.lore_normal_manual:
-            lore_normal: list[str] = []
-            for cat in sorted(grouped.keys()):
-                lore_normal.append(f"&6{cat}:")
-                for _tname, title in grouped[cat]:
-                    lore_normal.append(f"&8- &7{title}")
-            lore_normal.append("")
-            lore_normal.append("&6Premi:")
-            for line in (self.quest.lore_reward_lines or []):
-                lore_normal.append(f"&8- &7{line}")
-            lore_normal.append("")
-            lore_normal.append("&c&l ✘ &7Non iniziata.")
-            self.quest.lore_normal = lore_normal
-
-        if not self.quest.lore_started_manual:
-            lore_started: list[str] = [""]
-            for tname, task in self.quest.tasks.items():
-                title = (task.label or tname).strip() or tname
-                lore_started.append(f"&6{title}: &7{{{tname}:progress}}/{{{tname}:goal}}")
-            self.quest.lore_started = lore_started
+    def _request_redraw(self, *_):
+        """Chiede un ridisegno della tab; più richieste prima del prossimo idle diventano una sola."""
+        self.repaints_requested += 1
+        if self._redraw_after is None and self.built:
+            self._redraw_after = self.after_idle(self._redraw)
+
+    @profiled()
+    def _redraw(self):
+        self._redraw_after = None
+        if not self.built:
+            return
+        self.repaints_run += 1
 
+        if self.display_auto_var.get():
+            try:
+                name = self._default_display_name()
+            except (tk.TclError, ValueError):
+                name = None  # spinbox vuoto o non numerico mentre si digita
+            if name is not None and self.display_name_var.get() != name:
+                self.display_name_var.set(name)
+
+        refresh_derived(self.quest, self.placeholder_cfg_getter())
         self._set_text_view(self.lore_normal_view, "\n".join(self.quest.lore_normal))
         self._set_text_view(self.lore_started_view, "\n".join(self.quest.lore_started))
+        self._update_placeholders_preview()
+
+    def _log(self, op: str, **data):
+        if self.journal is not None and self.journal.active:
+            self.journal.append(op, self.quest, **data)
 
     def _edit_lore_rewards(self):
         edited = MultiLineTextDialog.ask_list(self, "Modifica premi (lore)", list(self.quest.lore_reward_lines or []))
         if edited is None:
             return
         self.quest.lore_reward_lines = edited
-        self._rebuild_lore()
+        self._log("set", fields={"lore_reward_lines": edited})
+        self._request_redraw()
 
     def _edit_lore_normal(self):
         edited = MultiLineTextDialog.ask_list(self, "Modifica lore-normal", list(self.quest.lore_normal or []))
@@ -812,7 +1076,8 @@ class QuestTab(ttk.Frame):
             return
         self.quest.lore_normal = edited
         self.quest.lore_normal_manual = True
-        self._rebuild_lore()
+        self._log("set", fields={"lore_normal": edited, "lore_normal_manual": True})
+        self._request_redraw()
 
     def _edit_lore_started(self):
         edited = MultiLineTextDialog.ask_list(self, "Modifica lore-started", list(self.quest.lore_started or []))
@@ -820,27 +1085,25 @@ class QuestTab(ttk.Frame):
             return
         self.quest.lore_started = edited
         self.quest.lore_started_manual = True
-        self._rebuild_lore()
+        self._log("set", fields={"lore_started": edited, "lore_started_manual": True})
+        self._request_redraw()
 
     def _reset_lore_auto(self):
         if not messagebox.askyesno("Conferma", "Vuoi ripristinare le lore automatiche (sovrascrive le modifiche manuali)?", parent=self):
             return
         self.quest.lore_normal_manual = False
         self.quest.lore_started_manual = False
-        self._rebuild_lore()
+        self._log("set", fields={"lore_normal_manual": False, "lore_started_manual": False})
+        self._request_redraw()
 
     def _default_display_name(self) -> str:
-        roman = int_to_roman(int(self.sort_order_var.get()))
-        return f"&e{self.quest.category_display} {roman}"
-
-    def _on_sort_order_change(self, *_):
-        if self.display_auto_var.get():
-            self.display_name_var.set(self._default_display_name())
+        sort_order = self.sort_order_var.get() if self.built else self.quest.sort_order
+        return default_display_name(self.quest.category_display, sort_order)
 
     def _on_display_auto_toggle(self):
-        if self.display_auto_var.get():
-            self.display_name_var.set(self._default_display_name())
+        self._request_redraw()
 
+    @profiled()
     def _build(self):
         # Tasks
         tasks_box = ttk.LabelFrame(self.body, text="Tasks")
@@ -853,6 +1116,7 @@ class QuestTab(ttk.Frame):
         self.tasks_tree.column("name", width=220)
         self.tasks_tree.column("type", width=160)
         self.tasks_tree.grid(row=0, column=0, sticky="nsew", padx=8, pady=8)
+        self._tasks_rows = KeyedRows(_TreeviewRows(self.tasks_tree))
         tasks_box.columnconfigure(0, weight=1)
 
         btns = ttk.Frame(tasks_box)
@@ -875,7 +1139,9 @@ class QuestTab(ttk.Frame):
 
         ttk.Label(display_box, text="type (materiale Minecraft)").grid(row=0, column=1, sticky="w", padx=8, pady=(8, 2))
         self.display_type_var = tk.StringVar(value=self.quest.display_type)
-        ttk.Entry(display_box, textvariable=self.display_type_var).grid(row=1, column=1, sticky="ew", padx=8, pady=(0, 8))
+        display_type = ttk.Combobox(display_box, textvariable=self.display_type_var)
+        display_type.grid(row=1, column=1, sticky="ew", padx=8, pady=(0, 8))
+        _autocomplete(display_type, "materials")
 
         auto_frame = ttk.Frame(display_box)
         auto_frame.grid(row=2, column=0, columnspan=2, sticky="ew", padx=8, pady=(0, 8))
@@ -951,7 +1217,7 @@ class QuestTab(ttk.Frame):
         ttk.Spinbox(opt_box, from_=1, to=999999, textvariable=self.sort_order_var, width=10).grid(
             row=1, column=1, sticky="w", padx=8, pady=2
         )
-        self.sort_order_var.trace_add("write", self._on_sort_order_change)
+        self.sort_order_var.trace_add("write", self._request_redraw)
 
         self.repeatable_var = tk.BooleanVar(value=self.quest.repeatable)
         ttk.Checkbutton(opt_box, text="repeatable", variable=self.repeatable_var).grid(row=2, column=1, sticky="w", padx=8, pady=2)
@@ -970,45 +1236,24 @@ class QuestTab(ttk.Frame):
         self.requires_editor.grid(row=4, column=0, columnspan=2, sticky="nsew", padx=8, pady=8)
 
         # init
-        if self.display_auto_var.get():
-            self.display_name_var.set(self._default_display_name())
-        self._rebuild_lore()
-        self._update_placeholders_preview()
+        self.built = True
+        self._request_redraw()
 
     def _refresh_tasks_tree(self):
-        for i in self.tasks_tree.get_children():
-            self.tasks_tree.delete(i)
-        for name, task in self.quest.tasks.items():
-            self.tasks_tree.insert("", tk.END, values=(name, task.type))
+        self._tasks_rows.sync((name, (name, task.type)) for name, task in self.quest.tasks.items())
+
+    def select_task(self, name: str):
+        """Seleziona (e porta in vista) la riga della task ``name``; la tab deve essere costruita."""
+        if self.tasks_tree.exists(name):
+            self.tasks_tree.selection_set(name)
+            self.tasks_tree.see(name)
 
     def _selected_task_name(self) -> str | None:
         sel = self.tasks_tree.selection()
-        if not sel:
-            return None
-        values = self.tasks_tree.item(sel[0], "values")
-        return values[0] if values else None
+        return sel[0] if sel else None
 
     def _default_params_for(self, task_type: str) -> dict:
-        schema = TASK_DEFS[task_type]
-        params = {}
-
-        for key, (ftype, _default) in schema["required"].items():
-            if ftype == "int":
-                params[key] = random.randint(1, 64)
-            else:
-                params[key] = ""
-
-        for key, (ftype, default) in schema["optional"].items():
-            if ftype == "list[str]":
-                params[key] = []
-            elif ftype == "opt_int":
-                params[key] = None
-            elif ftype == "enum":
-                choices, default_value = default
-                params[key] = default_value
-            else:
-                params[key] = default
-        return params
+        return default_params(task_type)
 
     def _add_task(self):
         d1 = TaskNameTypeDialog(self, existing_names=set(self.quest.tasks.keys()))
@@ -1018,50 +1263,48 @@ class QuestTab(ttk.Frame):
         name, task_type = res
 
         initial_params = self._default_params_for(task_type)
-        d2 = TaskConfigDialog(self, task_type, initial_params=initial_params, initial_label=name.capitalize())
-        res2 = d2.show()
+        res2 = TaskConfigDialog.ask(self, task_type, initial_params=initial_params, initial_label=name.capitalize())
         if not res2:
             return
         params, label = res2
 
-        self.quest.tasks[name] = Task(name=name, type=task_type, params=params, label=label)
+        self.quest.add_task(Task(name=name, type=task_type, params=params, label=label))
+        self._log("add_task", name=name, type=task_type, label=label, params=params)
         self._refresh_tasks_tree()
-        self._rebuild_lore()
-        self._update_placeholders_preview()
+        self._request_redraw()
 
     def _edit_task(self):
         name = self._selected_task_name()
         if not name:
             return
         task = self.quest.tasks[name]
-        d = TaskConfigDialog(self, task.type, initial_params=dict(task.params), initial_label=task.label or "")
-        res = d.show()
+        res = TaskConfigDialog.ask(self, task.type, initial_params=dict(task.params), initial_label=task.label or "")
         if not res:
             return
         params, label = res
-        task.params = params
-        task.label = label
+        self.quest.update_task(name, params=params, label=label)
+        self._log("update_task", name=name, label=label, params=params)
         self._refresh_tasks_tree()
-        self._rebuild_lore()
-        self._update_placeholders_preview()
+        self._request_redraw()
 
     def _remove_task(self):
         name = self._selected_task_name()
         if not name:
             return
         if messagebox.askyesno("Conferma", f"Rimuovere la task '{name}'?", parent=self):
-            self.quest.tasks.pop(name, None)
+            self.quest.remove_task(name)
+            self._log("remove_task", name=name)
             self._refresh_tasks_tree()
-            self._rebuild_lore()
-            self._update_placeholders_preview()
+            self._request_redraw()
 
     # placeholders
     def _reset_placeholders_override(self):
         if not messagebox.askyesno("Conferma", "Vuoi resettare tutte le modifiche ai placeholders per questa quest?", parent=self):
             return
-        self.quest.placeholders_override.clear()
-        self.quest.progress_placeholders_override.clear()
-        self._update_placeholders_preview()
+        self.quest.placeholders_override = {}
+        self.quest.progress_placeholders_override = {}
+        self._log("set", fields={"placeholders_override": {}, "progress_placeholders_override": {}})
+        self._request_redraw()
 
     def _edit_placeholders(self):
         effective_placeholders, _ = self.generate_placeholders()
@@ -1069,7 +1312,8 @@ class QuestTab(ttk.Frame):
         if edited is None:
             return
         self.quest.placeholders_override = edited
-        self._update_placeholders_preview()
+        self._log("set", fields={"placeholders_override": edited})
+        self._request_redraw()
 
     def _edit_progress_placeholders(self):
         _, effective_progress = self.generate_placeholders()
@@ -1077,77 +1321,68 @@ class QuestTab(ttk.Frame):
         if edited is None:
             return
         self.quest.progress_placeholders_override = edited
-        self._update_placeholders_preview()
+        self._log("set", fields={"progress_placeholders_override": edited})
+        self._request_redraw()
 
     def _update_placeholders_preview(self):
         placeholders, progress_placeholders = self.generate_placeholders()
-
-        lines = ["placeholders:"]
-        for k, v in placeholders.items():
-            lines.append(f"  {k}: {v}")
-        lines.append("")
-        lines.append("progress-placeholders:")
-        for k, v in progress_placeholders.items():
-            lines.append(f"  {k}: {v}")
-
-        self.ph_preview.configure(state="normal")
-        self.ph_preview.delete("1.0", "end")
-        self.ph_preview.insert("1.0", "\n".join(lines))
-        self.ph_preview.configure(state="disabled")
+        self._set_text_view(self.ph_preview, placeholders_preview(placeholders, progress_placeholders))
 
     def _generate_placeholders_base(self) -> tuple[dict, dict]:
-        cfg = self.placeholder_cfg_getter()
-        placeholders = {}
-        progress = {}
-
-        for tname, task in self.quest.tasks.items():
-            label = (task.label or tname).strip() or tname
-
-            key = cfg["placeholders_key_fmt"].format(task=tname, label=label)
-            val = cfg["placeholders_value_fmt"].format(
-                task=tname,
-                label=label,
-                progress=f"{{{tname}:progress}}",
-                goal=f"{{{tname}:goal}}",
-            )
-            placeholders[key] = val
-
-            pval = cfg["progress_value_fmt"].format(
-                task=tname,
-                label=label,
-                progress=f"{{{tname}:progress}}",
-                goal=f"{{{tname}:goal}}",
-            )
-            progress[tname] = pval
-
-        return placeholders, progress
+        return generate_placeholders_base(self.quest, self.placeholder_cfg_getter())
 
     def generate_placeholders(self) -> tuple[dict, dict]:
-        base_placeholders, base_progress = self._generate_placeholders_base()
-        placeholders = dict(self.quest.placeholders_override) if self.quest.placeholders_override else base_placeholders
-        progress = dict(self.quest.progress_placeholders_override) if self.quest.progress_placeholders_override else base_progress
-        return placeholders, progress
-
-    def apply_ui_to_model(self):
-        self.quest.display_auto = bool(self.display_auto_var.get())
-        self.quest.display_name = self.display_name_var.get()
-        self.quest.display_type = self.display_type_var.get()
+        return generate_placeholders(self.quest, self.placeholder_cfg_getter())
+
+    def apply_ui_to_model(self) -> list[str]:
+        """Riporta i valori dei widget nel modello; restituisce i campi saltati perché non validi.
+
+        Un campo numerico vuoto o non numerico (es. mentre si digita) non viene
+        applicato: il modello tiene l'ultimo valore valido.
+        """
+        values = {
+            "display_auto": bool(self.display_auto_var.get()),
+            "display_name": self.display_name_var.get(),
+            "display_type": self.display_type_var.get(),
+            "rewards": self.rewards_editor.get_list(),
+            "repeatable": bool(self.repeatable_var.get()),
+            "cooldown_enabled": bool(self.cooldown_enabled_var.get()),
+            "requires": self.requires_editor.get_list(),
+        }
+        invalid = []
+        for key, var in (("sort_order", self.sort_order_var), ("cooldown_time", self.cooldown_time_var)):
+            try:
+                values[key] = int(var.get())
+            except (tk.TclError, ValueError):
+                invalid.append(key)
+        changed = {key: value for key, value in values.items() if getattr(self.quest, key) != value}
+        for key, value in changed.items():
+            setattr(self.quest, key, value)
+        if changed:
+            self._log("set", fields=changed)
 
-        self.quest.rewards = self.rewards_editor.get_list()
+        refresh_derived(self.quest, self.placeholder_cfg_getter())
+        self._request_redraw()
+        return invalid
 
-        self.quest.sort_order = int(self.sort_order_var.get())
-        self.quest.repeatable = bool(self.repeatable_var.get())
-        self.quest.cooldown_enabled = bool(self.cooldown_enabled_var.get())
-        self.quest.cooldown_time = int(self.cooldown_time_var.get())
-        self.quest.requires = self.requires_editor.get_list()
+    def pending_lists(self) -> dict:
+        """Premi e requires come sono ora nella UI, senza riportarli nel modello."""
+        return {"rewards": self.rewards_editor.get_list(), "requires": self.requires_editor.get_list()}
 
-        self._rebuild_lore()
+    def sync_model(self):
+        """Aggiorna i campi derivati del modello per una tab mai costruita (o già distrutta)."""
+        refresh_derived(self.quest, self.placeholder_cfg_getter())
 
 
 # =========================
 # Main app
 # =========================
 class App(tk.Tk):
+    # quante tab tenere costruite contemporaneamente (le meno recenti vengono distrutte)
+    MAX_BUILT_TABS = 6
+    # quest mostrate al massimo tra i risultati della ricerca
+    MAX_SEARCH_HITS = 500
+
     def __init__(self):
         super().__init__()
         self.title("SkyBlock Quests Creator")
@@ -1155,8 +1390,20 @@ class App(tk.Tk):
 
         self.quests: list[Quest] = []
         self.quest_tabs: list[QuestTab] = []
+        self._tab_by_quest: dict[int, QuestTab] = {}  # id(quest) -> tab: i quest_id possono ripetersi tra categorie
+        self._recent_tabs: list[QuestTab] = []  # tab costruite, dalla meno alla più recente
+        self.export_cache = ExportCache(manifest=True)
+        self.placeholder_cfg: PlaceholderConfig | None = None  # compilata alla conferma del setup
+        self.session_path = DEFAULT_SESSION_PATH
+        self.journal = Journal(DEFAULT_JOURNAL_PATH)
+        self.search_index = QuestIndex()
+        self.requires_scan = RequiresScan()  # requires delle quest in quests/, riletti solo se cambiati
+        self._deps_checked = None  # (versione della scansione, revisioni dei requires) dell'ultimo controllo
+        self._search_after = None
+        self._search_hits: dict[str, tuple[Quest, str | None]] = {}  # riga dei risultati -> (quest, task)
 
         self._build_setup_ui()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _build_setup_ui(self):
         self.setup_frame = ttk.Frame(self)
@@ -1204,14 +1451,27 @@ class App(tk.Tk):
         btns.pack(fill="x", pady=10)
         ttk.Button(btns, text="Conferma", command=self._confirm_setup).pack(side="right", padx=5)
         ttk.Button(btns, text="Annulla", command=self.destroy).pack(side="right", padx=5)
+        ttk.Button(btns, text="Importa quest esistenti...", command=self._import_existing).pack(side="left", padx=5)
+        if self.session_path.is_file():
+            ttk.Button(btns, text="Riprendi sessione", command=self._resume_session).pack(side="left", padx=5)
 
-    def _placeholder_cfg(self) -> dict:
-        return {
-            "placeholders_key_fmt": self.ph_key_fmt_var.get().strip() or "progress-{task}",
-            "placeholders_value_fmt": self.ph_val_fmt_var.get().strip() or "&7{label} &f{progress}&8/&f{goal}",
-            "progress_value_fmt": self.ph_prog_val_fmt_var.get().strip() or "&7{label} &f{progress}&8/&f{goal}",
-        }
+    def _placeholder_cfg(self) -> PlaceholderConfig:
+        return self.placeholder_cfg
+
+    def _compile_placeholder_cfg(self) -> bool:
+        """Compila (e valida) i formati del setup una volta sola; mostra l'errore se non sono validi."""
+        try:
+            self.placeholder_cfg = PlaceholderConfig(
+                self.ph_key_fmt_var.get().strip() or DEFAULT_PLACEHOLDER_CFG["placeholders_key_fmt"],
+                self.ph_val_fmt_var.get().strip() or DEFAULT_PLACEHOLDER_CFG["placeholders_value_fmt"],
+                self.ph_prog_val_fmt_var.get().strip() or DEFAULT_PLACEHOLDER_CFG["progress_value_fmt"],
+            )
+        except TemplateError as e:
+            messagebox.showerror("Errore", f"Formato placeholders non valido: {e}", parent=self)
+            return False
+        return True
 
+    @profiled()
     def _confirm_setup(self):
         count = int(self.count_var.get())
         category = self.category_var.get().strip()
@@ -1227,117 +1487,430 @@ class App(tk.Tk):
         if count <= 0:
             messagebox.showerror("Errore", "Il range deve essere >= 1.", parent=self)
             return
+        if not self._compile_placeholder_cfg():
+            return
+
+        quests = create_quests(category, category_display, count, last_sort)
+        if not self._confirm_dependencies(quests):
+            return
 
         self.quests.clear()
-        base = 0 if last_sort <= 0 else last_sort
-
-        for i in range(1, count + 1):
-            sort_order = base + i if base > 0 else i
-            quest_id = f"{category}{sort_order}"
-
-            q = Quest(
-                quest_id=quest_id,
-                sort_order=sort_order,
-                category=category,
-                category_display=category_display,
-                display_name=f"&e{category_display} {int_to_roman(sort_order)}",
-                display_type="STONE",
-                lore_normal=[],
-                lore_started=[""],
-                rewards=[],
-                repeatable=False,
-                cooldown_enabled=True,
-                cooldown_time=1440,
-                requires=[],
-                lore_reward_lines=[],
-                lore_normal_manual=False,
-                lore_started_manual=False,
-                display_auto=True,
-            )
+        self.quests.extend(quests)
+
+        self.setup_frame.destroy()
+        self._build_editor_ui()
+        self._checkpoint()
+
+    @profiled()
+    def _import_existing(self):
+        if not self._compile_placeholder_cfg():
+            return
+
+        initial = Path("quests")
+        root = filedialog.askdirectory(
+            parent=self,
+            title="Cartella quests/ da importare",
+            initialdir=str(initial if initial.is_dir() else Path.cwd()),
+            mustexist=True,
+        )
+        if not root:
+            return
 
-            if sort_order > 1 and (last_sort > 0 or i > 1):
-                prev_id = f"{category}{sort_order - 1}"
-                q.requires = [prev_id]
+        report = load_quests_dir(root, cfg=self._placeholder_cfg(), processes=False)  # niente fork dal processo Tk
+        if not report.quests:
+            messagebox.showerror("Errore", f"Nessuna quest importata.\n\n{report.summary()}", parent=self)
+            return
+        if report.errors or report.invalid:
+            messagebox.showwarning("Attenzione", f"Alcuni file non sono stati importati o contengono task non valide.\n\n{report.summary()}", parent=self)
+
+        self.quests.clear()
+        self.quests.extend(report.quests)
 
-            self.quests.append(q)
+        self.setup_frame.destroy()
+        self._build_editor_ui()
+        self._checkpoint()
+
+    def _setup_values(self) -> dict:
+        return {
+            "count": int(self.count_var.get()),
+            "category": self.category_var.get().strip(),
+            "category_display": self.category_display_var.get().strip(),
+            "last_sort_order": int(self.last_sort_var.get()),
+        }
+
+    @profiled()
+    def _resume_session(self):
+        try:
+            session, replayed = recover(self.session_path, self.journal.path)
+        except (OSError, SessionError) as e:
+            messagebox.showerror("Errore", f"Impossibile riprendere la sessione: {e}", parent=self)
+            return
+        if not session.quests:
+            messagebox.showerror("Errore", "La sessione non contiene quest.", parent=self)
+            return
+
+        setup = session.setup
+        for var, key in (
+            (self.count_var, "count"),
+            (self.category_var, "category"),
+            (self.category_display_var, "category_display"),
+            (self.last_sort_var, "last_sort_order"),
+        ):
+            if key in setup:
+                var.set(setup[key])
+        formats = session.placeholder_cfg.as_dict()
+        self.ph_key_fmt_var.set(formats["placeholders_key_fmt"])
+        self.ph_val_fmt_var.set(formats["placeholders_value_fmt"])
+        self.ph_prog_val_fmt_var.set(formats["progress_value_fmt"])
+        self.placeholder_cfg = session.placeholder_cfg
+
+        self.quests.clear()
+        self.quests.extend(session.quests)
 
         self.setup_frame.destroy()
         self._build_editor_ui()
 
+        # si continua il journal dello snapshot, a meno che non manchi o sia diventato troppo grande
+        if replayed is None or needs_compaction(self.journal.path):
+            self._checkpoint()
+        else:
+            try:
+                self.journal.start(session.saved_at, truncate=False)
+            except OSError:
+                self._checkpoint()
+
+    def _checkpoint(self) -> bool:
+        """Snapshot della sessione e journal vuoto; avvisa se non si può (le modifiche non sarebbero recuperabili)."""
+        try:
+            checkpoint(self.journal, self.session_path, self.quests, self.placeholder_cfg, self._setup_values())
+        except OSError as e:
+            self.journal.close()
+            messagebox.showwarning(
+                "Attenzione",
+                f"Impossibile salvare la sessione: {e}\n\nLe modifiche non salvate non saranno recuperabili.",
+                parent=self,
+            )
+            return False
+        return True
+
+    def _on_close(self):
+        if self.quest_tabs:
+            # le modifiche ancora nei widget finiscono nel journal; senza journal serve uno snapshot
+            lost = []
+            for tab in self.quest_tabs:
+                if not tab.built:
+                    continue
+                try:
+                    invalid = tab.apply_ui_to_model()
+                except Exception:
+                    self.report_callback_exception(*sys.exc_info())
+                    invalid = ["errore"]
+                if invalid:
+                    lost.append(f"{tab.quest.quest_id} ({', '.join(invalid)})")
+            if lost and not messagebox.askyesno(
+                "Valori non validi",
+                "Queste modifiche non sono valide e andranno perse:\n" + "\n".join(lost) + "\n\nChiudere comunque?",
+                icon="warning",
+                parent=self,
+            ):
+                return
+            if self.journal.active:
+                self.journal.close()
+            elif not self._checkpoint() and not messagebox.askyesno(
+                "Sessione non salvata", "Chiudere comunque?", icon="warning", parent=self
+            ):
+                return
+            self.journal.close()
+        self.destroy()
+
+    def _confirm_dependencies(self, quests) -> bool:
+        """Controlla i requires (anche verso le quest già in quests/); chiede conferma se ci sono problemi."""
+        existing = existing_requires(Path("quests"), self.requires_scan)
+        # niente da ricontrollare se né i requires delle quest né i file su disco sono cambiati
+        stamp = (self.requires_scan.version, tuple((q.quest_id, q.revision("requires")) for q in quests))
+        if stamp == self._deps_checked:
+            return True
+        report = QuestGraph.build(quests, existing).check()
+        if not report.ok and not messagebox.askyesno(
+            "Dipendenze non valide",
+            f"{report.summary()}\n\nContinuare comunque?",
+            icon="warning",
+            parent=self,
+        ):
+            return False
+        self._deps_checked = stamp
+        return True
+
+    @profiled()
     def _build_editor_ui(self):
         top = ttk.Frame(self)
         top.pack(fill="x", padx=10, pady=8)
         ttk.Label(top, text="Configura le quest e poi premi 'Salva' per generare i file .yml").pack(anchor="w")
+        self._build_search_ui(top)
 
         self.nb = ttk.Notebook(self)
         self.nb.pack(fill="both", expand=True, padx=10, pady=10)
 
         self.quest_tabs.clear()
+        self._tab_by_quest.clear()
+        self._deps_checked = None  # quest nuove: le revisioni ripartono da zero
+        self._recent_tabs.clear()
         for q in self.quests:
-            tab = QuestTab(self.nb, q, placeholder_cfg_getter=self._placeholder_cfg)
+            tab = QuestTab(self.nb, q, placeholder_cfg_getter=self._placeholder_cfg, journal=self.journal)
             self.nb.add(tab, text=q.quest_id)
             self.quest_tabs.append(tab)
+            self._tab_by_quest[id(q)] = tab
+
+        self.nb.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._on_tab_changed()
 
         bottom = ttk.Frame(self)
         bottom.pack(fill="x", padx=10, pady=(0, 10))
         ttk.Button(bottom, text="Salva", command=self._save_all).pack(side="right")
+        ttk.Button(bottom, text="Genera progressione...", command=self._generate_progression).pack(side="left")
+        ttk.Button(bottom, text="Modifica in blocco...", command=self._bulk_edit).pack(side="left", padx=(6, 0))
+
+    def _build_search_ui(self, master):
+        bar = ttk.Frame(master)
+        bar.pack(fill="x", pady=(6, 0))
+        ttk.Label(bar, text="Cerca (es. mobkilling zombie, mob:zombie, reward:500, zomb*)").pack(side="left")
+        self.search_var = tk.StringVar()
+        entry = ttk.Entry(bar, textvariable=self.search_var, width=40)
+        entry.pack(side="left", fill="x", expand=True, padx=6)
+        entry.bind("<KeyRelease>", self._schedule_search)
+        entry.bind("<Return>", lambda _e: self._run_search())
+        entry.bind("<Escape>", self._clear_search)
+        self.search_status = ttk.Label(bar, text="")
+        self.search_status.pack(side="left")
+
+        self.search_results = ttk.Treeview(master, columns=("quest", "task", "type"), show="headings", height=6)
+        self.search_results.heading("quest", text="Quest")
+        self.search_results.heading("task", text="Task")
+        self.search_results.heading("type", text="Tipo")
+        self.search_results.bind("<<TreeviewSelect>>", self._jump_to_result)
+
+    def _clear_search(self, _event=None):
+        self.search_var.set("")
+        self._run_search()
+
+    def _schedule_search(self, _event=None):
+        # una ricerca sola quando si smette di digitare
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(150, self._run_search)
+
+    @profiled()
+    def _run_search(self):
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+            self._search_after = None
+        tree = self.search_results
+        tree.delete(*tree.get_children())
+        self._search_hits.clear()
+        query = self.search_var.get().strip()
+        if not query:
+            tree.pack_forget()
+            self.search_status.configure(text="")
+            return
 
+        # premi e requires delle tab aperte possono essere ancora solo nella UI:
+        # si indicizzano da lì, senza toccare modello e journal
+        pending = {id(tab.quest): tab.pending_lists() for tab in self._recent_tabs if tab.built}
+        self.search_index.refresh(self.quests, pending)
+        hits = self.search_index.search(query, limit=self.MAX_SEARCH_HITS)
+
+        rows = 0
+        for hit in hits:
+            quest = hit.quest
+            for name in hit.tasks or [None]:
+                task_type = quest.tasks[name].type if name is not None else ""
+                iid = tree.insert("", "end", values=(quest.quest_id, name or "", task_type))
+                self._search_hits[iid] = (quest, name)
+                rows += 1
+        suffix = "+" if len(hits) >= self.MAX_SEARCH_HITS else ""
+        self.search_status.configure(text=f"{len(hits)}{suffix} quest, {rows} righe")
+        if not tree.winfo_ismapped():
+            tree.pack(fill="x", pady=(4, 0))
+
+    def _jump_to_result(self, _event=None):
+        sel = self.search_results.selection()
+        if not sel or sel[0] not in self._search_hits:
+            return
+        quest, task = self._search_hits[sel[0]]
+        tab = self._tab_by_quest.get(id(quest))
+        if tab is None:
+            return
+        self.nb.select(tab)
+        self._on_tab_changed()
+        if task is not None:
+            tab.select_task(task)
+
+    def _on_tab_changed(self, _event=None):
+        current = self.nb.select()
+        if not current:
+            return
+        tab = self.nametowidget(current)
+        tab.ensure_built()
+
+        if tab in self._recent_tabs:
+            self._recent_tabs.remove(tab)
+        self._recent_tabs.append(tab)
+
+        while len(self._recent_tabs) > self.MAX_BUILT_TABS:
+            self._recent_tabs.pop(0).teardown()
+
+    @profiled()
+    def _generate_progression(self):
+        # le tab costruite riportano la UI nel modello e verranno ricostruite dopo
+        for tab in self._recent_tabs:
+            tab.teardown()
+        self._recent_tabs.clear()
+        try:
+            self._run_progression()
+        finally:
+            self._on_tab_changed()
+
+    def _run_progression(self):
+        res = ProgressionDialog(self).show()
+        if not res:
+            return
+
+        task = None
+        if res["task"]:
+            name, task_type = res["task"]
+            seed = res["seed"]
+            rng = random.Random(seed) if seed is not None else None
+            res2 = TaskConfigDialog.ask(
+                self, task_type, initial_params=default_params(task_type, rng), initial_label=f"{name.capitalize()} {{roman}}"
+            )
+            if not res2:
+                return
+            params, label = res2
+            task = Task(name=name, type=task_type, params=params, label=label)
+            clashes = sum(1 for q in self.quests if name in q.tasks)
+            if clashes and not messagebox.askyesno(
+                "Conferma", f"{clashes} quest hanno già una task '{name}': sostituirla?", parent=self
+            ):
+                return
+
+        values = tier_values(res["curves"], len(self.quests), res["seed"])
+        changes = apply_progression(
+            self.quests, values, task, res["rewards"], res["lore_rewards"], self._placeholder_cfg()
+        )
+
+        if self.journal.active:
+            for q in self.quests:
+                if task is not None:
+                    added = q.tasks[task.name]
+                    self.journal.append("add_task", q, name=added.name, type=added.type, label=added.label, params=added.params)
+                if changes[id(q)]:
+                    self.journal.append("set", q, fields=changes[id(q)])
+
+    @profiled()
+    def _bulk_edit(self):
+        # come per la progressione: le tab costruite tornano nel modello e verranno ricostruite
+        for tab in self._recent_tabs:
+            tab.teardown()
+        self._recent_tabs.clear()
+        try:
+            self._run_bulk_edit()
+        finally:
+            self._on_tab_changed()
+
+    def _run_bulk_edit(self):
+        searched = select_quests(self.quests, among=[q for q, _task in self._search_hits.values()])
+        orders = [q.sort_order for q in self.quests]
+        res = BulkEditDialog(self, (min(orders), max(orders)), len(searched)).show()
+        if not res:
+            return
+
+        if res["scope"] == "search":
+            quests = searched
+        else:
+            quests = select_quests(self.quests, sort_range=res["sort_range"])
+        if not quests:
+            messagebox.showinfo("Modifica in blocco", "Nessuna quest selezionata.", parent=self)
+            return
+        if not messagebox.askyesno("Conferma", f"Modificare {len(quests)} quest?", parent=self):
+            return
+
+        changes = apply_bulk(quests, res["edit"], self._placeholder_cfg())
+        if self.journal.active:
+            for q in quests:
+                change = changes.get(id(q))
+                if change is None:
+                    continue
+                if change["fields"]:
+                    self.journal.append("set", q, fields=change["fields"])
+                for name, params in change["tasks"].items():
+                    self.journal.append("update_task", q, name=name, params=params)
+        messagebox.showinfo("Modifica in blocco", f"Quest modificate: {len(changes)} su {len(quests)}.", parent=self)
+
+    @profiled()
     def _save_all(self):
+        bad = []
         for tab in self.quest_tabs:
-            tab.apply_ui_to_model()
+            if tab.built:
+                invalid = tab.apply_ui_to_model()
+                if invalid:
+                    bad.append(f"{tab.quest.quest_id}: {', '.join(invalid)}")
+            else:
+                tab.sync_model()
+        if bad:
+            messagebox.showerror("Errore", "Salvataggio annullato: valori numerici non validi.\n\n" + "\n".join(bad), parent=self)
+            return
+
+        invalid = validate_all(self.quests)
+        if invalid:
+            messagebox.showerror("Errore", f"Salvataggio annullato.\n\n{validation_summary(invalid)}", parent=self)
+            return
 
+        # gli id sconosciuti sono solo un avviso: il catalogo può essere indietro rispetto al server
         try:
-            for q in self.quests:
-                self._save_quest_yaml(q)
-        except Exception as e:
-            messagebox.showerror("Errore", f"Salvataggio fallito: {e}", parent=self)
+            unknown = validate_ids(self.quests)
+        except CatalogError:
+            unknown = []
+        if unknown and not messagebox.askyesno(
+            "Identificatori sconosciuti",
+            f"{validation_summary(unknown)}\n\nSalvare comunque?",
+            icon="warning",
+            parent=self,
+        ):
             return
 
-        messagebox.showinfo("OK", "File YAML salvati correttamente nella cartella 'quests/'.", parent=self)
-
-    def _save_quest_yaml(self, q: Quest):
-        tasks_out = {}
-        for tname, task in q.tasks.items():
-            tdict = {"type": task.type}
-            tdict.update(task.params)
-            tasks_out[tname] = tdict
-
-        tab = next((t for t in self.quest_tabs if t.quest is q), None)
-        placeholders, progress_placeholders = tab.generate_placeholders() if tab else ({}, {})
-
-        out = {
-            "tasks": tasks_out,
-            "display": {
-                "name": q.display_name,
-                "lore-normal": q.lore_normal,
-                "lore-started": q.lore_started,
-                "type": q.display_type,
-            },
-            "rewards": q.rewards,
-            "placeholders": placeholders,
-            "progress-placeholders": progress_placeholders,
-            "options": {
-                "category": q.category,
-                "repeatable": q.repeatable,
-                "requires": q.requires if q.requires else None,
-                "cooldown": {
-                    "enabled": q.cooldown_enabled,
-                    "time": q.cooldown_time,
-                },
-                "sort-order": q.sort_order,
-            },
-        }
+        if not self._confirm_dependencies(self.quests):
+            return
+
+        documents = [(self._quest_path(q), *self._quest_document(q)) for q in self.quests]
+        report = export_documents(documents, cache=self.export_cache)
+
+        if not report.ok:
+            messagebox.showerror("Errore", f"Salvataggio fallito.\n\n{report.summary()}", parent=self)
+            return
+
+        messagebox.showinfo(
+            "OK",
+            f"File YAML salvati correttamente nella cartella 'quests/'.\n\n{report.summary()}",
+            parent=self,
+        )
+
+    def _quest_path(self, q: Quest) -> Path:
+        return quest_path(q)
 
-        if out["options"].get("requires") is None:
-            out["options"].pop("requires", None)
+    def _quest_document(self, q: Quest) -> tuple[dict, str, str]:
+        """(documento, YAML, digest) della quest, riusati finché la quest non cambia."""
+        return cached_document(q, self._placeholder_cfg())
 
-        base_dir = Path("quests") / q.category
-        base_dir.mkdir(parents=True, exist_ok=True)
 
-        file_path = base_dir / f"{q.quest_id}.yml"
-        content = yaml_dump(out) + "\n"
-        file_path.write_text(content, encoding="utf-8")
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Editor di quest per SkyBlock.")
+    parser.add_argument("--profile", action="store_true", help="misura i tempi e stampa un report all'uscita")
+    parser.add_argument("--profile-trace", metavar="FILE", help="scrive anche un trace JSON per chrome://tracing")
+    args = parser.parse_args(argv)
+    if args.profile or args.profile_trace:
+        profiling.enable(args.profile_trace)
+    App().mainloop()
 
 
 if __name__ == "__main__":
-    App().mainloop()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""Misura il tempo di import del core (``questcore``) in un interprete pulito.
+
+Uso::
+
+    python benchmarks/bench_import.py [--repeat 5] [--scale 1.0]
+
+Per ogni modulo lancia ``python -X importtime -c "import <modulo>"`` in un
+sottoprocesso, legge il tempo cumulativo e verifica che ``tkinter`` non venga
+mai caricato. Esce con codice 1 se un modulo del core supera il suo budget
+(moltiplicato per ``--scale`` su macchine lente) o importa tkinter; export e
+CLI vengono solo misurati.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# modulo -> budget in ms (mediana), None = solo misura
+MODULES = {
+    "questcore": 5.0,
+    "questcore.profiling": 5.0,
+    "questcore.yamlio": 10.0,
+    "questcore.schema": 10.0,
+    "questcore.model": 40.0,
+    "questcore.derive": 45.0,
+    "questcore.export": None,
+    "questcore.batch": None,
+}
+
+
+def measure(module: str) -> tuple[float, bool]:
+    """Restituisce (ms cumulativi per importare ``module``, tkinter importato)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    tk_loaded = False
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if name == module:
+            total_us = int(cumulative_us)
+        if name.split(".")[0] in ("tkinter", "_tkinter"):
+            tk_loaded = True
+    return total_us / 1000, tk_loaded
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="moltiplicatore dei budget")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module, budget in MODULES.items():
+        samples = []
+        tk_loaded = False
+        for _ in range(args.repeat):
+            ms, tk = measure(module)
+            samples.append(ms)
+            tk_loaded |= tk
+        median = statistics.median(samples)
+        status = "ok"
+        if tk_loaded:
+            status = "IMPORTA TKINTER"
+            failed = True
+        elif budget is not None and median > budget * args.scale:
+            status = "oltre budget"
+            failed = True
+        print(f"{module:<20} {median:8.2f} ms  (min {min(samples):.2f})  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
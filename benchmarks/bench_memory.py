@@ -0,0 +1,117 @@
+"""Memoria occupata dalle quest caricate da file (come fa "Importa quest esistenti").
+
+Uso::
+
+    python benchmarks/bench_memory.py [--quests 2000] [--tasks 1 40]
+
+Genera i file .yml di quest sintetiche, poi li rilegge con ``yaml_load`` +
+``quest_from_document`` misurando con ``tracemalloc`` la memoria che resta
+allocata. Come riferimento ricostruisce gli stessi dati con dataclass semplici
+(``__dict__`` per istanza, stringhe non internate, contenitori vuoti separati),
+cioè la rappresentazione precedente a slot e interning.
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+
+from synthetic import make_quests, quest_files
+
+from questcore import quest_from_document, yaml_load
+
+
+@dataclass
+class PlainTask:
+    name: str
+    type: str
+    params: dict = field(default_factory=dict)
+    label: str = ""
+
+
+@dataclass
+class PlainQuest:
+    quest_id: str
+    sort_order: int
+    category: str
+    category_display: str
+    tasks: dict = field(default_factory=dict)
+    display_name: str = ""
+    display_type: str = "STONE"
+    lore_normal: list = field(default_factory=list)
+    lore_started: list = field(default_factory=list)
+    rewards: list = field(default_factory=list)
+    repeatable: bool = False
+    cooldown_enabled: bool = True
+    cooldown_time: int = 1440
+    requires: list = field(default_factory=list)
+    placeholders_override: dict = field(default_factory=dict)
+    progress_placeholders_override: dict = field(default_factory=dict)
+    lore_reward_lines: list = field(default_factory=list)
+    lore_normal_manual: bool = False
+    lore_started_manual: bool = False
+    display_auto: bool = True
+
+
+def plain_copy(quest) -> PlainQuest:
+    """La stessa quest con la rappresentazione semplice; ogni stringa diventa un oggetto a sé, come dopo il parsing."""
+    def fresh(value):
+        if isinstance(value, str):
+            return "".join(list(value)) if value else ""
+        if isinstance(value, list):
+            return [fresh(v) for v in value]
+        if isinstance(value, dict):
+            return {fresh(k): fresh(v) for k, v in value.items()}
+        return value
+
+    tasks = {fresh(n): PlainTask(fresh(t.name), fresh(t.type), fresh(t.params), fresh(t.label)) for n, t in quest.tasks.items()}
+    return PlainQuest(
+        fresh(quest.quest_id), quest.sort_order, fresh(quest.category), fresh(quest.category_display), tasks,
+        fresh(quest.display_name), fresh(quest.display_type), fresh(quest.lore_normal), fresh(quest.lore_started),
+        fresh(quest.rewards), quest.repeatable, quest.cooldown_enabled, quest.cooldown_time, fresh(quest.requires),
+        fresh(quest.placeholders_override), fresh(quest.progress_placeholders_override), fresh(quest.lore_reward_lines),
+        quest.lore_normal_manual, quest.lore_started_manual, quest.display_auto,
+    )
+
+
+def retained(build) -> tuple[object, int]:
+    """(risultato di ``build()``, byte ancora allocati dopo la costruzione)."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quests", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, nargs=2, default=(1, 40), metavar=("MIN", "MAX"))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    files = quest_files(make_quests(args.quests, tuple(args.tasks), seed=args.seed, categories=4))
+
+    def load():
+        quests = [quest_from_document(yaml_load(text), path.stem, category=path.parent.name) for path, text in files]
+        for q in quests:
+            q.derived_cache.clear()  # ricostruibile: non fa parte del modello
+        return quests
+
+    quests, model_bytes = retained(load)
+    _plain, plain_bytes = retained(lambda: [plain_copy(q) for q in quests])
+    n_tasks = sum(len(q.tasks) for q in quests)
+
+    print(f"{len(quests)} quest, {n_tasks} task")
+    print(f"{'rappresentazione':<28} {'MiB':>8} {'byte/quest':>11} {'byte/task':>10}")
+    for name, size in (("dataclass semplici", plain_bytes), ("slot + interning", model_bytes)):
+        print(f"{name:<28} {size / 2**20:8.2f} {size / len(quests):11.0f} {size / max(1, n_tasks):10.0f}")
+    print(f"risparmio: {(1 - model_bytes / plain_bytes) * 100:.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
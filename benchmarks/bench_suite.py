@@ -0,0 +1,268 @@
+"""Suite di benchmark della pipeline di export e dei percorsi caldi dell'editor.
+
+Uso::
+
+    python benchmarks/bench_suite.py [--sizes 10 200 5000] [--tasks 1 200] [--repeat 3]
+                                     [--save NOME] [--compare baselines/NOME.json] [--tolerance 0.2]
+
+Per ogni dimensione genera un insieme di quest sintetiche (``synthetic.py``,
+seed fisso) e misura:
+
+- ``yaml_dump``: serializzazione dei documenti di tutte le quest;
+- ``placeholders``: ``generate_placeholders_base`` a cache fredda;
+- ``lore``: ricostruzione di lore-normal e lore-started;
+- ``save``: il percorso di "Salva" (documenti + ``export_documents``) in una
+  cartella temporanea, prima a cartella vuota e senza documenti in cache, poi
+  con tutte le quest e tutti i file invariati;
+- ``questtab``: costruzione dei widget di una ``QuestTab``, solo se c'è un
+  display (anche virtuale, es. ``xvfb-run``).
+
+Riporta tempo mediano, throughput e picco di memoria (``tracemalloc``, in un
+giro separato). ``--save`` scrive i risultati in ``benchmarks/baselines/``;
+``--compare`` li confronta con una baseline ed esce con codice 1 se un caso è
+più lento della tolleranza.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from synthetic import ROOT, make_quests
+
+from questcore import (
+    DEFAULT_PLACEHOLDER_CFG,
+    ExportCache,
+    PlaceholderConfig,
+    cached_document,
+    export_documents,
+    generate_placeholders,
+    generate_placeholders_base,
+    lore_normal_for,
+    lore_started_for,
+    quest_document,
+    quest_path,
+    yaml_dump,
+)
+
+BASELINES = Path(__file__).resolve().parent / "baselines"
+QUESTTAB_LIMIT = 50  # tab costruite per dimensione: oltre non dice nulla di nuovo
+
+
+class Context:
+    """Dati condivisi dai casi di una dimensione."""
+
+    def __init__(self, quests: list, workdir: Path):
+        self.quests = quests
+        self.cfg = PlaceholderConfig.from_dict(DEFAULT_PLACEHOLDER_CFG)
+        self.documents = [quest_document(q, *generate_placeholders(q, self.cfg)) for q in quests]
+        self.workdir = workdir
+        self.tasks = sum(len(q.tasks) for q in quests)
+        self.tk_root = None
+        self.unchanged_cache: ExportCache | None = None
+
+
+def case_yaml_dump(ctx: Context) -> int:
+    for doc in ctx.documents:
+        yaml_dump(doc)
+    return len(ctx.documents)
+
+
+def case_placeholders(ctx: Context) -> int:
+    for q in ctx.quests:
+        q.derived_cache.pop("placeholders", None)
+        generate_placeholders_base(q, ctx.cfg)
+    return len(ctx.quests)
+
+
+def case_lore(ctx: Context) -> int:
+    for q in ctx.quests:
+        lore_normal_for(q)
+        lore_started_for(q)
+    return len(ctx.quests)
+
+
+def _save(ctx: Context, root: Path, cache: ExportCache):
+    documents = [(quest_path(q, root), *cached_document(q, ctx.cfg)) for q in ctx.quests]
+    report = export_documents(documents, cache=cache)
+    if not report.ok:
+        raise RuntimeError(report.summary())
+    return report
+
+
+def case_save(ctx: Context) -> int:
+    for q in ctx.quests:
+        q.document_cache = None  # a freddo: documenti serializzati da zero
+    root = Path(tempfile.mkdtemp(dir=ctx.workdir))
+    _save(ctx, root, ExportCache(manifest=False))
+    return len(ctx.quests)
+
+
+def case_save_unchanged(ctx: Context) -> int:
+    root = ctx.workdir / "unchanged"
+    cache = ctx.unchanged_cache
+    if cache is None:
+        cache = ctx.unchanged_cache = ExportCache(manifest=False)
+        _save(ctx, root, cache)  # primo giro fuori misura: da qui in poi tutto è invariato
+    _save(ctx, root, cache)
+    return len(ctx.quests)
+
+
+def _tk_root():
+    try:
+        import tkinter as tk
+
+        root = tk.Tk()
+    except Exception:
+        return None
+    root.withdraw()
+    return root
+
+
+def case_questtab(ctx: Context) -> int:
+    import Main
+
+    root = ctx.tk_root
+    quests = ctx.quests[:QUESTTAB_LIMIT]
+    for q in quests:
+        tab = Main.QuestTab(root, q, lambda: ctx.cfg)
+        tab.ensure_built()
+        root.update_idletasks()
+        root.update()  # esegue il ridisegno accorpato
+        tab.destroy()
+    return len(quests)
+
+
+CASES = {
+    "yaml_dump": case_yaml_dump,
+    "placeholders": case_placeholders,
+    "lore": case_lore,
+    "save": case_save,
+    "save_unchanged": case_save_unchanged,
+    "questtab": case_questtab,
+}
+
+
+def run_case(func, ctx: Context, repeat: int) -> dict:
+    samples = []
+    items = 0
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        items = func(ctx)
+        samples.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    func(ctx)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = statistics.median(samples)
+    return {
+        "seconds": seconds,
+        "min_seconds": min(samples),
+        "items": items,
+        "per_second": items / seconds if seconds else 0.0,
+        "peak_bytes": peak - base,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return out.stdout.strip()
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Righe di confronto; quelle che iniziano con "!" sono regressioni oltre la tolleranza."""
+    lines = []
+    for key, new in results.items():
+        old = baseline.get("results", {}).get(key)
+        if not old or not old["seconds"]:
+            continue
+        ratio = new["seconds"] / old["seconds"]
+        mark = "!" if ratio > 1 + tolerance else " "
+        lines.append(f"{mark} {key:<24} {old['seconds'] * 1000:10.1f} ms -> {new['seconds'] * 1000:10.1f} ms  ({ratio:5.2f}x)")
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 200, 5000])
+    parser.add_argument("--tasks", type=int, nargs=2, default=(1, 200), metavar=("MIN", "MAX"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--save", metavar="NOME", help="salva i risultati in benchmarks/baselines/NOME.json")
+    parser.add_argument("--compare", type=Path, metavar="FILE", help="confronta con una baseline salvata")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="rallentamento ammesso nel confronto (0.2 = +20%%)")
+    args = parser.parse_args(argv)
+
+    tk_root = _tk_root() if "questtab" in args.cases else None
+    results = {}
+
+    print(f"{'caso':<24} {'mediana':>10} {'item/s':>12} {'picco MiB':>10}")
+    with tempfile.TemporaryDirectory(prefix="questbench-") as tmp:
+        for size in args.sizes:
+            quests = make_quests(size, tuple(args.tasks), seed=args.seed, categories=max(1, size // 1000))
+            workdir = Path(tmp) / str(size)
+            workdir.mkdir()
+            ctx = Context(quests, workdir)
+            ctx.tk_root = tk_root
+            print(f"-- {size} quest, {ctx.tasks} task")
+
+            for name in args.cases:
+                if name == "questtab" and tk_root is None:
+                    print(f"{size}/{name:<19} saltato: nessun display")
+                    continue
+                key = f"{size}/{name}"
+                results[key] = result = run_case(CASES[name], ctx, args.repeat)
+                print(
+                    f"{key:<24} {result['seconds'] * 1000:8.1f} ms {result['per_second']:12.0f} "
+                    f"{result['peak_bytes'] / 2**20:10.2f}"
+                )
+
+    if tk_root is not None:
+        tk_root.destroy()
+
+    data = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tasks": list(args.tasks),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    if args.save:
+        BASELINES.mkdir(exist_ok=True)
+        path = BASELINES / f"{args.save}.json"
+        path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"baseline salvata in {path}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        print(f"confronto con {args.compare} (commit {baseline.get('meta', {}).get('commit') or '?'}):")
+        lines = compare(results, baseline, args.tolerance)
+        print("\n".join(lines) if lines else "nessun caso in comune")
+        if any(line.startswith("!") for line in lines):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Quest sintetiche e riproducibili per i benchmark.
+
+Le task coprono tutti i tipi di ``TASK_DEFS`` e pescano blocchi, mob, item e
+mondi da piccoli insiemi, come in una rete reale dove gli stessi identificatori
+si ripetono in migliaia di task; gli incantesimi vengono dal catalogo incluso.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from questcore import (  # noqa: E402
+    DEFAULT_PLACEHOLDER_CFG,
+    TASK_DEFS,
+    TASK_TYPES,
+    Task,
+    create_quests,
+    generate_placeholders,
+    load_catalog,
+    quest_document,
+    quest_path,
+    refresh_derived,
+    yaml_dump,
+)
+
+BLOCKS = ["STONE", "COBBLESTONE", "OAK_LOG", "SAND", "GRAVEL", "IRON_ORE", "COAL_ORE", "WHEAT", "CARROTS", "DIAMOND_ORE"]
+MOBS = ["ZOMBIE", "SKELETON", "CREEPER", "SPIDER", "COW", "PIG", "SHEEP", "ENDERMAN"]
+ITEMS = ["DIAMOND", "IRON_INGOT", "BREAD", "GOLDEN_APPLE", "BOOK", "POTION", "NETHERITE_INGOT"]
+WORLDS = ["skyblock", "skyblock_nether", "skyblock_end"]
+ENCHANTMENTS = list(load_catalog().values("enchantments"))
+
+
+def _value(rng: random.Random, key: str, ftype: str, default):
+    if ftype == "int":
+        return rng.randint(1, 512)
+    if ftype == "opt_int":
+        return rng.choice([None, rng.randint(1, 5)])
+    if ftype == "bool":
+        return rng.random() < 0.5
+    if ftype == "enum":
+        return rng.choice(default[0])
+    if "mob" in key:
+        pool = MOBS
+    elif "block" in key:
+        pool = BLOCKS
+    elif "enchant" in key:
+        pool = ENCHANTMENTS
+    else:
+        pool = WORLDS if key == "worlds" else ITEMS
+    if ftype == "list[str]":
+        return rng.sample(pool, rng.randint(1, min(3, len(pool))))
+    return rng.choice(pool)
+
+
+def make_params(rng: random.Random, task_type: str) -> dict:
+    schema = TASK_DEFS[task_type]
+    params = {key: _value(rng, key, ftype, default) for key, (ftype, default) in schema["required"].items()}
+    taken = set()
+    for a, b in schema["mutex_groups"]:
+        taken.add(rng.choice((a, b)))  # ne valorizza solo uno per coppia
+    skip = {k for group in schema["mutex_groups"] for k in group} - taken
+    for key, (ftype, default) in schema["optional"].items():
+        if key not in skip and rng.random() < 0.6:
+            params[key] = _value(rng, key, ftype, default)
+    return params
+
+
+def make_quests(count: int, tasks: tuple[int, int] = (1, 200), seed: int = 0, categories: int = 1) -> list:
+    """``count`` quest divise in ``categories`` categorie, ognuna con un numero di task in ``tasks``."""
+    rng = random.Random(seed)
+    quests = []
+    per_category = -(-count // categories)
+    for c in range(categories):
+        n = min(per_category, count - len(quests))
+        if n <= 0:
+            break
+        for q in create_quests(f"cat{c}", f"Categoria {c}", n, 0):
+            for i in range(rng.randint(*tasks)):
+                task_type = TASK_TYPES[(i + q.sort_order) % len(TASK_TYPES)]
+                q.add_task(Task(name=f"t{i}", type=task_type, params=make_params(rng, task_type), label=f"Obiettivo {i}"))
+            q.rewards = [f"eco give {{player}} {q.sort_order * 100}"]
+            q.lore_reward_lines = [f"{q.sort_order * 100} monete"]
+            refresh_derived(q)
+            quests.append(q)
+    return quests
+
+
+def quest_files(quests: list, cfg=DEFAULT_PLACEHOLDER_CFG, root: Path = Path("quests")) -> list[tuple[Path, str]]:
+    """(percorso, testo YAML) di ogni quest, come li scriverebbe il salvataggio."""
+    return [(quest_path(q, root), yaml_dump(quest_document(q, *generate_placeholders(q, cfg)))) for q in quests]
@@ -0,0 +1,120 @@
+"""Core del SkyBlock Quests Creator: schema, modello, YAML ed export, senza dipendenze da tkinter.
+
+I sottomoduli vengono caricati alla prima richiesta di un nome (PEP 562), così
+``import questcore`` resta quasi gratuito e chi usa solo ``yaml_dump`` non paga
+l'import del modello o dell'export. ``benchmarks/bench_import.py`` misura i tempi.
+"""
+
+import importlib
+
+# nome pubblico -> sottomodulo che lo definisce
+_EXPORTS = {
+    "DEFAULT_PLACEHOLDER_CFG": "templates",
+    "PlaceholderConfig": "templates",
+    "PlaceholderTemplate": "templates",
+    "TemplateError": "templates",
+    "validate_placeholder_cfg": "templates",
+    "DERIVED_INPUTS": "derive",
+    "build_lore": "derive",
+    "cached_document": "derive",
+    "generate_placeholders": "derive",
+    "generate_placeholders_base": "derive",
+    "lore_normal_for": "derive",
+    "lore_started_for": "derive",
+    "placeholders_preview": "derive",
+    "quest_document": "derive",
+    "refresh_derived": "derive",
+    "task_category_title": "derive",
+    "task_title": "derive",
+    "Catalog": "catalog",
+    "CatalogError": "catalog",
+    "FIELD_KINDS": "catalog",
+    "load_catalog": "catalog",
+    "validate_ids": "catalog",
+    "ExportCache": "export",
+    "ExportReport": "export",
+    "ExportResult": "export",
+    "export_documents": "export",
+    "quest_path": "export",
+    "int_to_roman": "helpers",
+    "COMPACT_BYTES": "journal",
+    "DEFAULT_JOURNAL_PATH": "journal",
+    "Journal": "journal",
+    "JournalError": "journal",
+    "checkpoint": "journal",
+    "needs_compaction": "journal",
+    "read_journal": "journal",
+    "recover": "journal",
+    "replay_journal": "journal",
+    "profiled": "profiling",
+    "span": "profiling",
+    "DEFAULT_SESSION_PATH": "session",
+    "Session": "session",
+    "SessionError": "session",
+    "load_session": "session",
+    "save_session": "session",
+    "session_from_dict": "session",
+    "session_to_dict": "session",
+    "CURVE_KINDS": "progression",
+    "Curve": "progression",
+    "CurveError": "progression",
+    "apply_progression": "progression",
+    "tier_values": "progression",
+    "BULK_FIELDS": "bulk",
+    "BulkEdit": "bulk",
+    "BulkError": "bulk",
+    "apply_bulk": "bulk",
+    "select_quests": "bulk",
+    "QuestIndex": "search",
+    "SearchHit": "search",
+    "Quest": "model",
+    "Task": "model",
+    "create_quests": "model",
+    "default_display_name": "model",
+    "FieldError": "schema",
+    "FieldSpec": "schema",
+    "TASK_DEFS": "schema",
+    "TASK_TYPE_TITLES": "schema",
+    "TASK_TYPES": "schema",
+    "TaskSchema": "schema",
+    "ValidationError": "schema",
+    "compiled_schema": "schema",
+    "default_params": "schema",
+    "mutex_conflicts": "schema",
+    "normalize_params": "schema",
+    "validate_all": "schema",
+    "validate_task": "schema",
+    "validation_summary": "schema",
+    "text_digest": "yamlio",
+    "yaml_digest": "yamlio",
+    "yaml_dump": "yamlio",
+    "yaml_iter_lines": "yamlio",
+    "yaml_write": "yamlio",
+    "GraphReport": "graph",
+    "QuestGraph": "graph",
+    "RequiresScan": "graph",
+    "existing_requires": "graph",
+    "read_requires": "graph",
+    "LoadReport": "yamlload",
+    "YamlLoadError": "yamlload",
+    "load_quest_file": "yamlload",
+    "load_quests_dir": "yamlload",
+    "quest_from_document": "yamlload",
+    "yaml_load": "yamlload",
+    "yaml_load_lines": "yamlload",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,265 @@
+"""Generazione headless delle quest da una spec dichiarativa (JSON), senza avviare Tk.
+
+Uso::
+
+    python -m questcore spec.json [--output quests] [--dry-run] [--no-manifest]
+
+Esempio di spec::
+
+    {
+      "category": "mining",
+      "category_display": "Miniera",
+      "count": 100,
+      "last_sort_order": 0,
+      "placeholders": {"placeholders_key_fmt": "progress-{task}"},
+      "quest": {"display_type": "STONE", "repeatable": false, "cooldown_enabled": true, "cooldown_time": 1440},
+      "seed": 7,
+      "curves": {
+        "amount": {"kind": "geometric", "start": 64, "end": 6400, "round_to": 64},
+        "money": {"kind": "linear", "start": 100, "end": 10000, "round_to": 50}
+      },
+      "tasks": [
+        {"name": "pietra", "type": "blockbreak", "label": "Pietra {roman}", "params": {"amount": "{amount}", "block": "STONE"}}
+      ],
+      "rewards": ["eco give {player} {money}"],
+      "lore_rewards": ["{money} monete"]
+    }
+
+Nelle stringhe di task, opzioni, premi e lore-premi vengono sostituiti
+``{sort_order}``, ``{index}`` (1-based nel batch), ``{roman}``, ``{quest_id}``,
+``{category}``, ``{category_display}`` e il valore di ogni curva di ``curves``
+per quel livello (vedi ``progression.Curve``; ``seed`` rende ripetibile il
+``jitter``); ogni altro ``{...}`` (es. ``{player}``) resta invariato. I campi
+interi accettano anche stringhe come ``"{amount}"``.
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from . import profiling
+from .catalog import CatalogError, validate_ids
+from .derive import DEFAULT_PLACEHOLDER_CFG, generate_placeholders, quest_document, refresh_derived
+from .export import ExportCache, export_documents, quest_path
+from .graph import QuestGraph, existing_requires
+from .helpers import int_to_roman
+from .model import Quest, Task, create_quests
+from .progression import CurveError, tier_values
+from .schema import TASK_DEFS, FieldError, FieldSpec, compiled_schema, validation_summary
+from .templates import PlaceholderConfig, TemplateError
+
+_TEMPLATE_FIELDS = ("sort_order", "index", "roman", "quest_id", "category", "category_display")
+_TEMPLATE_RE = re.compile(r"\{(\w+)\}")
+
+_QUEST_OPTIONS = {
+    "display_type": FieldSpec("display_type", "str"),
+    "repeatable": FieldSpec("repeatable", "bool"),
+    "cooldown_enabled": FieldSpec("cooldown_enabled", "bool"),
+    "cooldown_time": FieldSpec("cooldown_time", "int"),
+}
+
+
+class SpecError(ValueError):
+    pass
+
+
+def _render(value, fields: dict):
+    if isinstance(value, str):
+        return _TEMPLATE_RE.sub(lambda m: fields.get(m.group(1), m.group(0)), value)
+    if isinstance(value, list):
+        return [_render(v, fields) for v in value]
+    return value
+
+
+def _section(spec: dict, key: str, kind: type, default):
+    """``spec[key]`` se è del tipo atteso (``null`` o assente: ``default``), altrimenti ``SpecError``."""
+    value = spec.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, kind) or isinstance(value, bool) and kind is int:
+        names = {dict: "un oggetto", list: "una lista", int: "un numero intero", str: "una stringa"}
+        raise SpecError(f"'{key}' deve essere {names[kind]}, trovato {type(value).__name__}")
+    return value
+
+
+def _coerce(owner: str, spec: FieldSpec, value):
+    try:
+        return spec.coerce(value)
+    except FieldError as e:
+        raise SpecError(f"{owner}.{spec.key}: {e}") from None
+
+
+def _build_task(template: dict, fields: dict) -> Task:
+    if not isinstance(template, dict):
+        raise SpecError(f"task non valida (serve un oggetto): {template!r}")
+    name = template.get("name")
+    task_type = template.get("type")
+    if not name or not isinstance(name, str):
+        raise SpecError(f"task senza 'name': {template!r}")
+    if task_type not in TASK_DEFS:
+        raise SpecError(f"task '{name}': tipo sconosciuto {task_type!r}")
+
+    schema = compiled_schema(task_type)
+    raw = template.get("params") or {}
+    if not isinstance(raw, dict):
+        raise SpecError(f"task '{name}': 'params' deve essere un oggetto")
+    unknown = sorted(set(raw) - set(schema.fields))
+    if unknown:
+        raise SpecError(f"task '{name}' ({task_type}): campi sconosciuti {unknown}")
+
+    values = {}
+    for key, spec in schema.fields.items():
+        if key not in raw:
+            if spec.required and spec.ftype == "int":
+                raise SpecError(f"task '{name}' ({task_type}): campo obbligatorio '{key}' mancante")
+            continue
+        values[key] = _coerce(task_type, spec, _render(raw[key], fields))
+
+    params = schema.normalize(values)
+    errors = schema.errors(params)
+    if errors:
+        _key, _code, message = errors[0]
+        raise SpecError(f"task '{name}' ({task_type}): {message}")
+
+    label = template.get("label")
+    if label is None:
+        label = name.capitalize()
+    elif not isinstance(label, str):
+        raise SpecError(f"task '{name}': 'label' deve essere una stringa, trovato {type(label).__name__}")
+    label = _render(label, fields)
+    return Task(name=name, type=task_type, params=params, label=label)
+
+
+@profiling.profiled("build_quests")
+def build_quests(spec: dict) -> tuple[list[Quest], PlaceholderConfig]:
+    """Costruisce le quest descritte da ``spec``; restituisce (quest, config placeholders)."""
+    if not isinstance(spec, dict):
+        raise SpecError(f"la spec deve essere un oggetto JSON, trovato {type(spec).__name__}")
+    for key in ("category", "category_display", "count"):
+        if spec.get(key) is None:
+            raise SpecError(f"campo obbligatorio mancante nella spec: {key}")
+    category = _section(spec, "category", str, "").strip()
+    category_display = _section(spec, "category_display", str, "").strip()
+    count = _section(spec, "count", int, 0)
+    last_sort = _section(spec, "last_sort_order", int, 0)
+
+    if not category:
+        raise SpecError("La categoria non può essere vuota.")
+    if not category_display:
+        raise SpecError("Il nome visualizzato non può essere vuoto.")
+    if count <= 0:
+        raise SpecError("Il range deve essere >= 1.")
+
+    cfg = dict(DEFAULT_PLACEHOLDER_CFG)
+    for key, value in _section(spec, "placeholders", dict, {}).items():
+        if key not in cfg:
+            raise SpecError(f"placeholders: chiave sconosciuta {key!r}")
+        cfg[key] = str(value).strip() or cfg[key]
+    try:
+        compiled = PlaceholderConfig(**cfg)
+    except TemplateError as e:
+        raise SpecError(f"placeholders: {e}") from None
+
+    options = _section(spec, "quest", dict, {})
+    unknown = sorted(set(options) - set(_QUEST_OPTIONS))
+    if unknown:
+        raise SpecError(f"quest: campi sconosciuti {unknown}")
+
+    task_templates = _section(spec, "tasks", list, [])
+    for template in task_templates:
+        if not isinstance(template, dict):
+            raise SpecError(f"task non valida (serve un oggetto): {template!r}")
+        if not template.get("name") or not isinstance(template["name"], str):
+            raise SpecError(f"task senza 'name': {template!r}")
+    names = [t["name"] for t in task_templates]
+    if len(names) != len(set(names)):
+        raise SpecError("i nomi delle task devono essere univoci nella quest")
+
+    curves = _section(spec, "curves", dict, {})
+    rewards = _section(spec, "rewards", list, [])
+    lore_rewards = _section(spec, "lore_rewards", list, [])
+    for name in curves:
+        if not re.fullmatch(r"\w+", name) or name in _TEMPLATE_FIELDS:
+            raise SpecError(f"curves: nome non valido {name!r}")
+    seed = spec.get("seed")
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, (int, str))):
+        raise SpecError(f"'seed' deve essere un numero intero o una stringa, trovato {type(seed).__name__}")
+    try:
+        tiers = tier_values(curves, count, seed)
+    except CurveError as e:
+        raise SpecError(f"curves.{e}") from None
+
+    quests = create_quests(category, category_display, count, last_sort)
+    for index, q in enumerate(quests, start=1):
+        fields = {name: str(column[index - 1]) for name, column in tiers.items()}
+        fields |= {
+            "sort_order": str(q.sort_order),
+            "index": str(index),
+            "roman": int_to_roman(q.sort_order),
+            "quest_id": q.quest_id,
+            "category": q.category,
+            "category_display": q.category_display,
+        }
+        for key, option in _QUEST_OPTIONS.items():
+            if key in options:
+                setattr(q, key, _coerce("quest", option, _render(options[key], fields)))
+        for template in task_templates:
+            task = _build_task(template, fields)
+            q.add_task(task)
+        q.rewards = [str(r) for r in _render(rewards, fields)]
+        q.lore_reward_lines = [str(r) for r in _render(lore_rewards, fields)]
+        refresh_derived(q)
+
+    return quests, compiled
+
+
+def write_quests(quests: list[Quest], cfg: PlaceholderConfig, output: Path, manifest: bool = True):
+    documents = [(quest_path(q, output), quest_document(q, *generate_placeholders(q, cfg))) for q in quests]
+    return export_documents(documents, cache=ExportCache(manifest=manifest))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m questcore", description="Genera file quest .yml da una spec JSON.")
+    parser.add_argument("spec", type=Path, help="file JSON con la spec del batch")
+    parser.add_argument("--output", type=Path, default=None, help="cartella di destinazione (default: 'output' della spec o quests/)")
+    parser.add_argument("--dry-run", action="store_true", help="valida la spec senza scrivere file")
+    parser.add_argument("--no-manifest", action="store_true", help="non leggere/scrivere il manifest dei digest")
+    parser.add_argument("--ignore-deps", action="store_true", help="scrivi anche se i requires non sono validi")
+    parser.add_argument("--profile", action="store_true", help="misura i tempi e stampa un report su stderr all'uscita")
+    parser.add_argument("--profile-trace", metavar="FILE", help="scrive anche un trace JSON per chrome://tracing")
+    args = parser.parse_args(argv)
+    if args.profile or args.profile_trace:
+        profiling.enable(args.profile_trace)
+
+    try:
+        spec = json.loads(args.spec.read_text(encoding="utf-8"))
+        quests, cfg = build_quests(spec)
+        output = args.output or Path(_section(spec, "output", str, "quests"))
+    except (OSError, ValueError) as e:
+        print(f"errore: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        unknown = validate_ids(quests)
+    except CatalogError as e:
+        print(f"avviso: {e}", file=sys.stderr)
+    else:
+        if unknown:
+            print(f"avviso: {validation_summary(unknown)}", file=sys.stderr)
+
+    deps = QuestGraph.build(quests, existing_requires(output)).check()
+    if not deps.ok:
+        print(deps.summary(), file=sys.stderr)
+        if not args.ignore_deps:
+            print("errore: dipendenze non valide (usa --ignore-deps per scrivere comunque)", file=sys.stderr)
+            return 2
+
+    if args.dry_run:
+        print(f"{len(quests)} quest valide ({quests[0].quest_id} .. {quests[-1].quest_id}).")
+        return 0
+
+    report = write_quests(quests, cfg, output, manifest=not args.no_manifest)
+    print(report.summary())
+    return 0 if report.ok else 1
@@ -0,0 +1,158 @@
+"""Modifica in blocco di più quest (campi, righe premio, trasformazioni delle task).
+
+Una ``BulkEdit`` descrive cosa cambiare; ``apply_bulk`` la applica direttamente
+ai modelli in un solo passaggio e alla fine ricalcola una volta sola i campi
+derivati (lore e placeholders) di ogni quest toccata. Le quest da modificare si
+scelgono con ``select_quests``: tutte, per intervallo di ``sort_order`` o tra
+quelle indicate (es. i risultati di una ricerca). Quest e risultati sono
+confrontati per identità: quest di categorie diverse possono avere lo stesso
+``quest_id``.
+"""
+
+import math
+
+from .derive import refresh_derived
+
+# campi della quest impostabili in blocco -> tipo atteso
+BULK_FIELDS = {
+    "cooldown_enabled": bool,
+    "cooldown_time": int,
+    "repeatable": bool,
+    "display_type": str,
+}
+
+
+class BulkError(ValueError):
+    pass
+
+
+def select_quests(quests, *, sort_range: tuple[int, int] | None = None, among=None) -> list:
+    """Quest (nell'ordine dato) con ``sort_order`` nell'intervallo chiuso e/o presenti in ``among``."""
+    chosen = None if among is None else {id(q) for q in among}
+    low, high = sort_range if sort_range is not None else (None, None)
+    out = []
+    for q in quests:
+        if chosen is not None and id(q) not in chosen:
+            continue
+        if low is not None and not low <= q.sort_order <= high:
+            continue
+        out.append(q)
+    return out
+
+
+def scale_value(value, factor: float):
+    """``value * factor``: gli interi restano interi (arrotondati) e non scendono sotto 1 se lo erano."""
+    if type(value) is bool or not isinstance(value, (int, float)):
+        return value
+    scaled = value * factor
+    if type(value) is int:
+        scaled = math.floor(scaled + 0.5)
+        if value >= 1:
+            scaled = max(1, scaled)
+    return scaled
+
+
+class BulkEdit:
+    """Modifiche da applicare a ogni quest selezionata.
+
+    - ``fields``: valori di ``BULK_FIELDS`` da impostare;
+    - ``add_rewards`` / ``add_lore_rewards``: righe da aggiungere in coda (se non già presenti);
+    - ``scale``: ``{campo: fattore}`` per i params numerici delle task;
+    - ``set_params``: ``{campo: valore}`` da impostare nelle task che hanno già quel campo;
+    - ``task_type``: se indicato, le trasformazioni valgono solo per le task di quel tipo.
+    """
+
+    __slots__ = ("fields", "add_rewards", "add_lore_rewards", "scale", "set_params", "task_type")
+
+    def __init__(self, fields=None, add_rewards=(), add_lore_rewards=(), scale=None, set_params=None, task_type=None):
+        self.fields = dict(fields or {})
+        self.add_rewards = [str(line) for line in add_rewards]
+        self.add_lore_rewards = [str(line) for line in add_lore_rewards]
+        self.scale = {str(k): float(v) for k, v in (scale or {}).items()}
+        self.set_params = dict(set_params or {})
+        self.task_type = task_type or None
+
+        for name, value in self.fields.items():
+            expected = BULK_FIELDS.get(name)
+            if expected is None:
+                raise BulkError(f"campo non modificabile in blocco: {name!r} (validi: {', '.join(BULK_FIELDS)})")
+            if type(value) is not expected:
+                raise BulkError(f"{name}: atteso {expected.__name__}, trovato {type(value).__name__}")
+            if value == "" or (expected is int and value < 0):
+                raise BulkError(f"{name}: valore non valido {value!r}")
+        for name, factor in self.scale.items():
+            if not math.isfinite(factor) or factor < 0:
+                raise BulkError(f"{name}: fattore non valido {factor!r}")
+
+    @classmethod
+    def from_dict(cls, data) -> "BulkEdit":
+        if not isinstance(data, dict):
+            raise BulkError(f"modifica non valida: {data!r}")
+        unknown = sorted(set(data) - set(cls.__slots__))
+        if unknown:
+            raise BulkError(f"modifica: campi sconosciuti {unknown}")
+        try:
+            return cls(**data)
+        except (TypeError, ValueError) as e:
+            if isinstance(e, BulkError):
+                raise
+            raise BulkError(f"modifica non valida: {e}") from None
+
+    @property
+    def touches_tasks(self) -> bool:
+        return bool(self.scale or self.set_params)
+
+    def __bool__(self):
+        return bool(self.fields or self.add_rewards or self.add_lore_rewards or self.touches_tasks)
+
+
+def _with_lines(lines: list, extra: list) -> list | None:
+    missing = [line for line in extra if line not in lines]
+    return lines + missing if missing else None
+
+
+def apply_bulk(quests, edit: BulkEdit, placeholder_cfg=None) -> dict[int, dict]:
+    """Applica ``edit`` alle quest e ricalcola i campi derivati di quelle cambiate.
+
+    Restituisce, per ``id(quest)`` delle quest cambiate, ``{"fields": {...},
+    "tasks": {nome: params}}`` con i campi e i params nuovi (per il journal).
+    """
+    changes = {}
+    for q in quests:
+        fields = {}
+        for name, value in edit.fields.items():
+            if getattr(q, name) != value:
+                fields[name] = value
+        rewards = _with_lines(q.rewards, edit.add_rewards)
+        if rewards is not None:
+            fields["rewards"] = rewards
+        lore_rewards = _with_lines(q.lore_reward_lines, edit.add_lore_rewards)
+        if lore_rewards is not None:
+            fields["lore_reward_lines"] = lore_rewards
+        for name, value in fields.items():
+            setattr(q, name, value)
+
+        tasks = {}
+        if edit.touches_tasks:
+            for task in list(q.tasks.values()):
+                if edit.task_type is not None and task.type != edit.task_type:
+                    continue
+                params = None
+                for key, factor in edit.scale.items():
+                    if key in task.params:
+                        value = scale_value(task.params[key], factor)
+                        if value != task.params[key]:
+                            params = params or dict(task.params)
+                            params[key] = value
+                for key, value in edit.set_params.items():
+                    if key in task.params and task.params[key] != value:
+                        params = params or dict(task.params)
+                        params[key] = value
+                if params is not None:
+                    q.update_task(task.name, params=params)
+                    tasks[task.name] = params
+
+        if fields or tasks:
+            changes[id(q)] = {"fields": fields, "tasks": tasks}
+            refresh_derived(q, placeholder_cfg)
+    return changes
@@ -0,0 +1,138 @@
+"""Catalogo offline degli identificatori Minecraft (materiali, entità, incantesimi).
+
+I dati stanno in ``data/minecraft_ids.json`` (versionato: ``version`` del formato
+e ``minecraft`` della release da cui sono presi) e vengono letti solo alla prima
+richiesta. Ogni elenco è un array ordinato: l'autocompletamento è una ricerca
+binaria del prefisso (``bisect``), l'appartenenza un lookup in un ``frozenset``.
+
+I confronti ignorano maiuscole/minuscole, il prefisso ``minecraft:`` e un
+eventuale suffisso ``:dato`` (es. ``STONE:1``, ``SHARPNESS:5``).
+"""
+
+import json
+from bisect import bisect_left
+from pathlib import Path
+
+from .profiling import profiled
+from .schema import ValidationError
+
+CATALOG_FORMAT = "questcore-catalog"
+CATALOG_VERSION = 1
+CATALOG_PATH = Path(__file__).resolve().parent / "data" / "minecraft_ids.json"
+CATALOG_KINDS = ("materials", "entities", "enchantments")
+
+# campo dei params di una task -> elenco del catalogo con cui va controllato
+FIELD_KINDS = {
+    "block": "materials",
+    "blocks": "materials",
+    "item": "materials",
+    "items": "materials",
+    "ingredient": "materials",
+    "mob": "entities",
+    "mobs": "entities",
+    "enchantment": "enchantments",
+}
+
+
+class CatalogError(ValueError):
+    pass
+
+
+def normalize_id(value: str) -> str:
+    value = value.strip().upper()
+    if value.startswith("MINECRAFT:"):
+        value = value[10:]
+    return value.split(":", 1)[0]
+
+
+class Catalog:
+    __slots__ = ("minecraft", "_sorted", "_sets", "_hints")
+
+    def __init__(self, lists: dict, minecraft: str = ""):
+        self.minecraft = minecraft
+        self._sorted = {kind: tuple(sorted({normalize_id(v) for v in lists.get(kind) or ()})) for kind in CATALOG_KINDS}
+        self._sets = {kind: frozenset(values) for kind, values in self._sorted.items()}
+        self._hints: dict[tuple[str, str], str | None] = {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Catalog":
+        if not isinstance(data, dict) or data.get("format") != CATALOG_FORMAT:
+            raise CatalogError("non è un catalogo di identificatori")
+        version = data.get("version")
+        if not isinstance(version, int) or version > CATALOG_VERSION:
+            raise CatalogError(f"versione di catalogo non supportata: {version!r} (massima {CATALOG_VERSION})")
+        return cls(data, str(data.get("minecraft") or ""))
+
+    def values(self, kind: str) -> tuple[str, ...]:
+        return self._sorted[kind]
+
+    def __contains__(self, item) -> bool:
+        kind, value = item
+        return normalize_id(value) in self._sets[kind]
+
+    def complete(self, kind: str, prefix: str, limit: int = 50) -> list[str]:
+        """Identificatori di ``kind`` che iniziano con ``prefix`` (al massimo ``limit``)."""
+        values = self._sorted[kind]
+        prefix = normalize_id(prefix)
+        start = bisect_left(values, prefix)
+        out = []
+        for value in values[start:start + limit]:
+            if not value.startswith(prefix):
+                break
+            out.append(value)
+        return out
+
+    def suggest(self, kind: str, value: str) -> str | None:
+        """L'identificatore più simile a ``value`` (per i messaggi di errore), se ce n'è uno."""
+        key = (kind, normalize_id(value))
+        if key not in self._hints:
+            import difflib
+
+            matches = difflib.get_close_matches(key[1], self._sorted[kind], n=1, cutoff=0.75)
+            self._hints[key] = matches[0] if matches else None
+        return self._hints[key]
+
+
+_catalog: Catalog | None = None
+
+
+def load_catalog(path=None) -> Catalog:
+    """Il catalogo incluso (letto una volta sola) o quello del file ``path``."""
+    global _catalog
+    if path is None and _catalog is not None:
+        return _catalog
+    try:
+        data = json.loads(Path(path or CATALOG_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise CatalogError(f"catalogo illeggibile: {e}") from None
+    catalog = Catalog.from_dict(data)
+    if path is None:
+        _catalog = catalog
+    return catalog
+
+
+def _unknown(catalog: Catalog, kind: str, value: str, quest_id: str, task: str, field: str) -> ValidationError:
+    hint = catalog.suggest(kind, value)
+    message = f"{field}: identificatore sconosciuto {value!r}" + (f" (forse {hint}?)" if hint else "")
+    return ValidationError(quest_id, task, field, "unknown_id", message)
+
+
+@profiled("validate_ids")
+def validate_ids(quests, catalog: Catalog | None = None) -> list[ValidationError]:
+    """Controlla gli identificatori di ``display_type`` e dei campi in ``FIELD_KINDS`` di tutte le task."""
+    catalog = catalog or load_catalog()
+    sets = catalog._sets
+    errors = []
+    for quest in quests:
+        if quest.display_type and normalize_id(quest.display_type) not in sets["materials"]:
+            errors.append(_unknown(catalog, "materials", quest.display_type, quest.quest_id, "display", "type"))
+        for task in quest.tasks.values():
+            for field, value in task.params.items():
+                kind = FIELD_KINDS.get(field)
+                if kind is None or not value:
+                    continue
+                known = sets[kind]
+                for item in (value if type(value) is list else (value,)):
+                    if type(item) is str and item and normalize_id(item) not in known:
+                        errors.append(_unknown(catalog, kind, item, quest.quest_id, task.name, field))
+    return errors
@@ -0,0 +1,209 @@
+"""Campi derivati di una quest: lore, placeholders, display name e documento YAML."""
+
+from .model import Quest, Task, default_display_name
+from .profiling import profiled
+from .schema import TASK_TYPE_TITLES
+from .templates import DEFAULT_PLACEHOLDER_CFG, PlaceholderConfig
+from .yamlio import text_digest, yaml_dump
+
+
+def task_category_title(task_type: str) -> str:
+    return TASK_TYPE_TITLES.get(task_type, task_type)
+
+
+def task_title(tname: str, task: Task) -> str:
+    return (task.label or tname).strip() or tname
+
+
+def lore_normal_for(quest: Quest) -> list[str]:
+    grouped: dict[str, list[str]] = {}
+    for tname, task in quest.tasks.items():
+        grouped.setdefault(task_category_title(task.type), []).append(task_title(tname, task))
+
+    lore_normal: list[str] = []
+    for cat in sorted(grouped.keys()):
+        lore_normal.append(f"&6{cat}:")
+        for title in grouped[cat]:
+            lore_normal.append(f"&8- &7{title}")
+    lore_normal.append("")
+    lore_normal.append("&6Premi:")
+    for line in (quest.lore_reward_lines or []):
+        lore_normal.append(f"&8- &7{line}")
+    lore_normal.append("")
+    lore_normal.append("&c&l ✘ &7Non iniziata.")
+    return lore_normal
+
+
+def lore_started_for(quest: Quest) -> list[str]:
+    lore_started: list[str] = [""]
+    for tname, task in quest.tasks.items():
+        title = task_title(tname, task)
+        lore_started.append(f"&6{title}: &7{{{tname}:progress}}/{{{tname}:goal}}")
+    return lore_started
+
+
+@profiled("build_lore")
+def build_lore(quest: Quest):
+    """Rigenera lore-normal e lore-started, salvo quelle modificate a mano."""
+    if not quest.lore_normal_manual:
+        quest.lore_normal = lore_normal_for(quest)
+    if not quest.lore_started_manual:
+        quest.lore_started = lore_started_for(quest)
+
+
+# =========================
+# Ricalcolo incrementale
+# =========================
+# campo derivato -> input (revisioni di ``Quest.revisions``) da cui dipende
+DERIVED_INPUTS = {
+    "display_name": ("sort_order", "category_display", "display_auto"),
+    "lore_normal": ("task_names", "task_labels", "task_types", "lore_reward_lines", "lore_normal_manual"),
+    "lore_started": ("task_names", "task_labels", "lore_started_manual"),
+    "placeholders": ("task_names", "task_labels"),  # + configurazione dei formati
+    "placeholders_override": ("placeholders_override", "progress_placeholders_override"),
+}
+
+
+def _stamp(quest: Quest, name: str) -> tuple:
+    return tuple(quest.revision(i) for i in DERIVED_INPUTS[name])
+
+
+def _placeholders_base_cached(quest: Quest, cfg) -> tuple[tuple[dict, dict], bool]:
+    cfg = PlaceholderConfig.coerce(cfg)
+    stamp = _stamp(quest, "placeholders") + (cfg,)
+    cached = quest.derived_cache.get("placeholders")
+    if cached is not None and cached[0] == stamp:
+        return cached[1], False
+
+    placeholders = {}
+    progress = {}
+    for tname, task in quest.tasks.items():
+        key, val, pval = cfg.render(tname, task_title(tname, task))
+        placeholders[key] = val
+        progress[tname] = pval
+
+    quest.derived_cache["placeholders"] = (stamp, (placeholders, progress))
+    return (placeholders, progress), True
+
+
+@profiled("refresh_derived")
+def refresh_derived(quest: Quest, cfg=None) -> set[str]:
+    """Ricalcola solo i campi derivati i cui input sono cambiati dall'ultima chiamata.
+
+    Restituisce i nomi dei campi ricalcolati (chiavi di ``DERIVED_INPUTS``), così
+    la UI aggiorna solo le viste interessate. I placeholders vengono considerati
+    solo se viene passata la configurazione ``cfg``.
+    """
+    changed = set()
+    cache = quest.derived_cache
+
+    for name in ("display_name", "lore_normal", "lore_started", "placeholders_override"):
+        stamp = _stamp(quest, name)
+        if cache.get(name) == stamp:
+            continue
+        cache[name] = stamp
+        if name == "display_name":
+            if quest.display_auto:
+                quest.display_name = default_display_name(quest.category_display, quest.sort_order)
+                changed.add(name)
+        elif name == "lore_normal":
+            if not quest.lore_normal_manual:
+                quest.lore_normal = lore_normal_for(quest)
+                changed.add(name)
+        elif name == "lore_started":
+            if not quest.lore_started_manual:
+                quest.lore_started = lore_started_for(quest)
+                changed.add(name)
+        else:
+            changed.add(name)
+
+    if cfg is not None and _placeholders_base_cached(quest, cfg)[1]:
+        changed.add("placeholders")
+    return changed
+
+
+def generate_placeholders_base(quest: Quest, cfg) -> tuple[dict, dict]:
+    """Placeholders generati dai formati ``cfg`` (``PlaceholderConfig`` o dict come ``DEFAULT_PLACEHOLDER_CFG``).
+
+    Il risultato è in cache sulla quest finché non cambiano task, label o configurazione:
+    i dict restituiti non vanno modificati.
+    """
+    return _placeholders_base_cached(quest, cfg)[0]
+
+
+@profiled("generate_placeholders")
+def generate_placeholders(quest: Quest, cfg) -> tuple[dict, dict]:
+    """Placeholders effettivi: gli override della quest, se presenti, sostituiscono quelli generati."""
+    base_placeholders, base_progress = generate_placeholders_base(quest, cfg)
+    placeholders = dict(quest.placeholders_override) if quest.placeholders_override else base_placeholders
+    progress = dict(quest.progress_placeholders_override) if quest.progress_placeholders_override else base_progress
+    return placeholders, progress
+
+
+def placeholders_preview(placeholders: dict, progress_placeholders: dict) -> str:
+    """Testo dell'anteprima placeholders mostrata nella tab della quest."""
+    lines = ["placeholders:"]
+    for k, v in placeholders.items():
+        lines.append(f"  {k}: {v}")
+    lines.append("")
+    lines.append("progress-placeholders:")
+    for k, v in progress_placeholders.items():
+        lines.append(f"  {k}: {v}")
+    return "\n".join(lines)
+
+
+@profiled("quest_document")
+def quest_document(quest: Quest, placeholders: dict, progress_placeholders: dict) -> dict:
+    """Struttura del file .yml di una quest, pronta per ``yaml_dump``/``yaml_write``."""
+    tasks_out = {}
+    for tname, task in quest.tasks.items():
+        tdict = {"type": task.type}
+        tdict.update(task.params)
+        tasks_out[tname] = tdict
+
+    out = {
+        "tasks": tasks_out,
+        "display": {
+            "name": quest.display_name,
+            "lore-normal": quest.lore_normal,
+            "lore-started": quest.lore_started,
+            "type": quest.display_type,
+        },
+        "rewards": quest.rewards,
+        "placeholders": placeholders,
+        "progress-placeholders": progress_placeholders,
+        "options": {
+            "category": quest.category,
+            "repeatable": quest.repeatable,
+            "requires": quest.requires if quest.requires else None,
+            "cooldown": {
+                "enabled": quest.cooldown_enabled,
+                "time": quest.cooldown_time,
+            },
+            "sort-order": quest.sort_order,
+        },
+    }
+
+    if out["options"].get("requires") is None:
+        out["options"].pop("requires", None)
+
+    return out
+
+
+@profiled("cached_document")
+def cached_document(quest: Quest, cfg=None) -> tuple[dict, str, str]:
+    """(documento, YAML, digest) della quest, con i placeholders di ``cfg`` (``None``: nessuno).
+
+    Il risultato resta in cache sulla quest finché ``quest.generation`` non cambia
+    (o non cambia ``cfg``): salvare di nuovo una quest intatta non la riserializza.
+    I campi derivati vanno aggiornati prima (``refresh_derived``).
+    """
+    cached = quest.document_cache
+    if cached is not None and cached[0] == quest.generation and cached[1] is cfg:
+        return cached[2]
+    placeholders, progress = generate_placeholders(quest, cfg) if cfg is not None else ({}, {})
+    document = quest_document(quest, placeholders, progress)
+    text = yaml_dump(document)
+    entry = (document, text, text_digest(text))
+    quest.document_cache = (quest.generation, cfg, entry)
+    return entry
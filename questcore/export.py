@@ -0,0 +1,276 @@
+"""Export (scrittura parallela e atomica)."""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .profiling import profiled, span
+from .yamlio import text_digest, yaml_dump, yaml_write
+
+
+def _create_temp(directory: Path, prefix: str) -> tuple[int, Path]:
+    """Crea un file temporaneo nuovo in ``directory``; restituisce (descrittore, percorso).
+
+    A differenza di ``mkstemp`` (0600) il file nasce con ``0666``: il kernel
+    applica l'umask come per un normale ``open()`` e il rename finale conserva
+    quei permessi.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_BINARY", 0)
+    for _attempt in range(100):
+        tmp = directory / f"{prefix}{os.urandom(6).hex()}.tmp"
+        try:
+            return os.open(tmp, flags, 0o666), tmp
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"impossibile creare un file temporaneo in {directory}")
+
+
+@dataclass
+class ExportResult:
+    path: Path
+    seconds: float = 0.0
+    error: str | None = None
+    rolled_back: bool = False  # serializzato ma non scritto perché altri file sono falliti
+    skipped: bool = False  # contenuto invariato rispetto al file su disco
+    digest: str | None = None
+
+
+@dataclass
+class ExportReport:
+    results: list = field(default_factory=list)
+    seconds: float = 0.0
+    partial: bool = False  # una sostituzione è fallita dopo che altri file erano già stati sostituiti
+
+    @property
+    def failures(self) -> list[ExportResult]:
+        return [r for r in self.results if r.error]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    @property
+    def written(self) -> int:
+        return sum(1 for r in self.results if not r.error and not r.skipped)
+
+    @property
+    def skipped(self) -> int:
+        return sum(1 for r in self.results if r.skipped)
+
+    def summary(self, slowest: int = 5) -> str:
+        lines = [
+            f"{len(self.results)} file in {self.seconds:.2f}s: "
+            f"{self.written} scritti, {self.skipped} invariati (saltati), {len(self.failures)} errori."
+        ]
+        failures = [r for r in self.failures if not r.rolled_back]
+        if failures:
+            lines.append("")
+            lines.append("Errori:")
+            for r in failures:
+                lines.append(f"- {r.path}: {r.error}")
+        rolled_back = sum(1 for r in self.results if r.rolled_back)
+        if self.partial:
+            lines.append(
+                f"Export parziale: {self.written} file già sostituiti con la nuova versione, "
+                f"{rolled_back} non scritti dopo l'errore."
+            )
+        elif rolled_back:
+            lines.append(f"{rolled_back} file non scritti per evitare un export parziale.")
+        timed = sorted((r for r in self.results if not r.error and not r.skipped), key=lambda r: r.seconds, reverse=True)
+        if timed and slowest > 0:
+            lines.append("")
+            lines.append("File più lenti:")
+            for r in timed[:slowest]:
+                lines.append(f"- {r.path.name}: {r.seconds * 1000:.1f} ms")
+        return "\n".join(lines)
+
+
+class ExportCache:
+    """Digest dei file già scritti, per non riscrivere quest il cui contenuto non è cambiato.
+
+    I digest sono tenuti in memoria e, se ``manifest`` è attivo, anche in un file
+    ``.manifest.json`` in ogni cartella ``quests/<categoria>/``. Un file viene
+    considerato invariato solo se digest, dimensione e mtime coincidono con
+    quelli registrati, così le modifiche fatte a mano sul disco vengono rilevate.
+    """
+
+    MANIFEST_NAME = ".manifest.json"
+    MANIFEST_VERSION = 1
+
+    def __init__(self, manifest: bool = True):
+        self.manifest = manifest
+        self._entries: dict[Path, dict] = {}
+        self._loaded_dirs: set[Path] = set()
+        self._dirty_dirs: set[Path] = set()
+        self._lock = threading.Lock()
+
+    def _load_dir(self, directory: Path):
+        if not self.manifest or directory in self._loaded_dirs:
+            return
+        self._loaded_dirs.add(directory)
+        try:
+            raw = json.loads((directory / self.MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(raw, dict) or raw.get("version") != self.MANIFEST_VERSION:
+            return
+        for name, entry in (raw.get("files") or {}).items():
+            self._entries.setdefault(directory / name, entry)
+
+    def is_current(self, path: Path, digest: str) -> bool:
+        with self._lock:
+            self._load_dir(path.parent)
+            entry = self._entries.get(path)
+        if not entry or entry.get("digest") != digest:
+            return False
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        return st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns")
+
+    def record(self, path: Path, digest: str):
+        try:
+            st = path.stat()
+        except OSError:
+            return
+        with self._lock:
+            self._load_dir(path.parent)
+            self._entries[path] = {"digest": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            self._dirty_dirs.add(path.parent)
+
+    def save_manifests(self):
+        """Riscrive i manifest delle sole cartelle con file scritti dall'ultimo salvataggio."""
+        with self._lock:
+            directories, self._dirty_dirs = self._dirty_dirs, set()
+        if not self.manifest:
+            return
+        for directory in directories:
+            with self._lock:
+                files = {p.name: e for p, e in self._entries.items() if p.parent == directory}
+            if not files:
+                continue
+            payload = json.dumps({"version": self.MANIFEST_VERSION, "files": files}, indent=1, sort_keys=True)
+            tmp = None
+            try:
+                fd, tmp = _create_temp(directory, f"{self.MANIFEST_NAME}.")
+                with os.fdopen(fd, "w", encoding="utf-8") as fp:
+                    fp.write(payload)
+                os.replace(tmp, directory / self.MANIFEST_NAME)
+            except OSError:
+                if tmp is not None:
+                    tmp.unlink(missing_ok=True)
+
+
+def _write_temp_yaml(path: Path, data, text: str | None = None) -> Path:
+    """Serializza ``data`` (o scrive ``text``, se già serializzato) in un file temporaneo accanto a ``path``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = _create_temp(path.parent, f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fp:
+            if text is None:
+                yaml_write(data, fp)
+            else:
+                fp.write(text + "\n")
+            fp.flush()
+            os.fsync(fp.fileno())
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return tmp
+
+
+@profiled("export_documents")
+def export_documents(
+    documents: list[tuple],
+    max_workers: int | None = None,
+    cache: ExportCache | None = None,
+) -> ExportReport:
+    """Scrive i documenti YAML in parallelo, in modo atomico (file temporaneo + rename).
+
+    Prima vengono scritti tutti i file temporanei; i file di destinazione vengono
+    sostituiti solo se nessuna serializzazione è fallita, così un errore di
+    serializzazione non lascia un mix di file nuovi e vecchi. Se invece fallisce una
+    sostituzione (``os.replace``), i file già sostituiti restano nuovi e i restanti
+    non vengono toccati (``rolled_back``): l'export è parziale (``report.partial``).
+    Gli errori vengono raccolti nel report invece di interrompere l'export. Con
+    ``cache`` i file il cui contenuto non è cambiato vengono saltati (mtime invariato).
+
+    Ogni documento è ``(path, data)`` oppure ``(path, data, yaml, digest)`` se è
+    già stato serializzato (vedi ``derive.cached_document``).
+    """
+    report = ExportReport()
+    started = time.perf_counter()
+
+    def stage(item):
+        path, data, *serialized = item
+        text, digest = serialized or (None, None)
+        t0 = time.perf_counter()
+        with span("export.stage", path=path):
+            try:
+                if cache is not None:
+                    if digest is None:
+                        # serializzato una volta sola: lo stesso testo serve per il digest e per il file
+                        text = yaml_dump(data)
+                        digest = text_digest(text)
+                    if cache.is_current(path, digest):
+                        return ExportResult(path, time.perf_counter() - t0, skipped=True, digest=digest), None
+                tmp = _write_temp_yaml(path, data, text)
+            except Exception as e:
+                return ExportResult(path, time.perf_counter() - t0, str(e)), None
+        return ExportResult(path, time.perf_counter() - t0, digest=digest), tmp
+
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    max_workers = max(1, min(max_workers, len(documents)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        staged = list(pool.map(stage, documents))
+
+    if any(result.error for result, _tmp in staged):
+        for result, tmp in staged:
+            if tmp is not None:
+                tmp.unlink(missing_ok=True)
+                result.error = "non scritto (altri file non sono stati serializzati)"
+                result.rolled_back = True
+    else:
+        failed = False
+        replaced = 0
+        for result, tmp in staged:
+            if tmp is None:
+                continue
+            if failed:
+                # dopo un errore non si sostituisce altro: niente export a metà oltre il necessario
+                tmp.unlink(missing_ok=True)
+                result.error = "non scritto (la sostituzione di un altro file è fallita)"
+                result.rolled_back = True
+                continue
+            t0 = time.perf_counter()
+            try:
+                with span("export.replace", path=result.path):
+                    os.replace(tmp, result.path)
+            except OSError as e:
+                tmp.unlink(missing_ok=True)
+                result.error = str(e)
+                failed = True
+                report.partial = replaced > 0
+            else:
+                replaced += 1
+                if cache is not None:
+                    cache.record(result.path, result.digest)
+            result.seconds += time.perf_counter() - t0
+
+        if cache is not None:
+            cache.save_manifests()
+
+    report.results = [result for result, _tmp in staged]
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def quest_path(quest, root: Path = Path("quests")) -> Path:
+    return Path(root) / quest.category / f"{quest.quest_id}.yml"
@@ -0,0 +1,269 @@
+"""Grafo delle dipendenze (``options.requires``) tra quest.
+
+L'indice unisce le quest della sessione e quelle già presenti sotto ``quests/``
+(quelle della sessione prevalgono, perché verranno riscritte) e in tempo lineare
+sul numero di quest e di archi trova:
+
+- ``requires`` verso quest inesistenti;
+- cicli (componenti fortemente connesse, algoritmo di Tarjan iterativo);
+- quest mai sbloccabili perché dipendono, anche indirettamente, da una quest
+  mancante o da un ciclo.
+"""
+
+import os
+from dataclasses import dataclass, field
+
+from .profiling import profiled
+from .yamlload import _scalar
+
+
+@dataclass
+class GraphReport:
+    missing: list = field(default_factory=list)  # (quest_id, requires mancante)
+    cycles: list = field(default_factory=list)  # liste di quest_id
+    blocked: list = field(default_factory=list)  # quest_id mai sbloccabili per colpa di altre quest
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.cycles or self.blocked)
+
+    def summary(self, limit: int = 20) -> str:
+        lines = []
+        if self.missing:
+            lines.append(f"Quest richieste inesistenti ({len(self.missing)}):")
+            lines.extend(f"- {qid} richiede '{target}'" for qid, target in self.missing[:limit])
+        if self.cycles:
+            lines.append(f"Dipendenze circolari ({len(self.cycles)}):")
+            for cycle in self.cycles[:limit]:
+                path = " -> ".join(cycle[:10] + cycle[:1]) if len(cycle) <= 10 else " -> ".join(cycle[:10]) + " -> ..."
+                lines.append(f"- {path} ({len(cycle)} quest)")
+        if self.blocked:
+            shown = ", ".join(self.blocked[:limit])
+            more = f" e altre {len(self.blocked) - limit}" if len(self.blocked) > limit else ""
+            lines.append(f"Quest mai sbloccabili perché dipendono dalle precedenti ({len(self.blocked)}): {shown}{more}")
+        return "\n".join(lines) if lines else "Nessun problema nelle dipendenze."
+
+
+class QuestGraph:
+    def __init__(self):
+        self.requires: dict[str, list[str]] = {}
+        self.in_session: set[str] = set()
+
+    def add(self, quest_id: str, requires, in_session: bool = True):
+        if not in_session and quest_id in self.in_session:
+            return
+        self.requires[quest_id] = list(requires or [])
+        if in_session:
+            self.in_session.add(quest_id)
+
+    @classmethod
+    def build(cls, quests, existing: dict[str, list[str]] | None = None) -> "QuestGraph":
+        graph = cls()
+        for q in quests:
+            graph.add(q.quest_id, q.requires)
+        for quest_id, requires in (existing or {}).items():
+            graph.add(quest_id, requires, in_session=False)
+        return graph
+
+    def __contains__(self, quest_id: str) -> bool:
+        return quest_id in self.requires
+
+    def missing(self) -> list[tuple[str, str]]:
+        return [
+            (qid, target)
+            for qid, requires in self.requires.items()
+            for target in requires
+            if target not in self.requires
+        ]
+
+    def cycles(self) -> list[list[str]]:
+        """Componenti fortemente connesse con più di un nodo (o con un self-loop)."""
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+        result = []
+        counter = 0
+
+        for start in self.requires:
+            if start in index:
+                continue
+            work = [(start, iter(self.requires[start]))]
+            index[start] = low[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+
+            while work:
+                node, targets = work[-1]
+                advanced = False
+                for target in targets:
+                    if target not in self.requires:
+                        continue
+                    if target not in index:
+                        index[target] = low[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(self.requires[target])))
+                        advanced = True
+                        break
+                    if target in on_stack:
+                        low[node] = min(low[node], index[target])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self.requires[node]:
+                        component.reverse()
+                        result.append(component)
+        return result
+
+    def unlockable(self) -> set[str]:
+        """Quest raggiungibili dalle radici (senza requires) seguendo requires soddisfatti (Kahn)."""
+        pending = {qid: len(set(requires)) for qid, requires in self.requires.items()}
+        dependents: dict[str, list[str]] = {}
+        for qid, requires in self.requires.items():
+            for target in set(requires):
+                dependents.setdefault(target, []).append(qid)
+
+        ready = [qid for qid, n in pending.items() if n == 0]
+        done = set()
+        while ready:
+            qid = ready.pop()
+            done.add(qid)
+            for dependent in dependents.get(qid, ()):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+        return done
+
+    @profiled("QuestGraph.check")
+    def check(self, session_only: bool = True) -> GraphReport:
+        """Analizza il grafo; con ``session_only`` riporta solo problemi che toccano quest della sessione."""
+        def relevant(qid):
+            return not session_only or qid in self.in_session
+
+        missing = self.missing()
+        cycles = self.cycles()
+        unlockable = self.unlockable()
+        # già riportate come causa: non le ripetiamo tra le bloccate
+        causes = {qid for qid, _target in missing} | {qid for cycle in cycles for qid in cycle}
+        return GraphReport(
+            missing=[(qid, target) for qid, target in missing if relevant(qid)],
+            cycles=[cycle for cycle in cycles if any(relevant(qid) for qid in cycle)],
+            blocked=sorted(
+                qid for qid in self.requires
+                if qid not in unlockable and qid not in causes and relevant(qid)
+            ),
+        )
+
+
+def read_requires(lines) -> list[str]:
+    """``options.requires`` di un file quest, leggendo solo le righe che servono.
+
+    Riconosce le forme scritte da ``yaml_dump`` (``requires:`` seguito da righe
+    ``- id``, ``requires: []``) più un singolo id sulla stessa riga.
+    """
+    lines = iter(lines)  # le voci di requires si leggono dallo stesso iteratore
+    in_options = False
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        if not line[0].isspace():
+            if in_options:
+                break
+            in_options = line.rstrip() == "options:"
+            continue
+        if not in_options:
+            continue
+        body = line.lstrip()
+        if not body.startswith("requires:"):
+            continue
+        indent = len(line) - len(body)
+        rest = body[len("requires:"):].strip()
+        if rest:
+            value = _scalar(rest)
+            return [] if rest == "[]" or value is None else [str(value)]
+        out = []
+        for item in lines:
+            item = item.rstrip("\r\n")
+            body = item.lstrip()
+            if not body:
+                continue
+            if len(item) - len(body) < indent or not (body == "-" or body.startswith("- ")):
+                break
+            value = _scalar(body[2:].strip())
+            if value is not None:
+                out.append(str(value))
+        return out
+    return []
+
+
+class RequiresScan:
+    """``requires`` delle quest già su disco, con una cache per file (path, mtime, dimensione).
+
+    A ogni ``scan`` vengono riletti solo i file nuovi o cambiati; ``version``
+    cresce quando il risultato cambia, così chi lo usa sa se rifare i controlli.
+    """
+
+    def __init__(self):
+        self._files: dict[str, tuple] = {}  # path -> (mtime_ns, size, quest_id, requires)
+        self.version = 0
+
+    @profiled("RequiresScan.scan")
+    def scan(self, root="quests") -> dict[str, list[str]]:
+        seen = {}
+        changed = False
+        stack = [os.fspath(root)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            stack.append(entry.path)
+                            continue
+                        if not entry.name.endswith(".yml") or not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    cached = self._files.get(entry.path)
+                    if cached is None or cached[0] != st.st_mtime_ns or cached[1] != st.st_size:
+                        try:
+                            with open(entry.path, "r", encoding="utf-8") as fp:
+                                requires = read_requires(fp)
+                        except (OSError, UnicodeDecodeError):
+                            continue
+                        if cached is None or cached[3] != requires:
+                            changed = True
+                        cached = (st.st_mtime_ns, st.st_size, entry.name[:-4], requires)
+                    seen[entry.path] = cached
+        if changed or len(seen) != len(self._files):
+            self.version += 1
+        self._files = seen
+        return {quest_id: requires for _mtime, _size, quest_id, requires in seen.values()}
+
+
+def existing_requires(root="quests", scan: RequiresScan | None = None) -> dict[str, list[str]]:
+    """``quest_id -> requires`` per ogni file .yml sotto ``root``; i file illeggibili vengono ignorati.
+
+    Con ``scan`` i file non cambiati dall'ultima volta non vengono riletti.
+    """
+    return (scan or RequiresScan()).scan(root)
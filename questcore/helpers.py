@@ -0,0 +1,28 @@
+"""Helper generici senza dipendenze dalla UI."""
+
+
+def int_to_roman(n: int) -> str:
+    """Converte un intero positivo in numeri romani (formato latino)."""
+    if n <= 0:
+        return str(n)
+    pairs = [
+        (1000, "M"),
+        (900, "CM"),
+        (500, "D"),
+        (400, "CD"),
+        (100, "C"),
+        (90, "XC"),
+        (50, "L"),
+        (40, "XL"),
+        (10, "X"),
+        (9, "IX"),
+        (5, "V"),
+        (4, "IV"),
+        (1, "I"),
+    ]
+    out = []
+    for value, sym in pairs:
+        while n >= value:
+            out.append(sym)
+            n -= value
+    return "".join(out)
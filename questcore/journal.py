@@ -0,0 +1,205 @@
+"""Journal append-only delle modifiche al modello, per il recupero dopo un crash.
+
+Accanto allo snapshot della sessione (``session.py``) l'editor scrive una riga
+JSON per ogni modifica: aggiungere una riga costa un ``json.dumps`` di pochi
+campi e una ``write`` sul file già aperto, quindi si può fare a ogni commit
+della UI. Al riavvio ``recover`` carica lo snapshot e riapplica il journal; lo
+snapshot successivo (``Journal.start``) lo azzera.
+
+Formato (versione 2), una riga per record::
+
+    {"format": "questcore-journal", "version": 2, "base": <saved_at dello snapshot>}
+    {"op": "add_task", "c": "mining", "q": "mining_1", "name": "pietra", "type": "blockbreak", "label": "Pietra", "params": {...}}
+    {"op": "update_task", "c": "mining", "q": "mining_1", "name": "pietra", "label": "...", "params": {...}}
+    {"op": "remove_task", "c": "mining", "q": "mining_1", "name": "pietra"}
+    {"op": "set", "c": "mining", "q": "mining_1", "fields": {"lore_normal": [...], "lore_normal_manual": true}}
+
+Ogni record indica la quest con categoria (``c``) e ``quest_id`` (``q``): quest
+importate da categorie diverse possono avere lo stesso ``quest_id``. I journal
+della versione 1 non hanno ``c`` e vengono riapplicati per solo ``quest_id``.
+
+Un journal vale solo per lo snapshot con lo stesso ``base``; un'ultima riga
+troncata (crash a metà scrittura) viene ignorata. Le righe non vengono
+sincronizzate su disco una per una: sopravvivono alla chiusura anomala del
+programma, non necessariamente a quella del sistema.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from .derive import refresh_derived
+from .model import Task
+from .profiling import profiled
+from .session import DEFAULT_SESSION_PATH, QUEST_FIELDS, Session, load_session, save_session
+
+JOURNAL_FORMAT = "questcore-journal"
+JOURNAL_VERSION = 2
+DEFAULT_JOURNAL_PATH = Path(".quests-session.journal")
+# oltre questa dimensione il journal viene compattato in un nuovo snapshot
+COMPACT_BYTES = 1 << 20
+
+_SETTABLE = frozenset(QUEST_FIELDS) - {"quest_id"}
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+class JournalError(ValueError):
+    pass
+
+
+class Journal:
+    """Journal aperto in scrittura; ``append`` è chiamabile solo dopo ``start``."""
+
+    __slots__ = ("path", "base", "records", "_fp")
+
+    def __init__(self, path=DEFAULT_JOURNAL_PATH):
+        self.path = Path(path)
+        self.base: float | None = None
+        self.records = 0
+        self._fp = None
+
+    @property
+    def active(self) -> bool:
+        return self._fp is not None
+
+    def start(self, base: float, *, truncate: bool = True):
+        """Apre il journal dello snapshot ``base``: da zero o, con ``truncate=False``, in coda a quello esistente."""
+        self.close()
+        if self.path.parent != Path(""):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fp = open(self.path, "w" if truncate else "a", encoding="utf-8")
+        self.base = base
+        if truncate:
+            self.records = 0
+            self._fp.write(_dumps({"format": JOURNAL_FORMAT, "version": JOURNAL_VERSION, "base": base}) + "\n")
+            self._fp.flush()
+
+    def append(self, op: str, quest, **data):
+        """Aggiunge un record ``op`` per ``quest`` (il modello, non il suo id)."""
+        record = {"op": op, "c": quest.category, "q": quest.quest_id}
+        record.update(data)
+        self._fp.write(_dumps(record) + "\n")
+        self._fp.flush()
+        self.records += 1
+
+    def size(self) -> int:
+        return self._fp.tell() if self._fp is not None else 0
+
+    def close(self):
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def discard(self):
+        """Chiude ed elimina il journal (es. dopo uno snapshot finale)."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+def read_journal(path) -> tuple[float, list[dict]]:
+    """(``base``, record) di un journal; ``JournalError`` se l'intestazione non è valida."""
+    with open(path, encoding="utf-8") as fp:
+        lines = fp.read().split("\n")
+    try:
+        header = json.loads(lines[0])
+    except ValueError:
+        raise JournalError("intestazione del journal illeggibile") from None
+    if not isinstance(header, dict) or header.get("format") != JOURNAL_FORMAT:
+        raise JournalError("non è un journal di sessione")
+    version = header.get("version")
+    if not isinstance(version, int) or version > JOURNAL_VERSION:
+        raise JournalError(f"versione di journal non supportata: {version!r} (massima {JOURNAL_VERSION})")
+
+    records = []
+    last = len(lines) - 1
+    for lineno, line in enumerate(lines[1:], start=1):
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            if lineno == last:
+                break  # riga troncata da un crash durante la scrittura
+            raise JournalError(f"riga {lineno + 1} del journal illeggibile") from None
+    return header.get("base"), records
+
+
+@profiled("replay_journal")
+def replay_journal(quests, records) -> int:
+    """Riapplica i record alle quest (per categoria e ``quest_id``); restituisce quanti ne sono stati applicati.
+
+    I record che si riferiscono a quest o task inesistenti vengono saltati.
+    """
+    by_key = {(q.category, q.quest_id): q for q in quests}
+    by_id = {}  # record senza categoria (versione 1): la prima quest con quell'id, come allora
+    for q in quests:
+        by_id.setdefault(q.quest_id, q)
+    touched = {}
+    applied = 0
+    for record in records:
+        if "c" in record:
+            q = by_key.get((record["c"], record.get("q")))
+        else:
+            q = by_id.get(record.get("q"))
+        if q is None:
+            continue
+        op = record.get("op")
+        name = record.get("name")
+        if op == "add_task":
+            q.add_task(Task(name=name, type=record["type"], params=dict(record.get("params") or {}), label=record.get("label", "")))
+        elif op == "update_task":
+            if name not in q.tasks:
+                continue
+            q.update_task(name, params=record.get("params"), label=record.get("label"), type=record.get("type"))
+        elif op == "remove_task":
+            if q.remove_task(name) is None:
+                continue
+        elif op == "set":
+            category = q.category
+            for key, value in (record.get("fields") or {}).items():
+                if key in _SETTABLE:
+                    setattr(q, key, value)
+            if q.category != category:
+                # i record successivi indicano la quest con la nuova categoria
+                by_key.pop((category, q.quest_id), None)
+                by_key[(q.category, q.quest_id)] = q
+        else:
+            continue
+        touched[id(q)] = q
+        applied += 1
+
+    for q in touched.values():
+        refresh_derived(q)
+    return applied
+
+
+def recover(session_path=DEFAULT_SESSION_PATH, journal_path=DEFAULT_JOURNAL_PATH) -> tuple[Session, int | None]:
+    """Carica lo snapshot e gli riapplica il journal, se appartiene a quello snapshot.
+
+    Restituisce la sessione e il numero di record riapplicati, oppure ``None``
+    se il journal manca, è illeggibile o è di un altro snapshot (e va ignorato).
+    """
+    session = load_session(session_path)
+    try:
+        base, records = read_journal(journal_path)
+    except (OSError, JournalError):
+        return session, None
+    if base != session.saved_at:
+        return session, None
+    return session, replay_journal(session.quests, records)
+
+
+def checkpoint(journal: Journal, session_path, quests, placeholder_cfg, setup: dict | None = None):
+    """Scrive un nuovo snapshot e riparte con un journal vuoto legato a esso."""
+    saved_at = time.time()
+    save_session(session_path, quests, placeholder_cfg, setup, saved_at=saved_at)
+    journal.start(saved_at)
+
+
+def needs_compaction(journal_path=DEFAULT_JOURNAL_PATH, limit: int = COMPACT_BYTES) -> bool:
+    try:
+        return os.path.getsize(journal_path) > limit
+    except OSError:
+        return False
+
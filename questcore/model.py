@@ -0,0 +1,204 @@
+"""Data model.
+
+``Task`` e ``Quest`` usano ``__slots__``; gli identificatori che si ripetono tra
+migliaia di task (tipi, blocchi, mob, mondi...) vengono internati. Ogni quest ha
+le proprie liste e i propri dict: dopo una modifica in-place va chiamato
+``Quest.touch`` per far ricalcolare i campi derivati.
+"""
+
+import sys
+from dataclasses import dataclass, field
+
+from .helpers import int_to_roman
+
+_intern = sys.intern
+
+
+def intern_params(params: dict) -> dict:
+    """Interna in-place chiavi e valori stringa (anche dentro le liste) dei params di una task."""
+    rekey = False
+    for key, value in params.items():
+        kind = type(value)
+        if kind is str:
+            params[key] = _intern(value)
+        elif kind is list:
+            params[key] = [_intern(v) if type(v) is str else v for v in value]
+        if not rekey and type(key) is str and key is not _intern(key):
+            rekey = True
+    if rekey:
+        # ricostruito per non cambiare l'ordine delle chiavi
+        items = list(params.items())
+        params.clear()
+        params.update((_intern(k) if type(k) is str else k, v) for k, v in items)
+    return params
+
+
+@dataclass(slots=True)
+class Task:
+    """Una task di una quest; si modifica con ``Quest.update_task``, che tiene aggiornate revisioni e generazione."""
+
+    name: str
+    type: str
+    params: dict = field(default_factory=dict)
+    label: str = ""
+
+    def __post_init__(self):
+        self.name = _intern(self.name)
+        self.type = _intern(self.type)
+        self.label = _intern(self.label) if type(self.label) is str else self.label
+        intern_params(self.params)
+
+
+# campo del modello -> input dei campi derivati che invalida quando viene riassegnato
+_TRACKED_FIELDS = {
+    "tasks": ("task_names", "task_labels", "task_types", "task_params"),
+    "sort_order": ("sort_order",),
+    "category_display": ("category_display",),
+    "display_auto": ("display_auto",),
+    "lore_reward_lines": ("lore_reward_lines",),
+    "requires": ("requires",),  # non è input di campi derivati: serve al controllo delle dipendenze
+    "lore_normal_manual": ("lore_normal_manual",),
+    "lore_started_manual": ("lore_started_manual",),
+    "placeholders_override": ("placeholders_override",),
+    "progress_placeholders_override": ("progress_placeholders_override",),
+}
+
+# stringhe ripetute in ogni quest della categoria
+_INTERNED_FIELDS = frozenset(("category", "category_display", "display_type"))
+# stato interno della quest: riassegnarlo non la rende "sporca" (vedi ``Quest.generation``)
+_UNVERSIONED_FIELDS = frozenset(("revisions", "derived_cache", "generation", "document_cache"))
+_SCALARS = (str, int, bool, float)
+
+
+@dataclass(slots=True)
+class Quest:
+    quest_id: str
+    sort_order: int
+    category: str
+    category_display: str
+
+    tasks: dict = field(default_factory=dict)
+
+    display_name: str = ""
+    display_type: str = "STONE"
+
+    lore_normal: list = field(default_factory=list)
+    lore_started: list = field(default_factory=list)
+
+    rewards: list = field(default_factory=list)
+
+    repeatable: bool = False
+    cooldown_enabled: bool = True
+    cooldown_time: int = 1440
+    requires: list = field(default_factory=list)
+
+    placeholders_override: dict = field(default_factory=dict)
+    progress_placeholders_override: dict = field(default_factory=dict)
+
+    lore_reward_lines: list = field(default_factory=list)
+
+    lore_normal_manual: bool = False
+    lore_started_manual: bool = False
+
+    display_auto: bool = True
+
+    # revisione di ogni input dei campi derivati e cache dei valori derivati (vedi derive.refresh_derived)
+    revisions: dict = field(default_factory=dict, repr=False, compare=False)
+    derived_cache: dict = field(default_factory=dict, repr=False, compare=False)
+    # cresce a ogni modifica del modello; il documento serializzato resta valido finché non cambia
+    # (vedi derive.cached_document)
+    generation: int = field(default=0, repr=False, compare=False)
+    document_cache: tuple | None = field(default=None, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        if name in _UNVERSIONED_FIELDS:
+            object.__setattr__(self, name, value)
+            return
+        if name in _INTERNED_FIELDS and type(value) is str:
+            value = _intern(value)
+        inputs = _TRACKED_FIELDS.get(name)
+        if type(value) in _SCALARS:
+            # riassegnare lo stesso scalare (es. apply_ui_to_model) non cambia nulla;
+            # liste e dict invece possono essere stati modificati in-place
+            old = getattr(self, name, None)
+            if type(old) is type(value) and old == value:
+                return
+        object.__setattr__(self, name, value)
+        if inputs is not None:
+            self.touch(*inputs)
+        else:
+            self.generation = getattr(self, "generation", 0) + 1
+
+    def touch(self, *inputs: str):
+        """Segna come cambiati gli input indicati (es. dopo una modifica in-place di una lista)."""
+        revisions = getattr(self, "revisions", None)
+        if revisions is None:
+            # durante __init__, prima che ``revisions`` esista
+            return
+        for name in inputs:
+            revisions[name] = revisions.get(name, 0) + 1
+        self.generation += 1
+
+    def revision(self, name: str) -> int:
+        return self.revisions.get(name, 0)
+
+    def add_task(self, task: Task):
+        self.tasks[task.name] = task
+        self.touch("task_names", "task_labels", "task_types", "task_params")
+
+    def update_task(self, name: str, *, params: dict | None = None, label: str | None = None, type: str | None = None) -> Task:
+        task = self.tasks[name]
+        if params is not None and params != task.params:
+            task.params = intern_params(params)
+            self.touch("task_params")
+        if label is not None and label != task.label:
+            task.label = label
+            self.touch("task_labels")
+        if type is not None and type != task.type:
+            task.type = type
+            self.touch("task_types", "task_params")
+        return task
+
+    def remove_task(self, name: str) -> Task | None:
+        task = self.tasks.pop(name, None)
+        if task is not None:
+            self.touch("task_names", "task_labels", "task_types", "task_params")
+        return task
+
+
+def default_display_name(category_display: str, sort_order: int) -> str:
+    return f"&e{category_display} {int_to_roman(int(sort_order))}"
+
+
+def create_quests(category: str, category_display: str, count: int, last_sort: int) -> list[Quest]:
+    """Crea ``count`` quest vuote in sequenza dopo ``last_sort``, ognuna dipendente dalla precedente."""
+    quests = []
+    base = 0 if last_sort <= 0 else last_sort
+
+    for i in range(1, count + 1):
+        sort_order = base + i if base > 0 else i
+        quest_id = f"{category}{sort_order}"
+
+        q = Quest(
+            quest_id=quest_id,
+            sort_order=sort_order,
+            category=category,
+            category_display=category_display,
+            display_name=default_display_name(category_display, sort_order),
+            display_type="STONE",
+            lore_started=[""],
+            repeatable=False,
+            cooldown_enabled=True,
+            cooldown_time=1440,
+            lore_normal_manual=False,
+            lore_started_manual=False,
+            display_auto=True,
+        )
+
+        if sort_order > 1 and (last_sort > 0 or i > 1):
+            prev_id = f"{category}{sort_order - 1}"
+            q.requires = [prev_id]
+
+        quests.append(q)
+
+    return quests
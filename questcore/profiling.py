@@ -0,0 +1,189 @@
+"""Strumentazione opzionale: span temporizzati, report aggregato e trace per Chrome.
+
+Si attiva con la variabile d'ambiente ``QUESTS_PROFILE=1`` (report su stderr
+all'uscita; con ``QUESTS_PROFILE_TRACE=file.json`` anche il trace) oppure con
+``--profile`` / ``--profile-trace`` di ``Main.py`` e ``python -m questcore``.
+
+Da spenta costa un controllo di un flag per chiamata: ``profiled`` non avvolge
+nulla di pesante e ``span`` restituisce sempre lo stesso context manager vuoto.
+Il trace si apre in ``chrome://tracing`` o https://ui.perfetto.dev.
+"""
+
+import atexit
+import math
+import os
+import sys
+import time
+from _thread import get_ident
+
+_clock = time.perf_counter_ns
+
+
+class _State:
+    __slots__ = ("enabled", "trace_path", "durations", "events", "origin", "at_exit")
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_path = None
+        self.at_exit = False
+        self.durations: dict[str, list[int]] = {}
+        self.events: list[tuple] = []  # (nome, inizio_ns, durata_ns, thread, args)
+        self.origin = _clock()
+
+
+_state = _State()
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: dict | None):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = _clock()
+        return self
+
+    def __exit__(self, *exc):
+        duration = _clock() - self.start
+        _state.durations.setdefault(self.name, []).append(duration)
+        _state.events.append((self.name, self.start, duration, get_ident(), self.args))
+        return False
+
+
+def enabled() -> bool:
+    return _state.enabled
+
+
+def span(name: str, **args):
+    """Context manager che misura il blocco come ``name``; ``args`` finiscono solo nel trace."""
+    if not _state.enabled:
+        return _NULL_SPAN
+    return _Span(name, args or None)
+
+
+def profiled(name: str | None = None):
+    """Decoratore: misura ogni chiamata della funzione come span ``name`` (default: ``__qualname__``)."""
+    def decorate(func):
+        label = name or func.__qualname__
+
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            start = _clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = _clock() - start
+                _state.durations.setdefault(label, []).append(duration)
+                _state.events.append((label, start, duration, get_ident(), None))
+
+        # come functools.wraps, senza importare functools nel core
+        for attr in ("__module__", "__name__", "__qualname__", "__doc__"):
+            setattr(wrapper, attr, getattr(func, attr))
+        wrapper.__dict__.update(func.__dict__)
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    return decorate
+
+
+def enable(trace_path=None, report_at_exit: bool = True):
+    """Accende la strumentazione; all'uscita stampa il report e, con ``trace_path``, scrive il trace."""
+    _state.enabled = True
+    _state.trace_path = trace_path
+    if report_at_exit and not _state.at_exit:
+        _state.at_exit = True
+        atexit.register(_at_exit)
+
+
+def disable():
+    _state.enabled = False
+
+
+def reset():
+    _state.durations.clear()
+    _state.events.clear()
+    _state.origin = _clock()
+
+
+def _percentile(ordered: list[int], q: float) -> int:
+    # nearest-rank
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def stats() -> list[dict]:
+    """Statistiche per span (in ms), ordinate per tempo totale decrescente."""
+    rows = []
+    for name, durations in list(_state.durations.items()):
+        ordered = sorted(durations)
+        rows.append({
+            "name": name,
+            "count": len(ordered),
+            "total": sum(ordered) / 1e6,
+            "p50": _percentile(ordered, 0.50) / 1e6,
+            "p95": _percentile(ordered, 0.95) / 1e6,
+            "max": ordered[-1] / 1e6,
+        })
+    rows.sort(key=lambda r: r["total"], reverse=True)
+    return rows
+
+
+def report() -> str:
+    rows = stats()
+    if not rows:
+        return "profiling: nessuno span registrato."
+    width = max(24, max(len(r["name"]) for r in rows))
+    lines = [f"{'span':<{width}} {'n':>7} {'totale ms':>11} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+    for r in rows:
+        lines.append(
+            f"{r['name']:<{width}} {r['count']:>7} {r['total']:>11.2f} {r['p50']:>9.3f} {r['p95']:>9.3f} {r['max']:>9.3f}"
+        )
+    return "\n".join(lines)
+
+
+def write_trace(path):
+    """Scrive gli span nel formato Trace Event (JSON) di Chrome."""
+    import json
+
+    pid = os.getpid()
+    origin = _state.origin
+    events = []
+    for name, start, duration, tid, args in list(_state.events):
+        event = {"name": name, "ph": "X", "ts": (start - origin) / 1000, "dur": duration / 1000, "pid": pid, "tid": tid}
+        if args:
+            event["args"] = {k: str(v) for k, v in args.items()}
+        events.append(event)
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fp)
+
+
+def _at_exit():
+    if not _state.durations:
+        return
+    print(report(), file=sys.stderr)
+    if _state.trace_path:
+        try:
+            write_trace(_state.trace_path)
+        except OSError as e:
+            print(f"profiling: trace non scritto: {e}", file=sys.stderr)
+        else:
+            print(f"profiling: trace scritto in {_state.trace_path}", file=sys.stderr)
+
+
+if os.environ.get("QUESTS_PROFILE", "").strip() not in ("", "0") or os.environ.get("QUESTS_PROFILE_TRACE"):
+    enable(os.environ.get("QUESTS_PROFILE_TRACE") or None)
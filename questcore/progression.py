@@ -0,0 +1,193 @@
+"""Curve di progressione per generare una linea di quest a livelli (amount, premi, cooldown).
+
+Una ``Curve`` dà un valore intero per ogni livello ``1..count``:
+
+- ``linear``: da ``start`` a ``end`` in modo lineare;
+- ``geometric``: da ``start`` a ``end`` con rapporto costante (entrambi > 0);
+- ``breakpoints``: interpolazione lineare tra punti ``[[livello, valore], ...]``,
+  costante prima del primo e dopo l'ultimo.
+
+Poi, nell'ordine: variazione casuale opzionale (``jitter``, frazione ±),
+arrotondamento a multipli di ``round_to`` (es. 64 per gli stack) e minimo
+``minimum``. Con lo stesso ``seed`` l'output è sempre lo stesso.
+"""
+
+import math
+import random
+
+from .derive import refresh_derived
+from .helpers import int_to_roman
+from .model import Task
+
+CURVE_KINDS = ("linear", "geometric", "breakpoints")
+
+
+class CurveError(ValueError):
+    pass
+
+
+class Curve:
+    __slots__ = ("kind", "start", "end", "points", "round_to", "minimum", "jitter")
+
+    def __init__(
+        self,
+        kind: str = "linear",
+        start: float = 1,
+        end: float | None = None,
+        points=(),
+        round_to: int = 1,
+        minimum: int = 1,
+        jitter: float = 0.0,
+    ):
+        if kind not in CURVE_KINDS:
+            raise CurveError(f"tipo di curva sconosciuto {kind!r} (validi: {', '.join(CURVE_KINDS)})")
+        self.kind = kind
+        self.start = float(start)
+        self.end = self.start if end is None else float(end)
+        self.points = tuple(sorted((int(t), float(v)) for t, v in points))
+        self.round_to = int(round_to)
+        self.minimum = int(minimum)
+        self.jitter = float(jitter)
+
+        if kind == "geometric" and (self.start <= 0 or self.end <= 0):
+            raise CurveError("curva geometrica: start ed end devono essere > 0")
+        if kind == "breakpoints" and not self.points:
+            raise CurveError("curva a punti: serve almeno un punto [livello, valore]")
+        if self.round_to < 1:
+            raise CurveError("round_to deve essere >= 1")
+        if not 0 <= self.jitter < 1:
+            raise CurveError("jitter deve essere tra 0 e 1")
+
+    @classmethod
+    def from_dict(cls, data) -> "Curve":
+        """Curva da JSON: un numero (valore costante) o un dict con i parametri del costruttore."""
+        if isinstance(data, bool):
+            raise CurveError(f"curva non valida: {data!r}")
+        if isinstance(data, (int, float)):
+            return cls("linear", data, data)
+        if not isinstance(data, dict):
+            raise CurveError(f"curva non valida: {data!r}")
+        unknown = sorted(set(data) - set(cls.__slots__))
+        if unknown:
+            raise CurveError(f"curva: campi sconosciuti {unknown}")
+        try:
+            return cls(**data)
+        except (TypeError, ValueError) as e:
+            if isinstance(e, CurveError):
+                raise
+            raise CurveError(f"curva non valida: {e}") from None
+
+    def raw(self, count: int) -> list[float]:
+        """Valori della curva, senza variazione né arrotondamenti."""
+        if count <= 0:
+            return []
+        if count == 1:
+            steps = [0.0]
+        else:
+            steps = [i / (count - 1) for i in range(count)]
+
+        if self.kind == "linear":
+            start, span = self.start, self.end - self.start
+            return [start + span * s for s in steps]
+        if self.kind == "geometric":
+            start, ratio = self.start, self.end / self.start
+            return [start * ratio ** s for s in steps]
+
+        points = self.points
+        out = []
+        j = 0
+        for tier in range(1, count + 1):
+            while j < len(points) and points[j][0] < tier:
+                j += 1
+            if j == 0:
+                out.append(points[0][1])
+            elif j == len(points):
+                out.append(points[-1][1])
+            else:
+                (t0, v0), (t1, v1) = points[j - 1], points[j]
+                out.append(v1 if t1 == tier else v0 + (v1 - v0) * (tier - t0) / (t1 - t0))
+        return out
+
+    def values(self, count: int, rng: random.Random | None = None) -> list[int]:
+        raw = self.raw(count)
+        if self.jitter and rng is not None:
+            j = self.jitter
+            raw = [v * (1 + rng.uniform(-j, j)) for v in raw]
+        r = self.round_to
+        low = self.minimum
+        if r == 1:
+            return [max(low, math.floor(v + 0.5)) for v in raw]
+        return [max(low, r, math.floor(v / r + 0.5) * r) for v in raw]
+
+
+def tier_values(curves: dict, count: int, seed=None) -> dict[str, list[int]]:
+    """Valori per livello di ogni curva (``Curve`` o JSON per ``Curve.from_dict``).
+
+    Le curve vengono calcolate in ordine di nome da un unico generatore, così
+    il risultato dipende solo da ``seed`` e non dall'ordine del dict.
+    """
+    rng = random.Random(seed)
+    out = {}
+    for name in sorted(curves):
+        curve = curves[name]
+        if not isinstance(curve, Curve):
+            try:
+                curve = Curve.from_dict(curve)
+            except CurveError as e:
+                raise CurveError(f"{name}: {e}") from None
+        out[name] = curve.values(count, rng)
+    return out
+
+
+def _fill(template: str, fields: dict) -> str:
+    for key, value in fields.items():
+        template = template.replace("{" + key + "}", value)
+    return template
+
+
+def apply_progression(
+    quests,
+    values: dict[str, list[int]],
+    task: Task | None = None,
+    rewards=None,
+    lore_rewards=None,
+    placeholder_cfg=None,
+) -> dict[int, dict]:
+    """Applica i valori per livello (uno per quest, in ordine) alle quest.
+
+    - ``values["amount"]`` + ``task``: aggiunge (o sostituisce) la task con quell'amount;
+    - ``values["cooldown_time"]``: imposta il cooldown;
+    - ``rewards`` / ``lore_rewards``: righe che sostituiscono premi e lore-premi.
+
+    Nella label della task e nelle righe vengono sostituiti ``{nome_curva}``,
+    ``{sort_order}`` e ``{roman}``. I campi derivati vengono ricalcolati con
+    ``placeholder_cfg`` (default se ``None``).
+
+    Restituisce, per ``id(quest)``, i campi della quest modificati (per il journal):
+    quest di categorie diverse possono avere lo stesso ``quest_id``.
+    """
+    quests = list(quests)
+    for name, column in values.items():
+        if len(column) != len(quests):
+            raise CurveError(f"{name}: {len(column)} valori per {len(quests)} quest")
+
+    changes = {}
+    for i, q in enumerate(quests):
+        fields = {name: str(column[i]) for name, column in values.items()}
+        fields["sort_order"] = str(q.sort_order)
+        fields["roman"] = int_to_roman(q.sort_order)
+        changed = {}
+        if task is not None:
+            params = dict(task.params)
+            if "amount" in values:
+                params["amount"] = values["amount"][i]
+            q.add_task(Task(name=task.name, type=task.type, params=params, label=_fill(task.label, fields)))
+        if "cooldown_time" in values:
+            q.cooldown_time = changed["cooldown_time"] = values["cooldown_time"][i]
+        if rewards is not None:
+            q.rewards = changed["rewards"] = [_fill(line, fields) for line in rewards]
+        if lore_rewards is not None:
+            q.lore_reward_lines = changed["lore_reward_lines"] = [_fill(line, fields) for line in lore_rewards]
+        refresh_derived(q, placeholder_cfg)
+        changes[id(q)] = changed
+    return changes
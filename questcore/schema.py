@@ -0,0 +1,441 @@
+"""Task definitions (schema).
+
+Schema field format:
+  "key": (ftype, default)
+
+ftype supported:
+  - "int", "opt_int", "bool", "str", "list[str]", "enum"
+for enum, default = (choices_list, default_value)
+"""
+
+from .profiling import profiled
+
+TASK_DEFS = {
+    "blockbreak": {
+        "required": {"amount": ("int", None)},
+        "optional": {
+            "block": ("str", ""),
+            "blocks": ("list[str]", []),
+            "reverse-if-placed": ("bool", False),
+            "allow-silk-touch": ("bool", True),
+            "allow-negative-progress": ("bool", True),
+            "worlds": ("list[str]", []),
+        },
+        "mutex_groups": [("block", "blocks")],
+    },
+    "blockplace": {
+        "required": {"amount": ("int", None)},
+        "optional": {
+            "block": ("str", ""),
+            "blocks": ("list[str]", []),
+            "reverse-if-broken": ("bool", False),
+            "allow-negative-progress": ("bool", True),
+            "worlds": ("list[str]", []),
+        },
+        "mutex_groups": [("block", "blocks")],
+    },
+    "neobrewing": {
+        "required": {"amount": ("int", None)},
+        "optional": {
+            "ingredient": ("str", ""),
+            "exact-match": ("bool", True),
+            "required-effects": ("list[str]", []),
+            "worlds": ("list[str]", []),
+        },
+        "mutex_groups": [],
+    },
+    "consume": {
+        "required": {"amount": ("int", None)},
+        "optional": {
+            "item": ("str", ""),
+            "exact-match": ("bool", True),
+            "worlds": ("list[str]", []),
+        },
+        "mutex_groups": [],
+    },
+    "crafting": {
+        "required": {"amount": ("int", None)},
+        "optional": {
+            "item": ("str", ""),
+            "exact-match": ("bool", True),
+            "worlds": ("list[str]", []),
+        },
+        "mutex_groups": [],
+    },
+    "farming": {
+        "required": {"amount": ("int", None)},
+        "optional": {
+            "block": ("str", ""),
+            "blocks": ("list[str]", []),
+            "worlds": ("list[str]", []),
+        },
+        "mutex_groups": [("block", "blocks")],
+    },
+    "inventory": {
+        "required": {"amount": ("int", None)},
+        "optional": {
+            "item": ("str", ""),
+            "items": ("list[str]", []),
+            "exact-match": ("bool", True),
+            "remove-items-when-complete": ("bool", False),
+            "allow-partial-completion": ("bool", True),
+            "worlds": ("list[str]", []),
+        },
+        "mutex_groups": [("item", "items")],
+    },
+    "mobkilling": {
+        "required": {"amount": ("int", None)},
+        "optional": {
+            "mob": ("str", ""),
+            "mobs": ("list[str]", []),
+            "name": ("str", ""),
+            "names": ("list[str]", []),
+            "hostile": ("str", ""),
+            "item": ("str", ""),
+            "exact-match": ("bool", True),
+            "worlds": ("list[str]", []),
+        },
+        "mutex_groups": [("mob", "mobs"), ("name", "names")],
+    },
+    "smelting": {
+        "required": {"amount": ("int", None)},
+        "optional": {
+            "item": ("str", ""),
+            "exact-match": ("bool", True),
+            "worlds": ("list[str]", []),
+        },
+        "mutex_groups": [],
+    },
+    "smithing": {
+        "required": {"amount": ("int", None)},
+        "optional": {
+            "mode": ("enum", (["any", "transform", "trim"], "any")),  # NEW: selettore
+            "item": ("str", ""),
+            "exact-match": ("bool", True),
+            "worlds": ("list[str]", []),
+        },
+        "mutex_groups": [],
+    },
+    "enchanting": {
+        "required": {"amount": ("int", None)},
+        "optional": {
+            "item": ("str", ""),
+            "enchantment": ("list[str]", []),
+            "min-level": ("opt_int", None),  # se vuoto non viene scritto nel yaml
+            "worlds": ("list[str]", []),
+        },
+        "mutex_groups": [],
+    },
+    "interact": {
+        "required": {"amount": ("int", None)},
+        "optional": {
+            "item": ("str", ""),
+            "exact-match": ("bool", True),
+
+            "block": ("str", ""),
+            "blocks": ("list[str]", []),
+
+            "action": ("str", ""),
+            "actions": ("list[str]", []),
+
+            "use-interacted-block-result": ("str", ""),
+            "use-interacted-block-results": ("list[str]", []),
+
+            "use-item-in-hand-result": ("str", ""),
+            "use-item-in-hand-results": ("list[str]", []),
+
+            "worlds": ("list[str]", []),
+        },
+        "mutex_groups": [
+            ("block", "blocks"),
+            ("action", "actions"),
+            ("use-interacted-block-result", "use-interacted-block-results"),
+            ("use-item-in-hand-result", "use-item-in-hand-results"),
+        ],
+    },
+    "gathering": {
+        "required": {
+            "amount": ("int", None),
+            "item": ("str", None),  # obbligatorio stringa, default vuoto
+            "mob": ("str", None),   # obbligatorio stringa, default vuoto
+        },
+        "optional": {},
+        "mutex_groups": [],
+    },
+}
+
+TASK_TYPES = list(TASK_DEFS.keys())
+
+# task-type -> task-title (titoli “belli” per i player)
+TASK_TYPE_TITLES = {
+    "blockbreak": "Scava",
+    "blockplace": "Piazza",
+    "neobrewing": "Crafta",
+    "consume": "Consuma",
+    "crafting": "Crafta",
+    "farming": "Coltiva",
+    "inventory": "Ottieni",
+    "mobkilling": "Uccidi",
+    "smelting": "Cuoci",
+    "smithing": "Forgia",
+    "enchanting": "Incanta",
+    "interact": "Interagisci",
+    "gathering": "Preleva da",
+}
+
+
+# =========================
+# Schema compilati
+# =========================
+class FieldError(ValueError):
+    pass
+
+
+class FieldSpec:
+    """Un campo dello schema con le regole per il suo ``ftype`` già risolte."""
+
+    __slots__ = ("key", "ftype", "default", "required", "choices")
+
+    def __init__(self, key: str, ftype: str, default=None, required: bool = False):
+        self.key = key
+        self.ftype = ftype
+        self.required = required
+        if ftype == "enum":
+            choices, default = default
+            self.choices = tuple(choices)
+        else:
+            self.choices = ()
+        self.default = default
+
+    def initial(self, rng):
+        """Valore iniziale del campo per una nuova task."""
+        if self.required:
+            return rng.randint(1, 64) if self.ftype == "int" else ""
+        if self.ftype == "list[str]":
+            return []
+        return self.default
+
+    def parse_text(self, text: str):
+        """Valore del campo dal testo di un campo d'input (``FieldError`` se non valido)."""
+        if self.ftype in ("int", "opt_int"):
+            text = text.strip()
+            if text == "" and self.ftype == "opt_int":
+                return None
+            try:
+                return int(text)
+            except ValueError:
+                if self.ftype == "opt_int":
+                    raise FieldError(f"'{self.key}' deve essere un numero intero oppure vuoto.") from None
+                raise FieldError(f"'{self.key}' deve essere un numero intero.") from None
+        return text
+
+    def coerce(self, value):
+        """Valore del campo da un dato già tipizzato (JSON), con conversioni solo se univoche."""
+        ftype = self.ftype
+        if ftype in ("int", "opt_int"):
+            if value in (None, "") and ftype == "opt_int":
+                return None
+            if isinstance(value, bool):
+                raise FieldError(f"atteso un intero, trovato {value!r}")
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                raise FieldError(f"atteso un intero, trovato {value!r}") from None
+        if ftype == "bool":
+            if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+                return value.strip().lower() == "true"
+            if not isinstance(value, bool):
+                raise FieldError(f"atteso true/false, trovato {value!r}")
+            return value
+        if ftype == "list[str]":
+            if not isinstance(value, list):
+                raise FieldError("attesa una lista di stringhe")
+            return [str(v) for v in value]
+        if ftype == "enum":
+            if value in (None, ""):
+                return None
+            if value not in self.choices:
+                raise FieldError(f"valore {value!r} non tra {list(self.choices)}")
+            return value
+        return "" if value is None else str(value)
+
+    def normalized(self, value):
+        """(includi, valore) per un campo optional secondo le regole di ``normalize_params``."""
+        ftype = self.ftype
+        if ftype == "str":
+            return value not in (None, ""), value
+        if ftype == "list[str]":
+            return bool(value), list(value) if value else value
+        if ftype == "opt_int":
+            return value is not None, value
+        if ftype == "enum":
+            # includiamo sempre, così "any" viene scritto coerentemente
+            return True, value if value not in (None, "", self.default, (list(self.choices), self.default)) else self.default
+        if ftype == "bool":
+            return True, bool(value)
+        if ftype == "int":
+            return True, value
+        return value is not None, value
+
+    def check(self, value) -> str | None:
+        """Messaggio d'errore se ``value`` non è un valore valido del campo, altrimenti None."""
+        ftype = self.ftype
+        if ftype == "int":
+            ok = isinstance(value, int) and not isinstance(value, bool)
+        elif ftype == "opt_int":
+            ok = value is None or (isinstance(value, int) and not isinstance(value, bool))
+        elif ftype == "bool":
+            ok = isinstance(value, bool)
+        elif ftype == "str":
+            ok = isinstance(value, str)
+        elif ftype == "list[str]":
+            ok = isinstance(value, list) and all(isinstance(v, str) for v in value)
+        elif ftype == "enum":
+            if value not in self.choices:
+                return f"'{self.key}' deve essere uno tra {', '.join(self.choices)}, trovato {value!r}."
+            ok = True
+        else:
+            ok = True
+        return None if ok else f"'{self.key}' non è un valore {ftype} valido: {value!r}."
+
+
+class TaskSchema:
+    """Lo schema di un tipo di task in ``TASK_DEFS``, analizzato una volta sola."""
+
+    __slots__ = ("task_type", "fields", "required", "optional", "mutex")
+
+    def __init__(self, task_type: str, schema: dict):
+        self.task_type = task_type
+        self.required = tuple(FieldSpec(k, t, d, required=True) for k, (t, d) in schema["required"].items())
+        self.optional = tuple(FieldSpec(k, t, d) for k, (t, d) in schema["optional"].items())
+        self.fields = {f.key: f for f in self.required + self.optional}
+        self.mutex = tuple(tuple(group) for group in schema.get("mutex_groups", []))
+
+    def defaults(self, rng) -> dict:
+        return {f.key: f.initial(rng) for f in self.fields.values()}
+
+    def normalize(self, values: dict) -> dict:
+        params = {}
+        for f in self.required:
+            val = values.get(f.key)
+            params[f.key] = val if val is not None else ""
+        for f in self.optional:
+            include, val = f.normalized(values.get(f.key, f.default))
+            if include:
+                params[f.key] = val
+        return params
+
+    def conflicts(self, params: dict) -> list[tuple[str, str]]:
+        return [(a, b) for a, b in self.mutex if _is_valued(params.get(a)) and _is_valued(params.get(b))]
+
+    def errors(self, params: dict) -> list[tuple[str, str, str]]:
+        """(campo, codice, messaggio) per ogni problema dei params; lista vuota se sono validi."""
+        out = []
+        fields = self.fields
+        for f in self.required:
+            if f.key not in params:
+                out.append((f.key, "missing", f"campo obbligatorio '{f.key}' mancante."))
+        for key, value in params.items():
+            f = fields.get(key)
+            if f is None:
+                continue  # campi extra (es. importati) passano invariati
+            message = f.check(value)
+            if message:
+                out.append((key, "enum" if f.ftype == "enum" else "type", message))
+        for a, b in self.conflicts(params):
+            out.append((a, "mutex", f"I campi '{a}' e '{b}' non possono essere entrambi valorizzati."))
+        return out
+
+
+_COMPILED: dict[str, TaskSchema] = {}
+
+
+def compiled_schema(task_type: str) -> TaskSchema:
+    """``TaskSchema`` del tipo di task (``KeyError`` se il tipo non esiste)."""
+    schema = _COMPILED.get(task_type)
+    if schema is None:
+        schema = _COMPILED[task_type] = TaskSchema(task_type, TASK_DEFS[task_type])
+    return schema
+
+
+def default_params(task_type: str, rng=None) -> dict:
+    """Params iniziali per una nuova task: amount casuale, optional ai valori di default."""
+    if rng is None:
+        import random as rng
+    return compiled_schema(task_type).defaults(rng)
+
+
+def normalize_params(task_type: str, values: dict) -> dict:
+    """Costruisce i params di una task dai valori letti per ogni campo dello schema.
+
+    I campi required sono sempre presenti; gli optional vengono inclusi solo se
+    significativi (stringhe non vuote, liste non vuote, opt_int valorizzati).
+    """
+    return compiled_schema(task_type).normalize(values)
+
+
+def _is_valued(v) -> bool:
+    return (isinstance(v, str) and v != "") or (isinstance(v, list) and len(v) > 0)
+
+
+def mutex_conflicts(task_type: str, params: dict) -> list[tuple[str, str]]:
+    """Restituisce le coppie di campi mutuamente esclusivi valorizzate entrambe."""
+    return compiled_schema(task_type).conflicts(params)
+
+
+# =========================
+# Validazione in blocco
+# =========================
+class ValidationError:
+    """Un problema in una task: ``code`` è task_type, missing, type, enum, mutex o unknown_id (``catalog``)."""
+
+    __slots__ = ("quest_id", "task", "field", "code", "message")
+
+    def __init__(self, quest_id: str, task: str, field: str | None, code: str, message: str):
+        self.quest_id = quest_id
+        self.task = task
+        self.field = field
+        self.code = code
+        self.message = message
+
+    def __str__(self):
+        return f"{self.quest_id}/{self.task}: {self.message}"
+
+    def __repr__(self):
+        return f"ValidationError({self.quest_id!r}, {self.task!r}, {self.field!r}, {self.code!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, ValidationError):
+            return NotImplemented
+        return (self.quest_id, self.task, self.field, self.code, self.message) == (
+            other.quest_id, other.task, other.field, other.code, other.message)
+
+    def __hash__(self):
+        return hash((self.quest_id, self.task, self.field, self.code))
+
+
+def validate_task(task, quest_id: str = "") -> list[ValidationError]:
+    schema = _COMPILED.get(task.type)
+    if schema is None:
+        if task.type not in TASK_DEFS:
+            return [ValidationError(quest_id, task.name, None, "task_type", f"tipo di task sconosciuto {task.type!r}.")]
+        schema = compiled_schema(task.type)
+    return [ValidationError(quest_id, task.name, key, code, message) for key, code, message in schema.errors(task.params)]
+
+
+@profiled("validate_all")
+def validate_all(quests) -> list[ValidationError]:
+    """Valida tipi, campi obbligatori, enum e campi mutuamente esclusivi di tutte le task delle quest."""
+    errors = []
+    for quest in quests:
+        for task in quest.tasks.values():
+            errors.extend(validate_task(task, quest.quest_id))
+    return errors
+
+
+def validation_summary(errors: list[ValidationError], limit: int = 20) -> str:
+    lines = [f"Task non valide ({len(errors)}):"]
+    lines.extend(f"- {e}" for e in errors[:limit])
+    if len(errors) > limit:
+        lines.append(f"... e altri {len(errors) - limit}")
+    return "\n".join(lines)
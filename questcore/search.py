@@ -0,0 +1,236 @@
+"""Indice invertito delle quest di una sessione, per la ricerca nell'editor.
+
+Ogni quest contribuisce termini propri (``quest_id``, categoria, display type,
+parole dei premi e delle lore-premi, ``requires:<id>``) e termini per ogni task
+(nome, tipo, parole della label, ogni valore dei params). I termini sono in
+minuscolo e ogni valore è indicizzato due volte: da solo (``zombie``) e
+qualificato dal campo (``mob:zombie``, ``type:mobkilling``, ``reward:500``).
+
+Una query è un elenco di termini separati da spazi, tutti obbligatori; un
+termine che finisce con ``*`` vale come prefisso. Un termine della quest vale
+per tutte le sue task, così ``mobkilling zombie skyblock_nether`` trova le
+task di tipo mobkilling su ZOMBIE nel mondo skyblock_nether.
+
+L'indice è incrementale: ``refresh`` reindicizza solo le quest le cui task,
+premi o requires sono cambiati dall'ultima volta (revisioni di ``Quest``).
+L'indice non modifica mai le quest: premi e requires non ancora scritti nel
+modello (es. quelli di una tab aperta) si passano a ``refresh`` come ``pending``.
+"""
+
+import re
+
+from .profiling import profiled
+
+_WORD_RE = re.compile(r"[\w.\-]+")
+_COLOR_RE = re.compile(r"&[0-9a-fk-or]", re.IGNORECASE)
+_TASK_INPUTS = ("task_names", "task_labels", "task_types", "task_params")
+
+
+def _words(text) -> list[str]:
+    return _WORD_RE.findall(_COLOR_RE.sub(" ", str(text)).lower())
+
+
+def _value_terms(field: str, value, out: set):
+    for item in (value if type(value) is list else (value,)):
+        if item is None or item == "":
+            continue
+        text = str(item).lower()
+        out.add(text)
+        out.add(f"{field}:{text}")
+        if not _WORD_RE.fullmatch(text):
+            for word in _words(text):
+                out.add(word)
+                out.add(f"{field}:{word}")
+
+
+def quest_terms(quest, pending: dict | None = None) -> set[str]:
+    """Termini della quest; ``pending`` può sostituire ``rewards`` e ``requires``."""
+    pending = pending or {}
+    terms: set[str] = set()
+    _value_terms("quest", quest.quest_id, terms)
+    _value_terms("category", quest.category, terms)
+    _value_terms("display", quest.display_type, terms)
+    for line in pending.get("rewards", quest.rewards):
+        for word in _words(line):
+            terms.add(word)
+            terms.add(f"reward:{word}")
+    for line in quest.lore_reward_lines:
+        for word in _words(line):
+            terms.add(word)
+            terms.add(f"reward:{word}")
+    # solo qualificato: cercando un quest_id non si vogliono anche le quest che lo richiedono
+    terms.update(f"requires:{str(r).lower()}" for r in pending.get("requires", quest.requires))
+    return terms
+
+
+def task_terms(task) -> set[str]:
+    terms: set[str] = set()
+    _value_terms("name", task.name, terms)
+    _value_terms("type", task.type, terms)
+    for word in _words(task.label or ""):
+        terms.add(word)
+        terms.add(f"label:{word}")
+    for key, value in task.params.items():
+        if type(value) is bool:
+            value = "true" if value else "false"
+        _value_terms(key.lower(), value, terms)
+    return terms
+
+
+class SearchHit:
+    """Una quest trovata; ``tasks`` sono le task che corrispondono (vuoto se corrisponde la quest)."""
+
+    __slots__ = ("quest", "tasks")
+
+    def __init__(self, quest, tasks: list[str]):
+        self.quest = quest
+        self.tasks = tasks
+
+    @property
+    def quest_id(self) -> str:
+        return self.quest.quest_id
+
+    def __repr__(self):
+        return f"SearchHit({self.quest_id!r}, {self.tasks!r})"
+
+
+class QuestIndex:
+    """Indice delle quest per identità (``id(quest)``): quest importate da categorie
+    diverse possono avere lo stesso ``quest_id``."""
+
+    def __init__(self):
+        self._quests: dict[int, object] = {}  # chiave -> quest (la tiene viva: la chiave non viene riusata)
+        self._quest_postings: dict[str, set[int]] = {}  # termine -> chiavi delle quest
+        self._task_postings: dict[str, dict[int, set[str]]] = {}  # termine -> chiave -> nomi task
+        self._indexed: dict[int, tuple] = {}  # chiave -> (stamp, termini della quest, {task: termini})
+        self._order: dict[int, int] = {}  # chiave -> posizione nella sessione
+        self._tasks_order: dict[int, dict[str, int]] = {}
+
+    def __len__(self):
+        return len(self._indexed)
+
+    @staticmethod
+    def _stamp(quest, pending: dict | None = None) -> tuple:
+        # premi e requires vengono riassegnati (mai modificati in-place): basta l'identità
+        pending = pending or {}
+        return (tuple(quest.revision(i) for i in _TASK_INPUTS), pending.get("rewards", quest.rewards),
+                quest.lore_reward_lines, pending.get("requires", quest.requires), quest.category, quest.display_type)
+
+    @staticmethod
+    def _same(a: tuple, b: tuple) -> bool:
+        return a[0] == b[0] and all(x is y for x, y in zip(a[1:4], b[1:4])) and a[4:] == b[4:]
+
+    def _drop(self, key: int):
+        entry = self._indexed.pop(key, None)
+        self._quests.pop(key, None)
+        self._tasks_order.pop(key, None)
+        if entry is None:
+            return
+        _stamp, qterms, tterms = entry
+        for term in qterms:
+            keys = self._quest_postings[term]
+            keys.discard(key)
+            if not keys:
+                del self._quest_postings[term]
+        for name, terms in tterms.items():
+            for term in terms:
+                by_quest = self._task_postings[term]
+                names = by_quest[key]
+                names.discard(name)
+                if not names:
+                    del by_quest[key]
+                    if not by_quest:
+                        del self._task_postings[term]
+
+    def _add(self, quest, stamp: tuple, pending: dict | None = None):
+        key = id(quest)
+        qterms = quest_terms(quest, pending)
+        for term in qterms:
+            self._quest_postings.setdefault(term, set()).add(key)
+        tterms = {}
+        for name, task in quest.tasks.items():
+            terms = tterms[name] = task_terms(task)
+            for term in terms:
+                self._task_postings.setdefault(term, {}).setdefault(key, set()).add(name)
+        self._quests[key] = quest
+        self._indexed[key] = (stamp, qterms, tterms)
+        self._tasks_order[key] = {name: i for i, name in enumerate(quest.tasks)}
+
+    def update_quest(self, quest):
+        """Reindicizza una quest (le sue task, premi, requires...)."""
+        self._drop(id(quest))
+        self._add(quest, self._stamp(quest))
+
+    @profiled("QuestIndex.refresh")
+    def refresh(self, quests, pending: dict[int, dict] | None = None) -> int:
+        """Allinea l'indice alle quest della sessione; restituisce quante ne ha reindicizzate.
+
+        ``pending`` (``id(quest) -> {"rewards": [...], "requires": [...]}``) indicizza
+        valori non ancora riportati nel modello al posto di quelli della quest.
+        """
+        quests = list(quests)
+        pending = pending or {}
+        self._order = {id(q): i for i, q in enumerate(quests)}
+        for key in [key for key in self._indexed if key not in self._order]:
+            self._drop(key)
+
+        updated = 0
+        for q in quests:
+            lists = pending.get(id(q))
+            stamp = self._stamp(q, lists)
+            entry = self._indexed.get(id(q))
+            if entry is not None and self._same(entry[0], stamp):
+                continue
+            self._drop(id(q))
+            self._add(q, stamp, lists)
+            updated += 1
+        return updated
+
+    def _expand(self, term: str) -> list[str]:
+        if not term.endswith("*"):
+            return [term]
+        prefix = term[:-1]
+        vocabulary = set(self._quest_postings) | set(self._task_postings)
+        return [t for t in vocabulary if t.startswith(prefix)]
+
+    def _postings(self, term: str) -> tuple[set[int], dict[int, set[str]]]:
+        quests: set[int] = set()
+        tasks: dict[int, set[str]] = {}
+        for t in self._expand(term):
+            quests |= self._quest_postings.get(t, set())
+            for key, names in self._task_postings.get(t, {}).items():
+                tasks[key] = tasks[key] | names if key in tasks else names
+        return quests, tasks
+
+    @profiled("QuestIndex.search")
+    def search(self, query: str, limit: int | None = None) -> list[SearchHit]:
+        """Quest (nell'ordine della sessione) che contengono tutti i termini di ``query``."""
+        terms = [t for t in query.lower().split() if t]
+        if not terms:
+            return []
+        postings = [self._postings(t) for t in terms]
+        # le più selettive prima, così l'intersezione si restringe subito
+        postings.sort(key=lambda p: len(p[0]) + len(p[1]))
+
+        matched = None
+        for quests, tasks in postings:
+            keys = quests | tasks.keys()
+            matched = keys if matched is None else matched & keys
+            if not matched:
+                return []
+
+        hits = []
+        for key in sorted(matched, key=lambda k: self._order.get(k, 0)):
+            names = None
+            for quests, tasks in postings:
+                if key in quests:
+                    continue
+                found = tasks.get(key, set())
+                names = set(found) if names is None else names & found
+            if names is not None and not names:
+                continue
+            order = self._tasks_order.get(key, {})
+            hits.append(SearchHit(self._quests[key], sorted(names, key=lambda n: order.get(n, 0)) if names else []))
+            if limit is not None and len(hits) >= limit:
+                break
+        return hits
@@ -0,0 +1,151 @@
+"""Snapshot della sessione dell'editor (quest non ancora salvate + configurazione).
+
+Il file contiene tutto il modello, anche ciò che il .yml non conserva (flag delle
+lore manuali, override dei placeholders, righe premio della lore), più i formati
+dei placeholders e i valori del setup. È JSON compresso con gzip (livello 1) e
+"a colonne": i nomi dei campi di ``Quest`` sono scritti una volta sola
+nell'intestazione e ogni quest è una lista di valori in quell'ordine, così i
+campi aggiunti in futuro prendono il default e quelli rimossi vengono ignorati.
+
+Formato (versione 1)::
+
+    {"format": "questcore-session", "version": 1, "saved_at": <epoch>,
+     "placeholder_cfg": {...}, "setup": {...},
+     "fields": ["quest_id", "sort_order", ...], "param_keys": ["amount", ...],
+     "quests": [[<valori>, ..., [[name, type, label, [k, v, k, v, ...]], ...]], ...]}
+
+L'ultima colonna di ogni quest sono le task; i params sono coppie (indice in
+``param_keys``, valore), così i nomi dei campi non si ripetono per ogni task.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import fields
+from pathlib import Path
+
+from .model import Quest, Task
+from .profiling import profiled
+from .templates import DEFAULT_PLACEHOLDER_CFG, PlaceholderConfig
+
+SESSION_FORMAT = "questcore-session"
+SESSION_VERSION = 1
+DEFAULT_SESSION_PATH = Path(".quests-session.json.gz")
+
+# campi persistiti, nell'ordine delle colonne (le task vanno in coda)
+_SKIPPED = {"tasks", "revisions", "derived_cache", "generation", "document_cache"}
+QUEST_FIELDS = tuple(f.name for f in fields(Quest) if f.name not in _SKIPPED)
+
+
+class SessionError(ValueError):
+    pass
+
+
+class Session:
+    __slots__ = ("quests", "placeholder_cfg", "setup", "saved_at")
+
+    def __init__(self, quests: list, placeholder_cfg: PlaceholderConfig, setup: dict | None = None, saved_at: float = 0.0):
+        self.quests = quests
+        self.placeholder_cfg = placeholder_cfg
+        self.setup = setup or {}
+        self.saved_at = saved_at
+
+
+def session_to_dict(quests, placeholder_cfg=DEFAULT_PLACEHOLDER_CFG, setup: dict | None = None, saved_at: float | None = None) -> dict:
+    cfg = PlaceholderConfig.coerce(placeholder_cfg)
+    keys: dict[str, int] = {}
+    rows = []
+    for q in quests:
+        row = [getattr(q, name) for name in QUEST_FIELDS]
+        tasks = []
+        for t in q.tasks.values():
+            flat = []
+            for key, value in t.params.items():
+                index = keys.get(key)
+                if index is None:
+                    index = keys[key] = len(keys)
+                flat.append(index)
+                flat.append(value)
+            tasks.append([t.name, t.type, t.label, flat])
+        row.append(tasks)
+        rows.append(row)
+    return {
+        "format": SESSION_FORMAT,
+        "version": SESSION_VERSION,
+        "saved_at": time.time() if saved_at is None else saved_at,
+        "placeholder_cfg": cfg.as_dict(),
+        "setup": dict(setup or {}),
+        "fields": list(QUEST_FIELDS),
+        "param_keys": list(keys),
+        "quests": rows,
+    }
+
+
+def session_from_dict(data: dict) -> Session:
+    if not isinstance(data, dict) or data.get("format") != SESSION_FORMAT:
+        raise SessionError("non è un file di sessione")
+    version = data.get("version")
+    if not isinstance(version, int) or version > SESSION_VERSION:
+        raise SessionError(f"versione di sessione non supportata: {version!r} (massima {SESSION_VERSION})")
+
+    names = data.get("fields") or []
+    known = set(QUEST_FIELDS)
+    columns = [(i, name) for i, name in enumerate(names) if name in known]
+    if not {"quest_id", "sort_order", "category", "category_display"} <= {name for _i, name in columns}:
+        raise SessionError("sessione senza i campi obbligatori delle quest")
+
+    keys = [sys.intern(k) for k in data.get("param_keys") or []]
+    quests = []
+    for row in data.get("quests") or []:
+        try:
+            kwargs = {name: row[i] for i, name in columns}
+            q = Quest(**kwargs)
+            for name, type_, label, flat in row[len(names)]:
+                params = {keys[flat[i]]: flat[i + 1] for i in range(0, len(flat), 2)}
+                q.add_task(Task(name=name, type=type_, params=params, label=label))
+        except (IndexError, TypeError, ValueError) as e:
+            raise SessionError(f"quest non valida nella sessione: {e}") from None
+        quests.append(q)
+
+    try:
+        cfg = PlaceholderConfig.from_dict(data.get("placeholder_cfg") or {})
+    except ValueError as e:
+        raise SessionError(f"formati dei placeholders non validi: {e}") from None
+    return Session(quests, cfg, data.get("setup") or {}, float(data.get("saved_at") or 0.0))
+
+
+@profiled("save_session")
+def save_session(path, quests, placeholder_cfg=DEFAULT_PLACEHOLDER_CFG, setup: dict | None = None, saved_at: float | None = None) -> Path:
+    """Scrive la sessione in modo atomico (file temporaneo + rename); ``saved_at`` la identifica (default: adesso)."""
+    import gzip
+
+    path = Path(path)
+    payload = json.dumps(session_to_dict(quests, placeholder_cfg, setup, saved_at), ensure_ascii=False, separators=(",", ":"))
+    if path.parent != Path(""):
+        path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=1, mtime=0) as fp:
+            fp.write(payload.encode("utf-8"))
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path
+
+
+@profiled("load_session")
+def load_session(path) -> Session:
+    """Legge una sessione (compressa o JSON semplice); ``SessionError`` se il file non è valido."""
+    import gzip
+
+    data = Path(path).read_bytes()
+    try:
+        if data[:2] == b"\x1f\x8b":
+            data = gzip.decompress(data)
+        decoded = json.loads(data)
+    except (OSError, EOFError, ValueError) as e:
+        raise SessionError(f"sessione illeggibile: {e}") from None
+    return session_from_dict(decoded)
@@ -0,0 +1,140 @@
+"""Template precompilati per i formati dei placeholders (``App._placeholder_cfg``).
+
+Ogni formato viene analizzato una sola volta: i campi sconosciuti (es. ``{nome}``)
+o le graffe non bilanciate fanno fallire la creazione della configurazione, cioè
+al setup e non al salvataggio. I risultati vengono memorizzati per (task, label):
+cambiano solo se cambia la configurazione (nuovo oggetto) o la label della task.
+"""
+
+import string
+from functools import lru_cache
+
+DEFAULT_PLACEHOLDER_CFG = {
+    "placeholders_key_fmt": "progress-{task}",
+    "placeholders_value_fmt": "&7{label} &f{progress}&8/&f{goal}",
+    "progress_value_fmt": "&7{label} &f{progress}&8/&f{goal}",
+}
+
+KEY_FIELDS = ("task", "label")
+VALUE_FIELDS = ("task", "label", "progress", "goal")
+
+_CFG_FIELDS = {
+    "placeholders_key_fmt": KEY_FIELDS,
+    "placeholders_value_fmt": VALUE_FIELDS,
+    "progress_value_fmt": VALUE_FIELDS,
+}
+
+_FORMATTER = string.Formatter()
+
+
+class TemplateError(ValueError):
+    pass
+
+
+class PlaceholderTemplate:
+    """Un formato ``str.format`` già analizzato e validato."""
+
+    __slots__ = ("source", "fields", "_parts", "_simple")
+
+    def __init__(self, source: str, allowed=VALUE_FIELDS):
+        try:
+            parsed = list(_FORMATTER.parse(source))
+        except ValueError as e:
+            raise TemplateError(f"formato non valido {source!r}: {e}") from None
+
+        parts = []
+        fields = []
+        simple = True
+        for literal, field_name, format_spec, conversion in parsed:
+            if literal:
+                parts.append((True, literal))
+            if field_name is None:
+                continue
+            if field_name not in allowed:
+                shown = "{" + field_name + "}" if field_name else "{}"
+                choices = ", ".join("{" + f + "}" for f in allowed)
+                raise TemplateError(f"campo sconosciuto {shown} in {source!r} (disponibili: {choices})")
+            if format_spec or conversion:
+                simple = False
+            parts.append((False, field_name))
+            fields.append(field_name)
+
+        self.source = source
+        self.fields = frozenset(fields)
+        self._parts = tuple(parts)
+        self._simple = simple
+
+    def render(self, **values) -> str:
+        if not self._simple:
+            return self.source.format(**values)
+        return "".join(text if is_literal else values[text] for is_literal, text in self._parts)
+
+    def __repr__(self):
+        return f"PlaceholderTemplate({self.source!r})"
+
+
+class PlaceholderConfig:
+    """I tre formati dei placeholders compilati, con cache dei risultati per (task, label)."""
+
+    MAX_CACHE = 10_000
+
+    def __init__(self, placeholders_key_fmt: str, placeholders_value_fmt: str, progress_value_fmt: str):
+        self.key = PlaceholderTemplate(placeholders_key_fmt, KEY_FIELDS)
+        self.value = PlaceholderTemplate(placeholders_value_fmt, VALUE_FIELDS)
+        self.progress = PlaceholderTemplate(progress_value_fmt, VALUE_FIELDS)
+        self._cache: dict[tuple[str, str], tuple[str, str, str]] = {}
+
+    @classmethod
+    def from_dict(cls, cfg: dict) -> "PlaceholderConfig":
+        merged = {k: (cfg.get(k) or default) for k, default in DEFAULT_PLACEHOLDER_CFG.items()}
+        return _compiled(merged["placeholders_key_fmt"], merged["placeholders_value_fmt"], merged["progress_value_fmt"])
+
+    @classmethod
+    def coerce(cls, cfg) -> "PlaceholderConfig":
+        return cfg if isinstance(cfg, cls) else cls.from_dict(cfg)
+
+    def as_dict(self) -> dict:
+        return {
+            "placeholders_key_fmt": self.key.source,
+            "placeholders_value_fmt": self.value.source,
+            "progress_value_fmt": self.progress.source,
+        }
+
+    def render(self, tname: str, label: str) -> tuple[str, str, str]:
+        """(chiave placeholder, valore placeholder, valore progress-placeholder) per una task."""
+        cached = self._cache.get((tname, label))
+        if cached is not None:
+            return cached
+        progress = f"{{{tname}:progress}}"
+        goal = f"{{{tname}:goal}}"
+        result = (
+            self.key.render(task=tname, label=label),
+            self.value.render(task=tname, label=label, progress=progress, goal=goal),
+            self.progress.render(task=tname, label=label, progress=progress, goal=goal),
+        )
+        if len(self._cache) >= self.MAX_CACHE:
+            self._cache.clear()
+        self._cache[(tname, label)] = result
+        return result
+
+    def __eq__(self, other):
+        return isinstance(other, PlaceholderConfig) and self.as_dict() == other.as_dict()
+
+    def __hash__(self):
+        return hash(tuple(self.as_dict().values()))
+
+
+@lru_cache(maxsize=32)
+def _compiled(key_fmt: str, value_fmt: str, progress_fmt: str) -> PlaceholderConfig:
+    return PlaceholderConfig(key_fmt, value_fmt, progress_fmt)
+
+
+def validate_placeholder_cfg(cfg: dict) -> list[str]:
+    """Messaggi di errore per ogni formato non valido di ``cfg`` (lista vuota se è tutto ok)."""
+    errors = []
+    for key, allowed in _CFG_FIELDS.items():
+        try:
+            PlaceholderTemplate(cfg.get(key) or DEFAULT_PLACEHOLDER_CFG[key], allowed)
+        except TemplateError as e:
+            errors.append(f"{key}: {e}")
+    return errors
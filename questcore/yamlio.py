@@ -0,0 +1,101 @@
+"""YAML minimal dumper (senza PyYAML)."""
+
+from .profiling import profiled
+
+
+def _yaml_needs_quotes(s: str) -> bool:
+    if s == "":
+        return True
+    specials = [":", "{", "}", "[", "]", "#", "&", "*", "!", "|", ">", "%", "@", "`"]
+    if any(ch in s for ch in specials):
+        return True
+    if s[0].isspace() or s[-1].isspace():
+        return True
+    if s.lower() in {"true", "false", "null", "~"}:
+        return True
+    return False
+
+
+def _yaml_quote(s: str) -> str:
+    return '"' + s.replace('"', '\\"') + '"'
+
+
+def _yaml_scalar(data) -> str:
+    if isinstance(data, bool):
+        return "true" if data else "false"
+    if isinstance(data, int):
+        return str(data)
+    if data is None:
+        return "null"
+    if isinstance(data, str):
+        return _yaml_quote(data) if _yaml_needs_quotes(data) else data
+    return _yaml_quote(str(data))
+
+
+def yaml_iter_lines(data, indent: int = 0):
+    """Genera le righe YAML (senza newline finale) una alla volta, senza costruire stringhe annidate."""
+    sp = "  " * indent
+
+    if isinstance(data, dict):
+        if not data:
+            yield ""
+            return
+        for k, v in data.items():
+            if isinstance(v, (dict, list)):
+                yield f"{sp}{k}:"
+                yield from yaml_iter_lines(v, indent + 1)
+            else:
+                yield f"{sp}{k}: {_yaml_scalar(v)}"
+        return
+
+    if isinstance(data, list):
+        if not data:
+            yield f"{sp}[]"
+            return
+        for item in data:
+            if isinstance(item, (dict, list)):
+                yield f"{sp}-"
+                yield from yaml_iter_lines(item, indent + 1)
+            else:
+                yield f"{sp}- {_yaml_scalar(item)}"
+        return
+
+    yield f"{sp}{_yaml_scalar(data)}"
+
+
+@profiled("yaml_write")
+def yaml_write(data, stream, chunk_lines: int = 256) -> None:
+    """Scrive ``data`` su uno stream di testo; equivale a ``stream.write(yaml_dump(data) + "\n")``."""
+    buf = []
+    for line in yaml_iter_lines(data):
+        buf.append(line)
+        if len(buf) >= chunk_lines:
+            buf.append("")
+            stream.write("\n".join(buf))
+            buf.clear()
+    buf.append("")
+    stream.write("\n".join(buf))
+
+
+@profiled("yaml_dump")
+def yaml_dump(data, indent: int = 0) -> str:
+    return "\n".join(yaml_iter_lines(data, indent))
+
+
+@profiled("yaml_digest")
+def yaml_digest(data) -> str:
+    """Hash del contenuto che ``yaml_write`` produrrebbe per ``data`` (senza tenerlo in memoria)."""
+    import hashlib  # importato qui: serve solo all'export, non al caricamento del core
+
+    h = hashlib.blake2b(digest_size=16)
+    for line in yaml_iter_lines(data):
+        h.update(line.encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def text_digest(text: str) -> str:
+    """Hash di un testo ``yaml_dump``: uguale a ``yaml_digest`` dei dati da cui è stato prodotto."""
+    import hashlib
+
+    return hashlib.blake2b((text + "\n").encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,392 @@
+"""Import dei file .yml esistenti (il sottoinsieme di YAML prodotto da ``yaml_dump``).
+
+Il parser legge ogni file riga per riga, senza caricarlo tutto in memoria, e
+riconosce solo le forme emesse dal dumper: mappe ``chiave: valore``, liste
+``- valore``, ``[]`` per le liste vuote e la riga vuota dopo ``chiave:`` per le
+mappe vuote. ``load_quests_dir`` scansiona un intero albero ``quests/`` in
+parallelo.
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .derive import DEFAULT_PLACEHOLDER_CFG, build_lore, generate_placeholders_base
+from .helpers import int_to_roman
+from .model import Quest, Task, default_display_name
+from .profiling import profiled
+from .schema import TASK_DEFS, validate_all, validation_summary
+
+_INT_RE = re.compile(r"-?\d+")
+_DISPLAY_NAME_RE = re.compile(r"^&e(.+) ([MDCLXVI]+)$")
+_LORE_STARTED_RE = re.compile(r"^&6(.*): &7\{(.+):progress\}/\{\2:goal\}$")
+
+_REWARDS_HEADER = "&6Premi:"
+_REWARD_PREFIX = "&8- &7"
+
+
+class YamlLoadError(ValueError):
+    def __init__(self, message: str, path=None, lineno: int | None = None):
+        where = f"{path}:{lineno}" if lineno is not None else f"{path}"
+        super().__init__(f"{where}: {message}" if path is not None else message)
+        self.path = path
+        self.lineno = lineno
+
+
+# =========================
+# Parser
+# =========================
+class _Lines:
+    """Iteratore di righe con una riga di lookahead, già divisa in (indentazione, contenuto).
+
+    Le righe vuote hanno contenuto ``""``.
+    """
+
+    _EOF = object()
+
+    def __init__(self, lines, path=None):
+        self._it = iter(lines)
+        self._peeked = None
+        self.path = path
+        self.lineno = 0
+
+    def peek(self):
+        if self._peeked is None:
+            line = next(self._it, self._EOF)
+            if line is self._EOF:
+                self._peeked = line
+            else:
+                line = line.rstrip("\r\n")
+                body = line.lstrip(" ")
+                self._peeked = (len(line) - len(body), body if body.strip() else "")
+        return None if self._peeked is self._EOF else self._peeked
+
+    def next(self):
+        self._peeked = None
+        self.lineno += 1
+
+    def error(self, message: str) -> YamlLoadError:
+        return YamlLoadError(message, self.path, self.lineno + 1)
+
+
+def _scalar(s: str):
+    if len(s) >= 2 and s[0] == '"' and s[-1] == '"':
+        return s[1:-1].replace('\\"', '"')
+    low = s.lower()
+    if low == "true":
+        return True
+    if low == "false":
+        return False
+    if low in ("null", "~"):
+        return None
+    if _INT_RE.fullmatch(s):
+        return int(s)
+    return s
+
+
+def _is_item(body: str) -> bool:
+    return body == "-" or body.startswith("- ")
+
+
+def _parse_child(lines: _Lines, parent_indent: int):
+    """Valore di una ``chiave:`` (o di un ``-``) senza scalare sulla stessa riga."""
+    blank = False
+    while (line := lines.peek()) is not None and not line[1]:
+        lines.next()
+        blank = True
+    if line is None or line[0] <= parent_indent:
+        # yaml_dump scrive una mappa vuota come riga vuota dopo "chiave:"
+        return {} if blank else None
+    return _parse_node(lines, line[0])
+
+
+def _parse_node(lines: _Lines, indent: int):
+    body = lines.peek()[1]
+    if body == "[]":
+        lines.next()
+        return []
+    if _is_item(body):
+        return _parse_list(lines, indent)
+    return _parse_map(lines, indent)
+
+
+def _parse_map(lines: _Lines, indent: int) -> dict:
+    out = {}
+    while (line := lines.peek()) is not None:
+        ind, body = line
+        if not body:
+            lines.next()
+            continue
+        if ind < indent:
+            break
+        if ind > indent:
+            raise lines.error("indentazione inattesa")
+        if _is_item(body):
+            raise lines.error("elemento di lista dentro una mappa")
+        lines.next()
+
+        key, sep, rest = body.partition(": ")
+        if sep:
+            out[key] = _scalar(rest)
+        elif body.endswith(":"):
+            out[body[:-1]] = _parse_child(lines, ind)
+        else:
+            raise lines.error(f"riga non valida: {body!r}")
+    return out
+
+
+def _parse_list(lines: _Lines, indent: int) -> list:
+    out = []
+    while (line := lines.peek()) is not None:
+        ind, body = line
+        if not body:
+            lines.next()
+            continue
+        if ind < indent:
+            break
+        if ind > indent:
+            raise lines.error("indentazione inattesa")
+        if not _is_item(body):
+            break
+        lines.next()
+
+        if body == "-":
+            out.append(_parse_child(lines, ind))
+        else:
+            out.append(_scalar(body[2:]))
+    return out
+
+
+def yaml_load_lines(lines, path=None):
+    """Interpreta un iterabile di righe prodotto da ``yaml_dump``/``yaml_write``."""
+    src = _Lines(lines, path)
+    while (line := src.peek()) is not None and not line[1]:
+        src.next()
+    if line is None:
+        return {}
+    result = _parse_node(src, line[0])
+    if src.peek() is not None:
+        raise src.error("contenuto oltre la fine del documento")
+    return result
+
+
+def yaml_load(text: str):
+    return yaml_load_lines(text.split("\n"))
+
+
+# =========================
+# Documento -> Quest
+# =========================
+def _coerce_param(ftype: str, value):
+    if ftype == "int":
+        return int(value) if isinstance(value, (int, str)) and not isinstance(value, bool) else value
+    if ftype == "opt_int":
+        return None if value in (None, "") else _coerce_param("int", value)
+    if ftype == "bool":
+        return bool(value)
+    if ftype == "list[str]":
+        return [str(v) for v in value] if isinstance(value, list) else [str(value)]
+    if ftype in ("str", "enum"):
+        return "" if value is None else str(value)
+    return value
+
+
+def _task_from_dict(name: str, tdict: dict) -> Task:
+    tdict = dict(tdict or {})
+    task_type = str(tdict.pop("type", ""))
+    schema = TASK_DEFS.get(task_type)
+    if schema is None:
+        return Task(name=name, type=task_type, params=tdict)
+    fields = {**schema["required"], **schema["optional"]}
+    params = {}
+    for key, value in tdict.items():
+        ftype = fields.get(key, (None, None))[0]
+        try:
+            params[key] = _coerce_param(ftype, value) if ftype else value
+        except (TypeError, ValueError):
+            params[key] = value
+    return Task(name=name, type=task_type, params=params)
+
+
+def _str_list(value) -> list[str]:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        value = [value]
+    return ["" if v is None else str(v) for v in value]
+
+
+def _str_dict(value) -> dict:
+    if not isinstance(value, dict):
+        return {}
+    return {str(k): "" if v is None else str(v) for k, v in value.items()}
+
+
+def quest_from_document(doc: dict, quest_id: str, category: str | None = None, cfg: dict | None = None) -> Quest:
+    """Ricostruisce una ``Quest`` editabile dal documento di un file .yml.
+
+    Label, premi della lore e category_display non sono scritti esplicitamente
+    nel file: vengono ricavati da lore-started, lore-normal e display name. Le
+    lore e i placeholders che non coincidono con quelli generati diventano
+    modifiche manuali/override, così il salvataggio riproduce il file originale.
+    """
+    if not isinstance(doc, dict):
+        raise YamlLoadError("il documento non è una mappa")
+    cfg = cfg or DEFAULT_PLACEHOLDER_CFG
+
+    display = doc.get("display") or {}
+    options = doc.get("options") or {}
+    cooldown = options.get("cooldown") or {}
+
+    category = str(options.get("category") or category or "")
+    sort_order = options.get("sort-order")
+    sort_order = sort_order if isinstance(sort_order, int) and not isinstance(sort_order, bool) else 0
+    display_name = "" if display.get("name") is None else str(display.get("name"))
+
+    category_display = category
+    m = _DISPLAY_NAME_RE.match(display_name)
+    if m and m.group(2) == int_to_roman(sort_order):
+        category_display = m.group(1)
+
+    lore_normal = _str_list(display.get("lore-normal"))
+    lore_started = _str_list(display.get("lore-started"))
+
+    tasks = {}
+    for tname, tdict in (doc.get("tasks") or {}).items():
+        tname = str(tname)
+        tasks[tname] = _task_from_dict(tname, tdict if isinstance(tdict, dict) else {})
+    for line in lore_started:
+        lm = _LORE_STARTED_RE.match(line)
+        if lm and lm.group(2) in tasks:
+            tasks[lm.group(2)].label = lm.group(1)
+
+    lore_reward_lines = []
+    if _REWARDS_HEADER in lore_normal:
+        for line in lore_normal[lore_normal.index(_REWARDS_HEADER) + 1:]:
+            if not line.startswith(_REWARD_PREFIX):
+                break
+            lore_reward_lines.append(line[len(_REWARD_PREFIX):])
+
+    requires = _str_list(options.get("requires"))
+    cooldown_time = cooldown.get("time", 1440)
+
+    q = Quest(
+        quest_id=quest_id,
+        sort_order=sort_order,
+        category=category,
+        category_display=category_display,
+        tasks=tasks,
+        display_name=display_name,
+        display_type="STONE" if display.get("type") is None else str(display.get("type")),
+        rewards=_str_list(doc.get("rewards")),
+        repeatable=bool(options.get("repeatable", False)),
+        cooldown_enabled=bool(cooldown.get("enabled", True)),
+        cooldown_time=cooldown_time if isinstance(cooldown_time, int) else 1440,
+        requires=requires,
+        lore_reward_lines=lore_reward_lines,
+        display_auto=display_name == default_display_name(category_display, sort_order),
+    )
+
+    build_lore(q)
+    if q.lore_normal != lore_normal:
+        q.lore_normal = lore_normal
+        q.lore_normal_manual = True
+    if q.lore_started != lore_started:
+        q.lore_started = lore_started
+        q.lore_started_manual = True
+
+    base_placeholders, base_progress = generate_placeholders_base(q, cfg)
+    placeholders = _str_dict(doc.get("placeholders"))
+    progress = _str_dict(doc.get("progress-placeholders"))
+    if placeholders != base_placeholders:
+        q.placeholders_override = placeholders
+    if progress != base_progress:
+        q.progress_placeholders_override = progress
+
+    return q
+
+
+def load_quest_file(path, cfg: dict | None = None) -> Quest:
+    path = Path(path)
+    with path.open("r", encoding="utf-8") as fp:
+        doc = yaml_load_lines(fp, path)
+    try:
+        return quest_from_document(doc, path.stem, category=path.parent.name, cfg=cfg)
+    except YamlLoadError as e:
+        raise YamlLoadError(str(e), path) from None
+
+
+# =========================
+# Scansione di un albero quests/
+# =========================
+@dataclass
+class LoadReport:
+    quests: list = field(default_factory=list)
+    errors: list = field(default_factory=list)  # (path, messaggio)
+    invalid: list = field(default_factory=list)  # ValidationError delle task caricate
+    files: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        lines = [f"{len(self.quests)} quest caricate da {self.files} file in {self.seconds:.2f}s ({len(self.errors)} errori)."]
+        for path, message in self.errors:
+            lines.append(f"- {path}: {message}")
+        if self.invalid:
+            lines.append(validation_summary(self.invalid))
+        return "\n".join(lines)
+
+
+def _load_many(paths: list, cfg: dict | None) -> list:
+    results = []
+    for path in paths:
+        try:
+            results.append((path, load_quest_file(path, cfg), None))
+        except (OSError, UnicodeDecodeError, ValueError, TypeError) as e:
+            results.append((path, None, str(e)))
+    return results
+
+
+@profiled("load_quests_dir")
+def load_quests_dir(root="quests", cfg: dict | None = None, max_workers: int | None = None, processes: bool = False) -> LoadReport:
+    """Carica tutti i file .yml sotto ``root`` (ricorsivamente).
+
+    I file vengono divisi in blocchi elaborati da un pool di thread. Con
+    ``processes=True`` (solo da script/CLI) il pool è di processi, che per alberi
+    grandi scala meglio perché il parsing è puro Python; mai dall'editor: fare
+    fork (o spawn, che reimporta ``Main``) da un processo con Tk attivo non è
+    sicuro. I file non validi finiscono in ``errors`` senza interrompere il
+    caricamento.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    started = time.perf_counter()
+    paths = sorted(p for p in Path(root).rglob("*.yml") if p.is_file())
+    report = LoadReport(files=len(paths))
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(paths)))
+
+    chunk = max(1, -(-len(paths) // (max_workers * 4)))
+    chunks = [paths[i:i + chunk] for i in range(0, len(paths), chunk)]
+
+    if len(chunks) <= 1:
+        batches = [_load_many(paths, cfg)]
+    else:
+        executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with executor(max_workers=max_workers) as pool:
+            batches = list(pool.map(_load_many, chunks, [cfg] * len(chunks)))
+
+    for batch in batches:
+        for path, quest, error in batch:
+            if error is not None:
+                report.errors.append((path, error))
+            else:
+                report.quests.append(quest)
+
+    report.quests.sort(key=lambda q: (q.category, q.sort_order, q.quest_id))
+    report.invalid = validate_all(report.quests)
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from questcore.batch import SpecError, build_quests, main
+
+
+def _spec(**changes) -> dict:
+    spec = {
+        "category": "mining",
+        "category_display": "Miniera",
+        "count": 3,
+        "last_sort_order": 10,
+        "quest": {"display_type": "DIAMOND_PICKAXE", "cooldown_time": "60"},
+        "tasks": [
+            {"name": "pietra", "type": "blockbreak", "label": "Pietra {roman}", "params": {"amount": "{sort_order}", "block": "STONE"}},
+        ],
+        "rewards": ["eco give {player} {index}00"],
+        "lore_rewards": ["{index}00 monete"],
+    }
+    spec.update(changes)
+    return spec
+
+
+def test_build_quests():
+    quests, _cfg = build_quests(_spec())
+    assert [q.quest_id for q in quests] == ["mining11", "mining12", "mining13"]
+    first = quests[0]
+    assert first.display_type == "DIAMOND_PICKAXE" and first.cooldown_time == 60
+    params = first.tasks["pietra"].params
+    assert (params["amount"], params["block"]) == (11, "STONE")
+    assert first.tasks["pietra"].label == "Pietra XI"
+    assert first.rewards == ["eco give {player} 100"]
+    assert first.lore_reward_lines == ["100 monete"]
+    assert first.lore_normal and first.display_name
+
+
+@pytest.mark.parametrize("changes", [
+    {"category": " "},
+    {"count": 0},
+    {"count": "tanti"},
+    {"placeholders": {"sconosciuto": "x"}},
+    {"quest": {"colore": "rosso"}},
+    {"tasks": [{"name": "t", "type": "boh"}]},
+    {"tasks": [{"name": "t", "type": "blockbreak", "params": {"amount": 1, "colore": 2}}]},
+    {"tasks": [{"name": "t", "type": "blockbreak", "params": {"block": "STONE"}}]},
+    {"tasks": [{"name": "t", "type": "blockbreak", "params": {"amount": True}}]},
+    {"tasks": [{"name": "t", "type": "blockbreak", "params": {"amount": 1, "block": "A", "blocks": ["B"]}}]},
+    {"tasks": [{"name": "t", "type": "farming", "params": {"amount": 1}}, {"name": "t", "type": "farming", "params": {"amount": 2}}]},
+    {"count": None},
+    {"count": True},
+    {"last_sort_order": "10"},
+    {"placeholders": ["x"]},
+    {"quest": "rosso"},
+    {"tasks": {"name": "t"}},
+    {"tasks": ["pietra"]},
+    {"tasks": [{"name": 5, "type": "farming"}]},
+    {"tasks": [{"name": "t", "type": "farming", "params": [1]}]},
+    {"tasks": [{"name": "t", "type": "farming", "params": {"amount": 1}, "label": 5}]},
+    {"tasks": [{"name": "t", "type": "farming", "params": {"amount": 1}, "label": ["Pietra"]}]},
+    {"rewards": "eco give {player} 1"},
+    {"curves": []},
+    {"seed": 1.5},
+])
+def test_malformed_specs(changes):
+    with pytest.raises(SpecError):
+        build_quests(_spec(**changes))
+
+
+def test_spec_must_be_an_object():
+    with pytest.raises(SpecError):
+        build_quests([_spec()])
+
+
+def test_missing_field():
+    spec = _spec()
+    del spec["category_display"]
+    with pytest.raises(SpecError, match="category_display"):
+        build_quests(spec)
+
+
+def test_cli_writes_files(tmp_path, capsys):
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(_spec()), encoding="utf-8")
+    (tmp_path / "out" / "mining").mkdir(parents=True)
+    (tmp_path / "out" / "mining" / "mining10.yml").write_text("options:\n  sort-order: 10\n", encoding="utf-8")
+    out = tmp_path / "out"
+    assert main([str(spec_path), "--output", str(out), "--dry-run"]) == 0
+    assert not (out / "mining" / "mining11.yml").exists()
+    assert main([str(spec_path), "--output", str(out)]) == 0
+    assert sorted(p.name for p in (out / "mining").glob("*.yml")) == ["mining10.yml", "mining11.yml", "mining12.yml", "mining13.yml"]
+    assert "eco give {player} 300" in (out / "mining" / "mining13.yml").read_text(encoding="utf-8")
+
+
+def test_cli_reports_errors(tmp_path, capsys):
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(_spec(count=-1)), encoding="utf-8")
+    assert main([str(spec_path)]) == 2
+    assert "errore:" in capsys.readouterr().err
+    spec_path.write_text(json.dumps(_spec(output=3)), encoding="utf-8")
+    assert main([str(spec_path)]) == 2
+    assert "'output'" in capsys.readouterr().err
+    assert main([str(tmp_path / "manca.json")]) == 2
+
+
+def test_cli_checks_dependencies(tmp_path, capsys):
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(_spec()), encoding="utf-8")
+    out = tmp_path / "out"
+    assert main([str(spec_path), "--output", str(out)]) == 2
+    assert "mining10" in capsys.readouterr().err
+    assert not out.exists()
+    assert main([str(spec_path), "--output", str(out), "--ignore-deps"]) == 0
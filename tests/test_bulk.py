@@ -0,0 +1,68 @@
+import pytest
+
+from questcore import BulkEdit, BulkError, Task, apply_bulk, select_quests
+from questcore.bulk import scale_value
+from questcore.model import create_quests
+
+
+def _quests():
+    quests = create_quests("mining", "Miniera", 4, 0)
+    for q in quests:
+        q.add_task(Task(name="pietra", type="blockbreak", params={"amount": 10, "block": "STONE"}))
+        q.add_task(Task(name="zombie", type="mobkilling", params={"amount": 3, "mob": "ZOMBIE"}))
+    return quests
+
+
+def test_select_quests():
+    quests = _quests()
+    assert [q.quest_id for q in select_quests(quests, sort_range=(2, 3))] == ["mining2", "mining3"]
+    assert [q.quest_id for q in select_quests(quests, among=[quests[3], quests[0]])] == ["mining1", "mining4"]
+    assert [q.quest_id for q in select_quests(quests, sort_range=(1, 2), among=quests[1:])] == ["mining2"]
+
+
+def test_same_quest_id_in_different_categories():
+    mining = create_quests("mining", "Miniera", 1, 0)[0]
+    farming = create_quests("farming", "Fattoria", 1, 0)[0]
+    farming.quest_id = mining.quest_id
+    for q in (mining, farming):
+        q.add_task(Task(name="pietra", type="blockbreak", params={"amount": 10, "block": "STONE"}))
+    assert select_quests([mining, farming], among=[farming]) == [farming]
+    farming.cooldown_time = 60
+    changes = apply_bulk([mining, farming], BulkEdit(fields={"cooldown_time": 60}, scale={"amount": 2}))
+    assert changes[id(mining)] == {"fields": {"cooldown_time": 60}, "tasks": {"pietra": {"amount": 20, "block": "STONE"}}}
+    assert changes[id(farming)] == {"fields": {}, "tasks": {"pietra": {"amount": 20, "block": "STONE"}}}
+
+
+def test_scale_value():
+    assert scale_value(10, 1.5) == 15
+    assert scale_value(3, 0.1) == 1
+    assert scale_value(0, 2) == 0
+    assert scale_value(True, 2) is True
+    assert scale_value("10", 2) == "10"
+
+
+@pytest.mark.parametrize("data", [
+    {"fields": {"sort_order": 1}},
+    {"fields": {"cooldown_time": "60"}},
+    {"fields": {"cooldown_time": -1}},
+    {"fields": {"display_type": ""}},
+    {"scale": {"amount": -1}},
+    {"colore": 1},
+    [],
+])
+def test_invalid_edits(data):
+    with pytest.raises(BulkError):
+        BulkEdit.from_dict(data)
+
+
+def test_apply_bulk_changes_only_what_differs():
+    quests = _quests()
+    quests[0].cooldown_time = 60
+    edit = BulkEdit(fields={"cooldown_time": 60}, add_rewards=["eco give {player} 5"], scale={"amount": 2}, task_type="blockbreak")
+    changes = apply_bulk(quests[:2], edit)
+    assert changes[id(quests[0])]["fields"] == {"rewards": ["eco give {player} 5"]}
+    assert changes[id(quests[1])]["fields"]["cooldown_time"] == 60
+    assert changes[id(quests[1])]["tasks"] == {"pietra": {"amount": 20, "block": "STONE"}}
+    assert quests[1].tasks["zombie"].params["amount"] == 3
+    assert quests[2].tasks["pietra"].params["amount"] == 10
+    assert apply_bulk(quests[:2], BulkEdit(add_rewards=["eco give {player} 5"])) == {}
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from questcore import Task
+from questcore.catalog import CATALOG_KINDS, Catalog, CatalogError, load_catalog, normalize_id, validate_ids
+from questcore.model import create_quests
+
+
+@pytest.fixture
+def catalog():
+    return Catalog({
+        "materials": ["STONE", "STONE_BRICKS", "STONE_SLAB", "DIRT", "DIAMOND"],
+        "entities": ["ZOMBIE", "ZOMBIE_VILLAGER"],
+        "enchantments": ["SHARPNESS"],
+    }, "1.21")
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("stone", "STONE"), (" minecraft:stone ", "STONE"), ("STONE:1", "STONE"), ("sharpness:5", "SHARPNESS"),
+])
+def test_normalize_id(raw, expected):
+    assert normalize_id(raw) == expected
+
+
+def test_membership_and_completion(catalog):
+    assert ("materials", "minecraft:stone") in catalog
+    assert ("materials", "ZOMBIE") not in catalog
+    assert catalog.complete("materials", "sto") == ["STONE", "STONE_BRICKS", "STONE_SLAB"]
+    assert catalog.complete("materials", "stone_", limit=1) == ["STONE_BRICKS"]
+    assert catalog.complete("entities", "x") == []
+    assert catalog.suggest("materials", "STONE_BRICK") == "STONE_BRICKS"
+    assert catalog.suggest("materials", "ACQUA") is None
+
+
+def test_validate_ids(catalog):
+    q = create_quests("mining", "Miniera", 1, 0)[0]
+    q.display_type = "DIAMOND"
+    q.add_task(Task(name="a", type="blockbreak", params={"amount": 1, "blocks": ["stone", "STONE_BRIK"]}))
+    q.add_task(Task(name="b", type="mobkilling", params={"amount": 1, "mob": "ZOMBEE", "worlds": ["qualsiasi"]}))
+    errors = validate_ids([q], catalog)
+    assert [(e.task, e.field, e.code) for e in errors] == [("a", "blocks", "unknown_id"), ("b", "mob", "unknown_id")]
+    assert "forse STONE_BRICKS" in errors[0].message
+
+
+def test_bundled_catalog():
+    catalog = load_catalog()
+    assert catalog is load_catalog()
+    for kind in CATALOG_KINDS:
+        values = catalog.values(kind)
+        assert values and list(values) == sorted(set(values))
+    assert ("materials", "STONE") in catalog and ("entities", "ZOMBIE") in catalog
+
+
+def test_invalid_catalog_files(tmp_path):
+    path = tmp_path / "ids.json"
+    path.write_text("{rotto", encoding="utf-8")
+    with pytest.raises(CatalogError):
+        load_catalog(path)
+    path.write_text(json.dumps({"format": "questcore-catalog", "version": 99}), encoding="utf-8")
+    with pytest.raises(CatalogError):
+        load_catalog(path)
+    path.write_text(json.dumps({"format": "questcore-catalog", "version": 1, "materials": ["X"]}), encoding="utf-8")
+    assert load_catalog(path).values("materials") == ("X",)
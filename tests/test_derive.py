@@ -0,0 +1,94 @@
+from questcore import DEFAULT_PLACEHOLDER_CFG, PlaceholderConfig, Task
+from questcore.derive import cached_document, generate_placeholders, lore_normal_for, lore_started_for, refresh_derived
+from questcore.model import create_quests
+from questcore.yamlio import yaml_digest, yaml_dump
+
+
+def _quest():
+    q = create_quests("mining", "Miniera", 1, 0)[0]
+    q.add_task(Task(name="pietra", type="blockbreak", params={"amount": 64, "block": "STONE"}, label="Pietra"))
+    q.lore_reward_lines = ["100 monete"]
+    return q
+
+
+def test_first_refresh_computes_everything_then_nothing():
+    q = _quest()
+    assert refresh_derived(q, DEFAULT_PLACEHOLDER_CFG) == {
+        "display_name", "lore_normal", "lore_started", "placeholders", "placeholders_override"}
+    assert q.lore_normal == lore_normal_for(q) and q.lore_started == lore_started_for(q)
+    assert q.display_name == "&eMiniera I"
+    assert refresh_derived(q, DEFAULT_PLACEHOLDER_CFG) == set()
+
+
+def test_only_affected_fields_are_recomputed():
+    q = _quest()
+    refresh_derived(q, DEFAULT_PLACEHOLDER_CFG)
+
+    q.update_task("pietra", params={"amount": 128, "block": "STONE"})
+    assert refresh_derived(q, DEFAULT_PLACEHOLDER_CFG) == set()
+
+    q.update_task("pietra", label="Sasso")
+    assert refresh_derived(q, DEFAULT_PLACEHOLDER_CFG) == {"lore_normal", "lore_started", "placeholders"}
+    assert "&8- &7Sasso" in q.lore_normal
+    assert generate_placeholders(q, DEFAULT_PLACEHOLDER_CFG)[0] == {"progress-pietra": "&7Sasso &f{pietra:progress}&8/&f{pietra:goal}"}
+
+    q.sort_order = 4
+    assert refresh_derived(q) == {"display_name"}
+    assert q.display_name == "&eMiniera IV"
+    q.sort_order = 4
+    assert refresh_derived(q) == set()
+
+    q.lore_reward_lines = ["200 monete"]
+    assert refresh_derived(q) == {"lore_normal"}
+    assert "&8- &7200 monete" in q.lore_normal
+
+
+def test_in_place_edits_need_touch():
+    q = _quest()
+    refresh_derived(q)
+    q.lore_reward_lines.append("una gemma")
+    assert refresh_derived(q) == set()
+    q.touch("lore_reward_lines")
+    assert refresh_derived(q) == {"lore_normal"}
+    assert "&8- &7una gemma" in q.lore_normal
+
+
+def test_manual_fields_are_kept():
+    q = _quest()
+    q.display_auto = False
+    q.display_name = "Nome a mano"
+    q.lore_normal = ["a mano"]
+    q.lore_normal_manual = True
+    refresh_derived(q)
+    q.update_task("pietra", label="Sasso")
+    refresh_derived(q)
+    assert q.display_name == "Nome a mano" and q.lore_normal == ["a mano"]
+    assert any("Sasso" in line for line in q.lore_started)
+
+
+def test_new_config_recomputes_placeholders():
+    q = _quest()
+    refresh_derived(q, DEFAULT_PLACEHOLDER_CFG)
+    cfg = PlaceholderConfig.from_dict({"placeholders_key_fmt": "p-{task}"})
+    assert refresh_derived(q, cfg) == {"placeholders"}
+    assert list(generate_placeholders(q, cfg)[0]) == ["p-pietra"]
+    q.placeholders_override = {"a": "b"}
+    assert refresh_derived(q, cfg) == {"placeholders_override"}
+    assert generate_placeholders(q, cfg)[0] == {"a": "b"}
+
+
+def test_cached_document_follows_generation_and_config():
+    q = _quest()
+    refresh_derived(q, DEFAULT_PLACEHOLDER_CFG)
+    first = cached_document(q, DEFAULT_PLACEHOLDER_CFG)
+    assert cached_document(q, DEFAULT_PLACEHOLDER_CFG) is first
+    document, text, digest = first
+    assert text == yaml_dump(document) and digest == yaml_digest(document)
+
+    q.update_task("pietra", params={"amount": 128, "block": "STONE"})
+    refresh_derived(q, DEFAULT_PLACEHOLDER_CFG)
+    second = cached_document(q, DEFAULT_PLACEHOLDER_CFG)
+    assert second is not first and "128" in second[1]
+
+    third = cached_document(q, None)
+    assert third is not second and third[0]["placeholders"] == {}
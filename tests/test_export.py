@@ -0,0 +1,128 @@
+import hashlib
+import os
+
+from questcore import export
+from questcore.export import ExportCache, export_documents
+from questcore.yamlio import yaml_digest, yaml_dump
+
+
+class Boom:
+    def __str__(self):
+        raise ValueError("non serializzabile")
+
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _leftovers(root):
+    return sorted(p.name for p in root.rglob("*.tmp"))
+
+
+def test_writes_every_document(tmp_path):
+    docs = [(tmp_path / "mining" / f"q{i}.yml", {"n": i, "lista": ["a", "b"]}) for i in range(20)]
+    report = export_documents(docs, max_workers=4)
+    assert report.ok and len(report.results) == 20
+    for path, data in docs:
+        assert path.read_text(encoding="utf-8") == yaml_dump(data) + "\n"
+        assert path.stat().st_mode & 0o777 == 0o666 & ~_umask()
+    assert _leftovers(tmp_path) == []
+    assert "20 file" in report.summary()
+
+
+def test_serialization_error_leaves_old_files(tmp_path):
+    old = tmp_path / "q1.yml"
+    old.write_text("vecchio\n", encoding="utf-8")
+    report = export_documents([(old, {"n": 1}), (tmp_path / "q2.yml", {"n": Boom()})])
+    assert not report.ok
+    assert old.read_text(encoding="utf-8") == "vecchio\n"
+    assert not (tmp_path / "q2.yml").exists()
+    first, second = report.results
+    assert first.rolled_back and not second.rolled_back
+    assert "non serializzabile" in second.error
+    assert _leftovers(tmp_path) == []
+    assert not report.partial
+    assert "per evitare un export parziale" in report.summary()
+
+
+def test_replace_error_is_reported(tmp_path):
+    (tmp_path / "cartella.yml").mkdir()
+    docs = [(tmp_path / "a.yml", {"n": 1}), (tmp_path / "cartella.yml", {"n": 2}), (tmp_path / "b.yml", {"n": 3})]
+    report = export_documents(docs, max_workers=1)
+    assert [r.path.name for r in report.failures] == ["cartella.yml", "b.yml"]
+    assert [r.rolled_back for r in report.failures] == [False, True]
+    assert (tmp_path / "a.yml").exists() and not (tmp_path / "b.yml").exists()
+    assert _leftovers(tmp_path) == []
+    assert report.partial
+    summary = report.summary()
+    assert "Export parziale: 1 file già sostituiti" in summary and "per evitare" not in summary
+
+
+def test_temp_files_follow_the_umask(tmp_path):
+    old = os.umask(0o027)
+    try:
+        report = export_documents([(tmp_path / "q.yml", {"n": 1})], cache=ExportCache())
+    finally:
+        os.umask(old)
+    assert report.ok
+    assert (tmp_path / "q.yml").stat().st_mode & 0o777 == 0o640
+    assert (tmp_path / ExportCache.MANIFEST_NAME).stat().st_mode & 0o777 == 0o640
+
+
+def test_changed_files_are_serialized_once(tmp_path, monkeypatch):
+    calls = []
+
+    def counting_dump(data):
+        calls.append(data["n"])
+        return yaml_dump(data)
+
+    monkeypatch.setattr(export, "yaml_dump", counting_dump)
+    monkeypatch.setattr(export, "yaml_write", None)  # con la cache si scrive il testo già serializzato
+    docs = [(tmp_path / f"q{i}.yml", {"n": i}) for i in range(3)]
+    assert export_documents(docs, max_workers=1, cache=ExportCache()).written == 3
+    assert calls == [0, 1, 2]
+    assert (tmp_path / "q2.yml").read_text(encoding="utf-8") == "n: 2\n"
+
+
+def test_yaml_digest_hashes_the_written_bytes():
+    data = {"a": [1, "x: y"], "b": {}}
+    expected = hashlib.blake2b((yaml_dump(data) + "\n").encode("utf-8"), digest_size=16).hexdigest()
+    assert yaml_digest(data) == expected
+    assert yaml_digest({"a": 1}) != yaml_digest({"a": 2})
+
+
+def test_cache_skips_unchanged_files(tmp_path):
+    docs = [(tmp_path / "mining" / f"q{i}.yml", {"n": i}) for i in range(3)]
+    cache = ExportCache()
+    assert export_documents(docs, cache=cache).written == 3
+    mtimes = [p.stat().st_mtime_ns for p, _data in docs]
+
+    report = export_documents(docs, cache=cache)
+    assert (report.written, report.skipped) == (0, 3)
+    assert [p.stat().st_mtime_ns for p, _data in docs] == mtimes
+
+    docs[1] = (docs[1][0], {"n": 10})
+    report = export_documents(docs, cache=cache)
+    assert (report.written, report.skipped) == (1, 2)
+    assert docs[1][0].read_text(encoding="utf-8") == "n: 10\n"
+
+
+def test_hand_edits_are_overwritten(tmp_path):
+    path = tmp_path / "q.yml"
+    cache = ExportCache(manifest=False)
+    export_documents([(path, {"n": 1})], cache=cache)
+    path.write_text("modificato a mano\n", encoding="utf-8")
+    assert export_documents([(path, {"n": 1})], cache=cache).written == 1
+    assert path.read_text(encoding="utf-8") == "n: 1\n"
+    assert not (tmp_path / ExportCache.MANIFEST_NAME).exists()
+
+
+def test_manifest_survives_a_new_cache(tmp_path):
+    docs = [(tmp_path / "mining" / "q1.yml", {"n": 1})]
+    export_documents(docs, cache=ExportCache())
+    assert (tmp_path / "mining" / ExportCache.MANIFEST_NAME).exists()
+    assert export_documents(docs, cache=ExportCache()).skipped == 1
+    (tmp_path / "mining" / ExportCache.MANIFEST_NAME).write_text("{rotto", encoding="utf-8")
+    assert export_documents(docs, cache=ExportCache()).written == 1
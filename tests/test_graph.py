@@ -0,0 +1,75 @@
+from questcore import QuestGraph, RequiresScan, existing_requires, read_requires
+from questcore.model import create_quests
+
+
+def _graph(edges: dict, existing=None) -> QuestGraph:
+    graph = QuestGraph()
+    for quest_id, requires in edges.items():
+        graph.add(quest_id, requires)
+    for quest_id, requires in (existing or {}).items():
+        graph.add(quest_id, requires, in_session=False)
+    return graph
+
+
+def test_chain_is_ok():
+    report = QuestGraph.build(create_quests("mining", "Miniera", 5, 0)).check()
+    assert report.ok
+
+
+def test_missing_and_blocked():
+    report = _graph({"a": [], "b": ["x"], "c": ["b"], "d": ["c", "a"]}).check()
+    assert report.missing == [("b", "x")]
+    assert report.blocked == ["c", "d"]
+    assert report.cycles == []
+
+
+def test_cycles_and_self_loop():
+    graph = _graph({"a": ["c"], "b": ["a"], "c": ["b"], "d": ["d"], "e": ["a"], "f": []})
+    cycles = sorted(sorted(c) for c in graph.cycles())
+    assert cycles == [["a", "b", "c"], ["d"]]
+    assert graph.unlockable() == {"f"}
+    assert graph.check().blocked == ["e"]
+
+
+def test_long_chain_does_not_recurse():
+    edges = {f"q{i}": [f"q{i - 1}"] if i else [] for i in range(20000)}
+    edges["q0"] = ["q19999"]
+    graph = _graph(edges)
+    assert [len(c) for c in graph.cycles()] == [20000]
+
+
+def test_session_quests_override_existing_and_filter_report():
+    existing = {"a": ["zzz"], "old": ["gone"], "b": []}
+    graph = _graph({"a": [], "c": ["b"]}, existing)
+    assert graph.requires["a"] == []
+    assert graph.check().ok
+    assert graph.check(session_only=False).missing == [("old", "gone")]
+
+
+def test_read_requires_forms():
+    assert read_requires(["options:\n", "  requires:\n", "    - a\n", "    - \"x: y\"\n", "    - 12\n", "  sort-order: 1\n"]) == ["a", "x: y", "12"]
+    assert read_requires(["options:\n", "  requires:\n", "  - a\n", "  category: x\n"]) == ["a"]
+    assert read_requires(["options:\n", "  requires: []\n"]) == []
+    assert read_requires(["options:\n", "  requires: solo\n"]) == ["solo"]
+    assert read_requires(["tasks:\n", "  requires:\n", "    - no\n", "options:\n", "  category: x\n"]) == []
+
+
+def test_requires_scan_rereads_only_changed_files(tmp_path):
+    folder = tmp_path / "mining"
+    folder.mkdir()
+    (folder / "a.yml").write_text("options:\n  requires: []\n", encoding="utf-8")
+    (folder / "b.yml").write_text("options:\n  requires:\n    - a\n", encoding="utf-8")
+
+    scan = RequiresScan()
+    assert scan.scan(tmp_path) == {"a": [], "b": ["a"]}
+    version = scan.version
+    assert scan.scan(tmp_path) == {"a": [], "b": ["a"]}
+    assert scan.version == version
+
+    (folder / "b.yml").write_text("options:\n  requires:\n    - a\n    - c\n", encoding="utf-8")
+    assert scan.scan(tmp_path)["b"] == ["a", "c"]
+    assert scan.version > version
+
+    (folder / "a.yml").unlink()
+    assert existing_requires(tmp_path, scan) == {"b": ["a", "c"]}
+    assert existing_requires(tmp_path / "manca") == {}
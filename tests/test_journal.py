@@ -0,0 +1,126 @@
+import pytest
+
+from questcore import DEFAULT_PLACEHOLDER_CFG, Journal, Task, refresh_derived
+from questcore.journal import JournalError, checkpoint, read_journal, recover, replay_journal
+from questcore.model import create_quests
+from questcore.session import QUEST_FIELDS
+
+
+def _state(quests):
+    return [{name: getattr(q, name) for name in QUEST_FIELDS if name != "tasks"}
+            | {"tasks": {n: (t.type, t.label, t.params) for n, t in q.tasks.items()}} for q in quests]
+
+
+def _edit(quests, journal):
+    q1, q2 = quests
+    task = Task(name="pietra", type="blockbreak", params={"amount": 64, "block": "STONE"}, label="Pietra")
+    q1.add_task(task)
+    journal.append("add_task", q1, name=task.name, type=task.type, label=task.label, params=task.params)
+    q1.update_task("pietra", params={"amount": 128, "block": "STONE"}, label="Pietra II")
+    journal.append("update_task", q1, name="pietra", params={"amount": 128, "block": "STONE"}, label="Pietra II")
+    q2.add_task(Task(name="tmp", type="farming", params={"amount": 1}))
+    journal.append("add_task", q2, name="tmp", type="farming", label="", params={"amount": 1})
+    q2.remove_task("tmp")
+    journal.append("remove_task", q2, name="tmp")
+    fields = {"rewards": ["eco give {player} 10"], "cooldown_time": 60, "repeatable": True}
+    for key, value in fields.items():
+        setattr(q2, key, value)
+    journal.append("set", q2, fields=fields)
+    for q in quests:
+        refresh_derived(q)
+
+
+def test_replay_reproduces_edits(tmp_path):
+    path = tmp_path / "sessione.journal"
+    journal = Journal(path)
+    journal.start(123.0)
+    edited = create_quests("mining", "Miniera", 2, 0)
+    _edit(edited, journal)
+    journal.close()
+
+    base, records = read_journal(path)
+    assert base == 123.0 and len(records) == journal.records == 5
+    fresh = create_quests("mining", "Miniera", 2, 0)
+    assert replay_journal(fresh, records) == 5
+    assert _state(fresh) == _state(edited)
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    path = tmp_path / "sessione.journal"
+    journal = Journal(path)
+    journal.start(1.0)
+    journal.append("set", create_quests("mining", "Miniera", 1, 0)[0], fields={"cooldown_time": 5})
+    journal.close()
+    with open(path, "a", encoding="utf-8") as fp:
+        fp.write('{"op": "set", "c": "mining", "q": "mini')
+    _base, records = read_journal(path)
+    assert records == [{"op": "set", "c": "mining", "q": "mining1", "fields": {"cooldown_time": 5}}]
+
+
+def test_corrupt_journal_raises(tmp_path):
+    path = tmp_path / "sessione.journal"
+    path.write_text("non json\n", encoding="utf-8")
+    with pytest.raises(JournalError):
+        read_journal(path)
+    path.write_text('{"format": "questcore-journal", "version": 1, "base": 1}\nrotto\n{}\n', encoding="utf-8")
+    with pytest.raises(JournalError):
+        read_journal(path)
+
+
+def test_replay_skips_unknown_quests_tasks_and_fields():
+    quests = create_quests("mining", "Miniera", 1, 0)
+    records = [
+        {"op": "set", "q": "altro", "fields": {"cooldown_time": 1}},
+        {"op": "update_task", "q": "mining1", "name": "manca", "params": {}},
+        {"op": "boh", "q": "mining1"},
+        {"op": "set", "q": "mining1", "fields": {"quest_id": "x", "cooldown_time": 7}},
+    ]
+    assert replay_journal(quests, records) == 1
+    assert quests[0].quest_id == "mining1" and quests[0].cooldown_time == 7
+
+
+def test_replay_tells_apart_quests_with_the_same_id(tmp_path):
+    def pair():
+        mining = create_quests("mining", "Miniera", 1, 0)[0]
+        farming = create_quests("farming", "Fattoria", 1, 0)[0]
+        mining.quest_id = farming.quest_id = "doppia"
+        return [mining, farming]
+
+    journal = Journal(tmp_path / "sessione.journal")
+    journal.start(1.0)
+    edited = pair()
+    edited[1].cooldown_time = 5
+    journal.append("set", edited[1], fields={"cooldown_time": 5})
+    edited[0].add_task(Task(name="t", type="farming", params={"amount": 1}))
+    journal.append("add_task", edited[0], name="t", type="farming", label="", params={"amount": 1})
+    journal.close()
+    for q in edited:
+        refresh_derived(q)
+
+    fresh = pair()
+    assert replay_journal(fresh, read_journal(journal.path)[1]) == 2
+    assert _state(fresh) == _state(edited)
+    assert fresh[0].cooldown_time == 1440 and list(fresh[1].tasks) == []
+
+
+def test_version_1_records_are_replayed_by_quest_id():
+    quests = create_quests("mining", "Miniera", 2, 0)
+    assert replay_journal(quests, [{"op": "set", "q": "mining2", "fields": {"cooldown_time": 3}}]) == 1
+    assert quests[1].cooldown_time == 3
+
+
+def test_checkpoint_and_recover(tmp_path):
+    session_path = tmp_path / "sessione.json.gz"
+    journal = Journal(tmp_path / "sessione.journal")
+    quests = create_quests("mining", "Miniera", 2, 0)
+    checkpoint(journal, session_path, quests, DEFAULT_PLACEHOLDER_CFG)
+    _edit(quests, journal)
+    journal.close()  # come dopo un crash: nessuno snapshot finale
+
+    session, applied = recover(session_path, journal.path)
+    assert applied == 5
+    assert _state(session.quests) == _state(quests)
+
+    checkpoint(Journal(tmp_path / "altro.journal"), session_path, quests, DEFAULT_PLACEHOLDER_CFG)
+    assert recover(session_path, journal.path)[1] is None
+    assert recover(session_path, tmp_path / "manca.journal")[1] is None
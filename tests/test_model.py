@@ -0,0 +1,69 @@
+import pickle
+import sys
+
+import pytest
+
+from questcore.model import Quest, Task, create_quests
+
+
+def _fresh(text: str) -> str:
+    # stringa uguale ma non internata
+    return "".join(list(text))
+
+
+def test_slots():
+    q = create_quests("mining", "Miniera", 1, 0)[0]
+    task = Task(name="t", type="farming")
+    assert not hasattr(q, "__dict__") and not hasattr(task, "__dict__")
+    with pytest.raises(AttributeError):
+        q.colore = "rosso"
+    with pytest.raises(AttributeError):
+        task.colore = "rosso"
+
+
+def test_identifiers_are_interned():
+    task = Task(name=_fresh("pietra"), type=_fresh("blockbreak"),
+                params={_fresh("block"): _fresh("STONE"), "blocks": [_fresh("DIRT")]}, label=_fresh("Pietra"))
+    assert task.type is sys.intern("blockbreak")
+    assert task.params["block"] is sys.intern("STONE")
+    assert task.params["blocks"][0] is sys.intern("DIRT")
+    assert all(key is sys.intern(key) for key in task.params)
+    q = create_quests(_fresh("mining"), _fresh("Miniera"), 1, 0)[0]
+    q.display_type = _fresh("DIAMOND")
+    assert q.category is sys.intern("mining") and q.display_type is sys.intern("DIAMOND")
+
+
+def test_each_quest_owns_its_containers():
+    a, b = create_quests("mining", "Miniera", 2, 0)
+    assert a.rewards is not b.rewards and a.placeholders_override is not b.placeholders_override
+    a.rewards.append("eco give {player} 1")
+    a.placeholders_override["k"] = "v"
+    b.lore_reward_lines += ["1 moneta"]
+    assert a.rewards == ["eco give {player} 1"] and b.rewards == []
+    assert a.placeholders_override == {"k": "v"} and b.placeholders_override == {}
+    assert a.lore_reward_lines == [] and b.lore_reward_lines == ["1 moneta"]
+
+
+def test_equality_and_pickle():
+    a = create_quests("mining", "Miniera", 1, 0)[0]
+    a.add_task(Task(name="t", type="farming", params={"amount": 1}))
+    copy = pickle.loads(pickle.dumps(a))
+    assert copy == a
+    assert copy.rewards == [] and copy.rewards is not a.rewards
+    assert a == Quest(**{name: getattr(a, name) for name in Quest.__dataclass_fields__})
+
+
+def test_generation_counts_real_changes():
+    q = create_quests("mining", "Miniera", 1, 0)[0]
+    start = q.generation
+    q.cooldown_time = q.cooldown_time
+    q.display_type = "".join(list(q.display_type))
+    assert q.generation == start
+    q.cooldown_time += 1
+    assert q.generation == start + 1
+    q.add_task(Task(name="t", type="farming", params={"amount": 1}))
+    q.update_task("t", params={"amount": 2})
+    q.touch("rewards")
+    assert q.generation == start + 4
+    q.document_cache = ("x",)
+    assert q.generation == start + 4
@@ -0,0 +1,65 @@
+import pytest
+
+from questcore import Curve, CurveError, PlaceholderConfig, Task, apply_progression, tier_values
+from questcore.derive import generate_placeholders, refresh_derived
+from questcore.model import create_quests
+
+
+def test_linear_and_geometric():
+    assert Curve("linear", 10, 50).values(5) == [10, 20, 30, 40, 50]
+    assert Curve("geometric", 1, 16).values(5) == [1, 2, 4, 8, 16]
+    assert Curve("linear", 7).values(1) == [7]
+    assert Curve("linear", 1, 2).values(0) == []
+
+
+def test_breakpoints_are_clamped_and_interpolated():
+    curve = Curve("breakpoints", points=[[2, 10], [4, 30]])
+    assert curve.values(6) == [10, 10, 20, 30, 30, 30]
+
+
+def test_rounding_and_minimum():
+    assert Curve("linear", 1, 200, round_to=64).values(4) == [64, 64, 128, 192]
+    assert Curve("linear", -5, 5, minimum=2).values(3) == [2, 2, 5]
+
+
+def test_jitter_is_repeatable_with_seed():
+    curves = {"amount": {"kind": "linear", "start": 100, "end": 1000, "jitter": 0.2}, "money": 50}
+    first = tier_values(curves, 10, seed=7)
+    assert first == tier_values(dict(reversed(curves.items())), 10, seed=7)
+    assert first["money"] == [50] * 10
+    assert all(80 <= v <= 1200 for v in first["amount"])
+
+
+@pytest.mark.parametrize("data", [True, "x", {"kind": "boh"}, {"kind": "geometric", "start": 0}, {"jitter": 1}, {"colore": 1}])
+def test_invalid_curves(data):
+    with pytest.raises(CurveError):
+        tier_values({"c": data}, 3)
+
+
+def test_apply_progression():
+    quests = create_quests("mining", "Miniera", 3, 0)
+    values = tier_values({"amount": {"kind": "linear", "start": 10, "end": 30}}, 3)
+    task = Task(name="pietra", type="blockbreak", params={"amount": 1, "block": "STONE"}, label="Pietra {roman}")
+    changes = apply_progression(quests, values, task, rewards=["eco give {player} {amount}"])
+    assert [q.tasks["pietra"].params["amount"] for q in quests] == [10, 20, 30]
+    assert [q.tasks["pietra"].label for q in quests] == ["Pietra I", "Pietra II", "Pietra III"]
+    assert quests[2].rewards == ["eco give {player} 30"]
+    assert changes[id(quests[0])] == {"rewards": ["eco give {player} 10"]}
+    with pytest.raises(CurveError):
+        apply_progression(quests, {"amount": [1]}, task)
+
+
+def test_apply_progression_reports_quests_with_the_same_id():
+    quests = create_quests("mining", "Miniera", 1, 0) + create_quests("farming", "Fattoria", 1, 0)
+    quests[1].quest_id = quests[0].quest_id
+    changes = apply_progression(quests, {"cooldown_time": [60, 120]})
+    assert [changes[id(q)] for q in quests] == [{"cooldown_time": 60}, {"cooldown_time": 120}]
+
+
+def test_apply_progression_uses_the_session_placeholders():
+    quests = create_quests("mining", "Miniera", 2, 0)
+    task = Task(name="pietra", type="blockbreak", params={"amount": 1, "block": "STONE"}, label="Pietra")
+    cfg = PlaceholderConfig.from_dict({"placeholders_key_fmt": "p-{task}"})
+    apply_progression(quests, {"amount": [5, 10]}, task, placeholder_cfg=cfg)
+    assert refresh_derived(quests[1], cfg) == set()
+    assert list(generate_placeholders(quests[1], cfg)[0]) == ["p-pietra"]
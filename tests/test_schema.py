@@ -0,0 +1,64 @@
+import pytest
+
+from questcore import FieldError, Task, compiled_schema, default_params, normalize_params, validate_all, validate_task
+from questcore.model import create_quests
+from questcore.schema import TASK_DEFS
+
+
+def test_compiled_schema_is_cached_and_complete():
+    for task_type, schema in TASK_DEFS.items():
+        compiled = compiled_schema(task_type)
+        assert compiled is compiled_schema(task_type)
+        assert set(compiled.fields) == set(schema["required"]) | set(schema["optional"])
+        assert compiled.mutex == tuple(tuple(group) for group in schema["mutex_groups"])
+
+
+def test_unknown_task_type_raises_keyerror():
+    with pytest.raises(KeyError):
+        compiled_schema("nonesiste")
+
+
+def test_default_params_are_valid():
+    import random
+
+    rng = random.Random(1)
+    for task_type in TASK_DEFS:
+        params = normalize_params(task_type, default_params(task_type, rng))
+        assert compiled_schema(task_type).errors(params) == []
+
+
+def test_normalize_drops_empty_optionals():
+    params = normalize_params("blockbreak", {"amount": 5, "block": "", "blocks": [], "worlds": ["w"]})
+    assert params["amount"] == 5
+    assert "block" not in params and "blocks" not in params
+    assert params["worlds"] == ["w"]
+
+
+def test_errors_report_missing_type_enum_and_mutex():
+    codes = {code for _key, code, _msg in compiled_schema("blockbreak").errors({"block": "STONE", "blocks": ["DIRT"]})}
+    assert codes == {"missing", "mutex"}
+    assert compiled_schema("blockbreak").errors({"amount": "10"})[0][:2] == ("amount", "type")
+    assert compiled_schema("smithing").errors({"amount": 1, "mode": "boh"})[0][:2] == ("mode", "enum")
+
+
+def test_field_coerce_and_parse_text():
+    amount = compiled_schema("blockbreak").fields["amount"]
+    assert amount.coerce("12") == 12
+    assert amount.parse_text(" 7 ") == 7
+    with pytest.raises(FieldError):
+        amount.coerce(True)
+    with pytest.raises(FieldError):
+        amount.parse_text("x")
+    flag = compiled_schema("blockbreak").fields["allow-silk-touch"]
+    assert flag.coerce("false") is False
+    with pytest.raises(FieldError):
+        flag.coerce(1)
+
+
+def test_validate_task_and_validate_all():
+    assert validate_task(Task(name="t", type="boh", params={}), "q1")[0].code == "task_type"
+    quests = create_quests("mining", "Miniera", 2, 0)
+    quests[0].add_task(Task(name="ok", type="blockbreak", params={"amount": 1, "block": "STONE"}))
+    quests[1].add_task(Task(name="ko", type="blockbreak", params={}))
+    errors = validate_all(quests)
+    assert [(e.quest_id, e.task, e.code) for e in errors] == [("mining2", "ko", "missing")]
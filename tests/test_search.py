@@ -0,0 +1,70 @@
+from questcore import QuestIndex, Task
+from questcore.model import create_quests
+
+
+def _quests():
+    quests = create_quests("mining", "Miniera", 3, 0)
+    quests[0].add_task(Task(name="pietra", type="blockbreak", params={"amount": 64, "block": "STONE"}, label="&7Pietra"))
+    quests[1].add_task(Task(name="zombie", type="mobkilling", params={"amount": 5, "mobs": ["ZOMBIE"], "worlds": ["skyblock_nether"]}))
+    quests[1].add_task(Task(name="scheletri", type="mobkilling", params={"amount": 5, "mob": "SKELETON"}))
+    quests[2].rewards = ["eco give {player} 500"]
+    return quests
+
+
+def _found(index, query):
+    return [(hit.quest_id, hit.tasks) for hit in index.search(query)]
+
+
+def test_terms_and_qualified_terms():
+    index = QuestIndex()
+    index.refresh(_quests())
+    assert _found(index, "pietra") == [("mining1", ["pietra"])]
+    assert _found(index, "block:stone") == [("mining1", ["pietra"])]
+    assert _found(index, "mobkilling skyblock_nether") == [("mining2", ["zombie"])]
+    assert _found(index, "type:mobkilling") == [("mining2", ["zombie", "scheletri"])]
+    assert _found(index, "reward:500") == [("mining3", [])]
+    assert _found(index, "requires:mining1") == [("mining2", [])]
+    assert _found(index, "zomb*") == [("mining2", ["zombie"])]
+    assert _found(index, "zombie pietra") == []
+    assert index.search("   ") == []
+
+
+def test_refresh_reindexes_only_changed_quests():
+    quests = _quests()
+    index = QuestIndex()
+    assert index.refresh(quests) == 3
+    assert index.refresh(quests) == 0
+    quests[0].update_task("pietra", params={"amount": 64, "block": "DIRT"})
+    quests[2].rewards = ["eco give {player} 900"]
+    assert index.refresh(quests) == 2
+    assert _found(index, "dirt") == [("mining1", ["pietra"])]
+    assert _found(index, "500") == []
+    assert index.refresh(quests[1:]) == 0
+    assert len(index) == 2 and _found(index, "dirt") == []
+
+
+def test_same_quest_id_in_different_categories():
+    mining = create_quests("a", "A", 1, 0)[0]
+    farming = create_quests("b", "B", 1, 0)[0]
+    mining.quest_id = farming.quest_id = "doppia"
+    mining.add_task(Task(name="t", type="blockbreak", params={"amount": 1, "block": "STONE"}))
+    farming.add_task(Task(name="t", type="farming", params={"amount": 1, "block": "WHEAT"}))
+    index = QuestIndex()
+    index.refresh([mining, farming])
+    assert [hit.quest.category for hit in index.search("doppia")] == ["a", "b"]
+    assert index.search("doppia")[1].quest is farming
+    assert index.search("wheat")[0].quest is farming
+    index.refresh([farming])
+    assert index.search("blockbreak") == []
+
+
+def test_pending_lists_do_not_touch_the_model():
+    quests = _quests()
+    index = QuestIndex()
+    index.refresh(quests)
+    revision = quests[0].revision("requires")
+    index.refresh(quests, {id(quests[0]): {"rewards": ["give diamond"], "requires": ["mining9"]}})
+    assert _found(index, "reward:diamond") == [("mining1", [])]
+    assert _found(index, "requires:mining9") == [("mining1", [])]
+    assert quests[0].rewards == [] and quests[0].requires == []
+    assert quests[0].revision("requires") == revision
@@ -0,0 +1,97 @@
+import gzip
+import json
+
+import pytest
+
+from questcore import PlaceholderConfig, Task, refresh_derived
+from questcore.derive import cached_document
+from questcore.model import create_quests
+from questcore.session import (
+    QUEST_FIELDS,
+    SessionError,
+    load_session,
+    save_session,
+    session_from_dict,
+    session_to_dict,
+)
+
+
+def _quests():
+    quests = create_quests("mining", "Miniera", 3, 0)
+    for i, q in enumerate(quests, start=1):
+        q.add_task(Task(name="pietra", type="blockbreak", params={"amount": 64 * i, "blocks": ["STONE", "DIRT"]}, label="Pietra"))
+        q.add_task(Task(name="zombie", type="mobkilling", params={"amount": i, "mob": "ZOMBIE", "exact-match": False}))
+        q.rewards = [f"eco give {{player}} {i}"]
+        refresh_derived(q)
+    quests[1].lore_normal = ["a mano"]
+    quests[1].lore_normal_manual = True
+    quests[2].placeholders_override = {"k": "v"}
+    return quests
+
+
+def _state(quests):
+    return [([getattr(q, name) for name in QUEST_FIELDS],
+             [(t.name, t.type, t.label, list(t.params.items())) for t in q.tasks.values()]) for q in quests]
+
+
+def test_round_trip(tmp_path):
+    quests = _quests()
+    cfg = PlaceholderConfig.from_dict({"placeholders_key_fmt": "p-{task}"})
+    path = save_session(tmp_path / "sub" / "sessione.json.gz", quests, cfg, {"count": 3})
+    session = load_session(path)
+    assert _state(session.quests) == _state(quests)
+    assert session.placeholder_cfg is cfg
+    assert session.setup == {"count": 3}
+    assert session.saved_at > 0
+    assert [p.name for p in path.parent.iterdir()] == ["sessione.json.gz"]
+
+
+def test_columns_share_param_keys():
+    data = session_to_dict(_quests())
+    assert data["param_keys"] == ["amount", "blocks", "mob", "exact-match"]
+    assert len(data["quests"][0]) == len(data["fields"]) + 1
+
+
+def test_plain_json_and_unknown_fields_are_accepted(tmp_path):
+    data = session_to_dict(_quests())
+    data["fields"].append("campo_futuro")
+    for row in data["quests"]:
+        row.insert(len(data["fields"]) - 1, "x")
+    path = tmp_path / "sessione.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    assert _state(load_session(path).quests) == _state(_quests())
+
+
+@pytest.mark.parametrize("payload", [
+    b"non json",
+    gzip.compress(b"{tronco"),
+    json.dumps({"format": "altro"}).encode(),
+    json.dumps({"format": "questcore-session", "version": 99}).encode(),
+    json.dumps({"format": "questcore-session", "version": 1, "fields": ["quest_id"]}).encode(),
+])
+def test_invalid_files(tmp_path, payload):
+    path = tmp_path / "sessione.json.gz"
+    path.write_bytes(payload)
+    with pytest.raises(SessionError):
+        load_session(path)
+
+
+def test_broken_row():
+    data = session_to_dict(_quests())
+    data["quests"][0] = data["quests"][0][:2]
+    with pytest.raises(SessionError):
+        session_from_dict(data)
+
+
+def test_loaded_task_edits_reach_the_exported_document(tmp_path):
+    quests = _quests()
+    cfg = PlaceholderConfig.from_dict({})
+    loaded = load_session(save_session(tmp_path / "sessione.json.gz", quests, cfg)).quests[0]
+    assert loaded.revision("task_names") == 2  # caricate con add_task, come nell'editor
+    refresh_derived(loaded, cfg)
+    _document, text, digest = cached_document(loaded, cfg)
+    loaded.update_task("pietra", params={"amount": 999, "blocks": ["STONE"]}, label="Sasso")
+    refresh_derived(loaded, cfg)
+    _document, new_text, new_digest = cached_document(loaded, cfg)
+    assert new_digest != digest
+    assert "amount: 999" in new_text and "Sasso" in new_text and "amount: 999" not in text
@@ -0,0 +1,59 @@
+import pytest
+
+from questcore.templates import (
+    DEFAULT_PLACEHOLDER_CFG,
+    KEY_FIELDS,
+    PlaceholderConfig,
+    PlaceholderTemplate,
+    TemplateError,
+    validate_placeholder_cfg,
+)
+
+
+@pytest.mark.parametrize("source, fields", [
+    ("progress-{task}", {"task"}),
+    ("&7{label} &f{progress}&8/&f{goal}", {"label", "progress", "goal"}),
+    ("{label:>8}|{task!r}", {"label", "task"}),
+    ("{{letterale}} {task}", {"task"}),
+    ("senza campi", set()),
+])
+def test_render_matches_str_format(source, fields):
+    template = PlaceholderTemplate(source)
+    values = {"task": "pietra", "label": "Pietra", "progress": "{p}", "goal": "{g}"}
+    assert template.render(**values) == source.format(**values)
+    assert template.fields == fields
+
+
+@pytest.mark.parametrize("source", ["{nome}", "{label", "label}", "{}", "{0}"])
+def test_invalid_formats_fail_at_compile_time(source):
+    with pytest.raises(TemplateError):
+        PlaceholderTemplate(source)
+
+
+def test_key_format_only_knows_task_and_label():
+    assert PlaceholderTemplate("{task}-{label}", KEY_FIELDS).fields == {"task", "label"}
+    with pytest.raises(TemplateError, match="progress"):
+        PlaceholderTemplate("{progress}", KEY_FIELDS)
+
+
+def test_config_render_and_cache():
+    cfg = PlaceholderConfig.from_dict(DEFAULT_PLACEHOLDER_CFG)
+    key, value, progress = cfg.render("pietra", "Pietra")
+    assert key == "progress-pietra"
+    assert value == progress == "&7Pietra &f{pietra:progress}&8/&f{pietra:goal}"
+    assert cfg.render("pietra", "Pietra") is cfg.render("pietra", "Pietra")
+    assert cfg.render("pietra", "Sasso")[1].startswith("&7Sasso")
+
+
+def test_config_from_dict_fills_defaults_and_is_shared():
+    cfg = PlaceholderConfig.from_dict({"placeholders_key_fmt": "p-{task}", "progress_value_fmt": ""})
+    assert cfg.as_dict() == DEFAULT_PLACEHOLDER_CFG | {"placeholders_key_fmt": "p-{task}"}
+    assert PlaceholderConfig.from_dict(cfg.as_dict()) is cfg
+    assert PlaceholderConfig.coerce(cfg) is cfg
+    assert cfg == PlaceholderConfig(**cfg.as_dict()) and hash(cfg) == hash(PlaceholderConfig(**cfg.as_dict()))
+
+
+def test_validate_placeholder_cfg():
+    assert validate_placeholder_cfg(DEFAULT_PLACEHOLDER_CFG) == []
+    errors = validate_placeholder_cfg({"placeholders_key_fmt": "{goal}", "placeholders_value_fmt": "{label"})
+    assert [e.split(":")[0] for e in errors] == ["placeholders_key_fmt", "placeholders_value_fmt"]
@@ -0,0 +1,95 @@
+import io
+import random
+
+import pytest
+
+from questcore.yamlio import _yaml_needs_quotes, _yaml_quote, yaml_dump, yaml_write
+
+
+def _reference_dump(data, indent: int = 0) -> str:
+    """Il vecchio yaml_dump ricorsivo: l'output del writer deve restare identico byte per byte."""
+    sp = "  " * indent
+    if isinstance(data, dict):
+        lines = []
+        for k, v in data.items():
+            if isinstance(v, (dict, list)):
+                lines.append(f"{sp}{k}:")
+                lines.append(_reference_dump(v, indent + 1))
+            else:
+                lines.append(f"{sp}{k}: {_reference_dump(v, 0).lstrip()}")
+        return "\n".join(lines)
+    if isinstance(data, list):
+        if not data:
+            return f"{sp}[]"
+        lines = []
+        for item in data:
+            if isinstance(item, (dict, list)):
+                lines.append(f"{sp}-")
+                lines.append(_reference_dump(item, indent + 1))
+            else:
+                lines.append(f"{sp}- {_reference_dump(item, 0).lstrip()}")
+        return "\n".join(lines)
+    if isinstance(data, bool):
+        return f"{sp}{'true' if data else 'false'}"
+    if isinstance(data, int):
+        return f"{sp}{data}"
+    if data is None:
+        return f"{sp}null"
+    if isinstance(data, str):
+        return f"{sp}{_yaml_quote(data) if _yaml_needs_quotes(data) else data}"
+    return f"{sp}{_yaml_quote(str(data))}"
+
+
+SAMPLE = {
+    "tasks": {
+        "pietra": {"type": "blockbreak", "amount": 64, "blocks": ["STONE", "COBBLESTONE"], "reverse-if-placed": False},
+        "vuota": {},
+    },
+    "display": {
+        "name": "&aMiniera I",
+        "lore-normal": ["", "&7Premi:", "&8- &f100 monete", "  spazi  ", 'con "virgolette"'],
+        "type": "STONE",
+    },
+    "rewards": [],
+    "nested": [[1, 2], {"a": None, "b": True, "c": "true"}, [], {}],
+    "options": {"requires": ["mining1"], "cooldown": {"enabled": True, "time": 1440}, "sort-order": 2},
+    "float": 1.5,
+}
+
+
+def _random_data(rng: random.Random, depth: int = 0):
+    kind = rng.randrange(7 if depth < 4 else 4)
+    if kind == 0:
+        return rng.choice(["", "x", "a: b", " lead", "null", "&7colore", "#hash", 'q"uote', "Pietra II"])
+    if kind == 1:
+        return rng.randint(-5, 5000)
+    if kind == 2:
+        return rng.choice([True, False, None])
+    if kind == 3:
+        return rng.random()
+    if kind == 4:
+        return [_random_data(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {f"k{i}": _random_data(rng, depth + 1) for i in range(rng.randint(0, 4))}
+
+
+def test_yaml_dump_matches_reference():
+    assert yaml_dump(SAMPLE) == _reference_dump(SAMPLE)
+    rng = random.Random(2)
+    for _ in range(300):
+        data = {"root": _random_data(rng)}
+        assert yaml_dump(data) == _reference_dump(data)
+
+
+@pytest.mark.parametrize("chunk_lines", [1, 3, 256])
+def test_yaml_write_streams_the_same_bytes(chunk_lines):
+    out = io.StringIO()
+    yaml_write(SAMPLE, out, chunk_lines=chunk_lines)
+    assert out.getvalue() == yaml_dump(SAMPLE) + "\n"
+
+
+def test_scalars():
+    assert yaml_dump({"a": ""}) == 'a: ""'
+    assert yaml_dump({"a": "x: y"}) == 'a: "x: y"'
+    assert yaml_dump({"a": 'say "hi" :'}) == 'a: "say \\"hi\\" :"'
+    assert yaml_dump({"a": "False"}) == 'a: "False"'
+    assert yaml_dump({"a": [True, None, 3]}) == "a:\n  - true\n  - null\n  - 3"
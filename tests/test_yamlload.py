@@ -0,0 +1,85 @@
+import pytest
+
+from questcore import (
+    DEFAULT_PLACEHOLDER_CFG,
+    Task,
+    export_documents,
+    generate_placeholders,
+    load_quests_dir,
+    quest_document,
+    quest_path,
+    refresh_derived,
+    yaml_dump,
+)
+from questcore.model import create_quests
+from questcore.yamlload import YamlLoadError, load_quest_file, yaml_load
+
+
+def _quests():
+    quests = create_quests("mining", "Miniera", 3, 0)
+    for i, q in enumerate(quests, start=1):
+        q.add_task(Task(name="pietra", type="blockbreak", params={"amount": 64 * i, "block": "STONE"}, label="Pietra"))
+        q.add_task(Task(name="zombie", type="mobkilling", params={"amount": i, "mobs": ["ZOMBIE", "HUSK"]}, label="Zombie"))
+        q.rewards = [f"eco give {{player}} {100 * i}"]
+        q.lore_reward_lines = [f"{100 * i} monete"]
+        refresh_derived(q, DEFAULT_PLACEHOLDER_CFG)
+    return quests
+
+
+def _document(q):
+    return quest_document(q, *generate_placeholders(q, DEFAULT_PLACEHOLDER_CFG))
+
+
+def test_yaml_load_reads_yaml_dump():
+    data = {
+        "tasks": {"t": {"type": "blockbreak", "amount": 3, "blocks": ["A", "B"], "flag": True}},
+        "display": {"name": "&aNome: con due punti", "lore": ["", "# non è un commento", "'apici'"]},
+        "empty": [],
+        "none": None,
+    }
+    assert yaml_load(yaml_dump(data)) == data
+
+
+def test_yaml_load_rejects_garbage():
+    with pytest.raises(YamlLoadError):
+        yaml_load("a: 1\n  b: 2\n   - c")
+
+
+def test_quest_round_trip(tmp_path):
+    quests = _quests()
+    report = export_documents([(quest_path(q, tmp_path), _document(q)) for q in quests])
+    assert report.ok
+    for q in quests:
+        loaded = load_quest_file(quest_path(q, tmp_path), DEFAULT_PLACEHOLDER_CFG)
+        assert loaded.quest_id == q.quest_id
+        assert loaded.category_display == "Miniera"
+        assert [t.label for t in loaded.tasks.values()] == ["Pietra", "Zombie"]
+        assert loaded.lore_reward_lines == q.lore_reward_lines
+        assert not loaded.lore_normal_manual and not loaded.placeholders_override
+        assert _document(loaded) == _document(q)
+
+
+def test_load_quests_dir_threads_and_processes_agree(tmp_path):
+    quests = _quests()
+    export_documents([(quest_path(q, tmp_path), _document(q)) for q in quests])
+    (tmp_path / "mining" / "rotto.yml").write_text("tasks:\n  - a\n b: c\n", encoding="utf-8")
+
+    threads = load_quests_dir(tmp_path, DEFAULT_PLACEHOLDER_CFG, processes=False)
+    assert sorted(q.quest_id for q in threads.quests) == ["mining1", "mining2", "mining3"]
+    assert [path.name for path, _message in threads.errors] == ["rotto.yml"]
+
+    processes = load_quests_dir(tmp_path, DEFAULT_PLACEHOLDER_CFG, max_workers=2, processes=True)
+    by_id = {q.quest_id: _document(q) for q in processes.quests}
+    assert by_id == {q.quest_id: _document(q) for q in threads.quests}
+
+
+def test_large_trees_stay_on_threads_by_default(tmp_path, monkeypatch):
+    import concurrent.futures
+
+    def no_processes(*args, **kwargs):
+        raise AssertionError("pool di processi non richiesto")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_processes)
+    quests = create_quests("mining", "Miniera", 250, 0)
+    export_documents([(quest_path(q, tmp_path), _document(q)) for q in quests])
+    assert len(load_quests_dir(tmp_path, DEFAULT_PLACEHOLDER_CFG, max_workers=2).quests) == 250